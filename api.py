@@ -3,10 +3,13 @@ Simple API server for health checks and cronjob monitoring
 """
 
 import logging
-from flask import Flask, jsonify
-from datetime import datetime
+from flask import Flask, jsonify, request
+from datetime import datetime, timezone
 import os
 
+from auto_trader import metrics
+from auto_trader.store import TradeStore
+
 app = Flask(__name__)
 
 # Setup logging
@@ -16,6 +19,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Same database the bot's trade tracker writes to (read-only use here).
+# An empty TRADE_STORE_PATH disables the store, as it does for the bot.
+TRADE_STORE_PATH = os.environ.get("TRADE_STORE_PATH", "trades.db")
+trade_store = TradeStore(TRADE_STORE_PATH) if TRADE_STORE_PATH else None
+
 
 @app.route("/health", methods=["GET"])
 def health_check():
@@ -23,7 +31,7 @@ def health_check():
     return jsonify(
         {
             "status": "healthy",
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
             "service": "telegram-signal-copy-bot",
         }
     ), 200
@@ -35,6 +43,41 @@ def ping():
     return jsonify({"message": "pong"}), 200
 
 
+@app.route("/trades/summary", methods=["GET"])
+def trades_summary():
+    """Executed trades and P&L for a day, grouped (default: per asset per provider)"""
+    if trade_store is None:
+        return jsonify({"error": "Trade store disabled (TRADE_STORE_PATH is empty)"}), 503
+    day = request.args.get("day")
+    group_by = tuple(
+        column for column in request.args.get("group_by", "asset,source_id").split(",") if column
+    )
+    try:
+        groups = trade_store.summary(day, group_by)
+        statuses = trade_store.status_counts(day)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(
+        {
+            "day": day or datetime.now().date().isoformat(),
+            "groups": groups,
+            "statuses": statuses,
+            "daily_loss": trade_store.daily_loss(day),
+        }
+    ), 200
+
+
+@app.route("/metrics", methods=["GET"])
+def bot_metrics():
+    """Live stats of the bot's background components (when run together via start.py)"""
+    return jsonify(
+        {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "components": metrics.snapshot(),
+        }
+    ), 200
+
+
 @app.route("/", methods=["GET"])
 def root():
     """Root endpoint with API info"""
@@ -45,6 +88,8 @@ def root():
             "endpoints": {
                 "/health": "Health check endpoint",
                 "/ping": "Simple ping endpoint",
+                "/trades/summary": "P&L per asset and provider (?day=YYYY-MM-DD&group_by=asset,source_id)",
+                "/metrics": "Broker queue and session, scheduler, parser, asset-list, trade-latency and forwarding stats",
             },
         }
     ), 200
@@ -0,0 +1,118 @@
+import logging
+import time
+from typing import NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+# IQ Option books expiries of up to 5 minutes as "turbo", longer ones as "binary"
+TURBO_MAX_EXPIRY = 5
+
+
+def normalize_asset(name: str) -> str:
+    """
+    Canonical catalog key for an asset name as written by a provider or the
+    broker: upper case, punctuation and spaces dropped, and an OTC marker
+    anywhere in the name moved to a "-OTC" suffix.
+
+        "EUR/JPY OTC", "otc eurjpy", "EURJPY-OTC" → "EURJPY-OTC"
+    """
+    upper = str(name).upper()
+    otc = "OTC" in upper
+    if otc:
+        upper = upper.replace("OTC", "")
+    core = "".join(ch for ch in upper if ch.isalnum())
+    return core + "-OTC" if otc else core
+
+
+def instrument_type(expiry: int) -> str:
+    return "turbo" if expiry <= TURBO_MAX_EXPIRY else "binary"
+
+
+class AssetInfo(NamedTuple):
+    name: str                   # key as the broker knows it (OP_code.ACTIVES)
+    active_id: int
+    open: dict                  # {"turbo": bool, "binary": bool}, may be partial
+    payout: dict                # {"turbo": 0.87, "binary": 0.85}, may be partial
+
+    def is_open(self, expiry: int) -> Optional[bool]:
+        """None when the broker did not report a status."""
+        return self.open.get(instrument_type(expiry))
+
+    def payout_for(self, expiry: int) -> Optional[float]:
+        return self.payout.get(instrument_type(expiry))
+
+
+class AssetCatalog:
+    """
+    Immutable snapshot of the broker's tradable assets, indexed for O(1)
+    resolution of provider spellings and aliases.
+
+    Built in one go from the ACTIVES dict plus the optional open-time and
+    profit tables, so a refresh can build a new catalog off the trade path and
+    swap it in with a single attribute assignment.
+    """
+
+    def __init__(self, actives: dict, open_times: dict = None, profits: dict = None,
+                 aliases: dict = None):
+        open_times = open_times or {}
+        profits = profits or {}
+        self.built_at = time.time()
+        self._by_name = {}
+        self._assets = {}
+        for name, active_id in actives.items():
+            info = AssetInfo(
+                name=name,
+                active_id=active_id,
+                open={
+                    kind: bool(table[name].get("open"))
+                    for kind, table in open_times.items()
+                    if name in table
+                },
+                payout=dict(profits.get(name, {})),
+            )
+            self._by_name[name] = info
+            self._assets[normalize_asset(name)] = info
+
+        self._aliases = {}
+        for alias, target in (aliases or {}).items():
+            info = self._assets.get(normalize_asset(target))
+            if info:
+                self._aliases[normalize_asset(alias)] = info
+            else:
+                logger.debug(f"Asset alias {alias} → {target}: target not listed")
+
+        # Names already reported as missing, so each miss is logged once
+        self._reported_missing = set()
+
+    @classmethod
+    def empty(cls) -> "AssetCatalog":
+        return cls({})
+
+    def __len__(self):
+        return len(self._assets)
+
+    def __contains__(self, name) -> bool:
+        return self.resolve(name) is not None
+
+    @property
+    def otc_count(self) -> int:
+        return sum(1 for key in self._assets if key.endswith("-OTC"))
+
+    def resolve(self, name: str) -> Optional[AssetInfo]:
+        info = self._by_name.get(name)
+        if info is not None:
+            return info
+        key = normalize_asset(name)
+        info = self._assets.get(key)
+        if info is None:
+            info = self._aliases.get(key)
+        return info
+
+    def report_missing(self, name: str) -> None:
+        if name in self._reported_missing:
+            return
+        self._reported_missing.add(name)
+        logger.warning(
+            f"Asset '{name}' not found in the broker asset list "
+            f"({len(self)} assets, {self.otc_count} OTC)."
+        )
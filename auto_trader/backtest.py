@@ -0,0 +1,301 @@
+"""
+Historical signal replay and backtest.
+
+Replays past signals through the live pipeline pieces (signal grammars,
+seconds_until_signal_minute, SignalValidator) on a simulated clock and
+settles each trade against a local price series, giving win rates per
+provider. Nothing sleeps: signals, scheduled entries and expiries are events
+on one heap ordered by simulated time, so a trade waiting for its minute is
+validated at that minute, exactly as the engine's sleeping task would be.
+
+Signals come from trades.csv (the raw_signal column) or a JSON-lines history
+dump written by dump_history(). Prices are a CSV of timestamp,asset,price
+rows (epoch seconds or ISO timestamps), held per asset in array('d') columns
+and looked up by binary search.
+
+Usage:
+    python -m auto_trader.backtest --signals history.jsonl --prices prices.csv \\
+        --source -1003771929527:emoji_card
+"""
+
+import argparse
+import csv
+import heapq
+import json
+import logging
+import time
+from array import array
+from bisect import bisect_right
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from .grammars import GrammarRegistry
+from .ledger import PnLLedger
+from .timing import seconds_until_signal_minute
+from .validator import SignalValidator
+from config import SIGNAL_MAX_WAIT_SECONDS, TRADE_AMOUNT
+
+logger = logging.getLogger(__name__)
+
+# A price older than this (seconds) is not used to open or settle a trade
+MAX_PRICE_AGE = 120.0
+
+
+def _to_local_naive(value: str) -> datetime:
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is not None:
+        # Signal minutes are compared to the local clock, as in the engine
+        moment = moment.astimezone().replace(tzinfo=None)
+    return moment
+
+
+def _to_epoch(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return _to_local_naive(value).timestamp()
+
+
+class PriceSeries:
+    """One asset's prices as parallel, time-sorted array('d') columns."""
+
+    __slots__ = ("times", "prices")
+
+    def __init__(self, points=()):
+        points = sorted(points)
+        self.times = array("d", (t for t, _ in points))
+        self.prices = array("d", (p for _, p in points))
+
+    def __len__(self):
+        return len(self.times)
+
+    def price_at(self, ts: float, max_age: float = MAX_PRICE_AGE) -> Optional[float]:
+        """Last price at or before ts, or None if there is none recent enough."""
+        i = bisect_right(self.times, ts) - 1
+        if i < 0 or ts - self.times[i] > max_age:
+            return None
+        return self.prices[i]
+
+
+class PriceBook:
+    def __init__(self, series: dict):
+        self.series = series
+
+    @classmethod
+    def from_csv(cls, path: str) -> "PriceBook":
+        points = defaultdict(list)
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                points[row["asset"].upper()].append((_to_epoch(row["timestamp"]), float(row["price"])))
+        return cls({asset: PriceSeries(p) for asset, p in points.items()})
+
+    def price_at(self, asset: str, ts: float, max_age: float = MAX_PRICE_AGE) -> Optional[float]:
+        series = self.series.get(asset)
+        if series is None and asset.endswith("-OTC"):
+            series = self.series.get(asset[:-4])
+        return series.price_at(ts, max_age) if series is not None else None
+
+
+class SignalRecord(NamedTuple):
+    received_at: datetime   # local wall-clock time the message arrived
+    text: str
+    source_id: Optional[int] = None
+
+
+def iter_trades_csv(path: str):
+    """Signals from trades.csv; the row timestamp stands in for arrival time."""
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            if row.get("raw_signal"):
+                yield SignalRecord(_to_local_naive(row["timestamp"]), row["raw_signal"])
+
+
+def iter_history_dump(path: str):
+    """Signals from a JSON-lines file written by dump_history()."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                item = json.loads(line)
+                yield SignalRecord(_to_local_naive(item["date"]), item["text"], item.get("chat_id"))
+
+
+async def dump_history(client, chat, path: str, limit: int = None, offset_date=None) -> int:
+    """
+    Writes a chat's message history (oldest first) as JSON lines for replay.
+    Returns the number of messages written.
+    """
+    entity = await client.get_entity(chat)
+    chat_id = await client.get_peer_id(entity)
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        async for message in client.iter_messages(
+            entity, limit=limit, offset_date=offset_date, reverse=True
+        ):
+            if not message.message:
+                continue
+            f.write(json.dumps({
+                "date": message.date.isoformat(),
+                "chat_id": chat_id,
+                "id": message.id,
+                "text": message.message,
+            }, ensure_ascii=False) + "\n")
+            written += 1
+    return written
+
+
+class ProviderStats:
+    def __init__(self):
+        self.statuses = Counter()
+        self.pnl = 0.0
+
+    @property
+    def settled(self) -> int:
+        return self.statuses["WIN"] + self.statuses["LOSS"] + self.statuses["DRAW"]
+
+    @property
+    def win_rate(self) -> Optional[float]:
+        return self.statuses["WIN"] / self.settled if self.settled else None
+
+
+# Heap event kinds, ordered so that at equal times losses settle before the
+# next entry is validated against the daily loss limit
+_SETTLE, _ENTRY = 0, 1
+
+
+class Backtester:
+    """
+    Replays signals (in arrival order) and returns {source_id: ProviderStats}.
+    """
+
+    def __init__(self, prices: PriceBook, assignments=None, stake: float = TRADE_AMOUNT,
+                 payout: float = 0.8, max_wait: float = SIGNAL_MAX_WAIT_SECONDS):
+        self.prices = prices
+        self.grammars = GrammarRegistry(assignments)
+        # The ledger's trading day follows the simulated clock
+        self._day = None
+        self.ledger = PnLLedger(today=lambda: self._day)
+        self.validator = SignalValidator(self.ledger)
+        self.stake = stake
+        self.payout = payout
+        self.max_wait = max_wait
+        self.stats = defaultdict(ProviderStats)
+        self.processed = 0
+        self._events = []
+        self._seq = 0
+
+    def _push(self, ts, kind, payload):
+        self._seq += 1
+        heapq.heappush(self._events, (ts, kind, self._seq, payload))
+
+    def _advance(self, until: float):
+        """Runs every scheduled event up to the simulated time `until`."""
+        events = self._events
+        while events and events[0][0] <= until:
+            ts, kind, _, payload = heapq.heappop(events)
+            self._day = datetime.fromtimestamp(ts).date()
+            if kind == _ENTRY:
+                self._enter(ts, *payload)
+            else:
+                self.ledger.record(None, *payload)
+
+    def _enter(self, ts: float, parsed: dict, source_id):
+        stats = self.stats[source_id]
+        if not self.validator.validate(parsed, now=ts):
+            stats.statuses["VALIDATION_FAILED"] += 1
+            return
+
+        asset = parsed["asset"]
+        exit_ts = ts + parsed["expiry"] * 60
+        entry_price = self.prices.price_at(asset, ts)
+        exit_price = self.prices.price_at(asset, exit_ts)
+        if entry_price is None or exit_price is None:
+            stats.statuses["NO_PRICE"] += 1
+            return
+
+        if exit_price == entry_price:
+            outcome, profit = "DRAW", 0.0
+        elif (exit_price > entry_price) == (parsed["direction"] == "CALL"):
+            outcome, profit = "WIN", self.stake * self.payout
+        else:
+            outcome, profit = "LOSS", -self.stake
+        stats.statuses[outcome] += 1
+        stats.pnl += profit
+        # Settles into the daily ledger (and the loss limit) at expiry
+        self._push(exit_ts, _SETTLE, (outcome, profit))
+
+    def feed(self, record: SignalRecord):
+        self.processed += 1
+        received = record.received_at.timestamp()
+        self._advance(received)
+
+        stats = self.stats[record.source_id]
+        parsed = self.grammars.parse(record.text, record.source_id)
+        if parsed is None:
+            stats.statuses["REJECTED"] += 1
+            return
+        if not parsed["is_valid"]:
+            stats.statuses["INVALID_FORMAT"] += 1
+            return
+        parsed["source_id"] = record.source_id
+
+        # Same timing rules as AutoTraderEngine.process_signal
+        wait = 0.0
+        if parsed["execute_time"]:
+            signal_minute = int(parsed["execute_time"].split(":")[1])
+            wait = seconds_until_signal_minute(signal_minute, record.received_at)
+            if wait > self.max_wait:
+                stats.statuses["SKIPPED_TIMING"] += 1
+                return
+            if wait < 0:
+                stats.statuses["SKIPPED_EXPIRED"] += 1
+                return
+        self._push(received + wait, _ENTRY, (parsed, record.source_id))
+
+    def run(self, records) -> dict:
+        for record in records:
+            self.feed(record)
+        self._advance(float("inf"))
+        return dict(self.stats)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay signal history against prices.")
+    parser.add_argument("--signals", required=True, help="trades.csv or a dump_history() .jsonl")
+    parser.add_argument("--prices", required=True, help="CSV with timestamp,asset,price")
+    parser.add_argument("--source", action="append", default=[],
+                        help="source_id:grammar, may be repeated (as SIGNAL_GRAMMARS)")
+    parser.add_argument("--stake", type=float, default=TRADE_AMOUNT)
+    parser.add_argument("--payout", type=float, default=0.8)
+    args = parser.parse_args(argv)
+
+    # Duplicate/loss-limit rejections are counted, not logged one by one
+    logging.getLogger("auto_trader.validator").setLevel(logging.ERROR)
+
+    assignments = {}
+    for pair in args.source:
+        source, grammar = pair.rsplit(":", 1)
+        assignments[int(source)] = grammar
+
+    prices = PriceBook.from_csv(args.prices)
+    if args.signals.endswith(".jsonl"):
+        records = iter_history_dump(args.signals)
+    else:
+        records = iter_trades_csv(args.signals)
+
+    backtester = Backtester(prices, assignments, stake=args.stake, payout=args.payout)
+    start = time.perf_counter()
+    results = backtester.run(records)
+    elapsed = time.perf_counter() - start
+
+    print(f"{backtester.processed} signals replayed in {elapsed:.2f}s")
+    for source_id, stats in sorted(results.items(), key=lambda item: str(item[0])):
+        rate = f"{stats.win_rate:.1%}" if stats.win_rate is not None else "n/a"
+        print(f"\n{source_id if source_id is not None else 'unknown source'}: "
+              f"win rate {rate} over {stats.settled} trades, PnL {stats.pnl:+.2f}")
+        for status, count in stats.statuses.most_common():
+            print(f"  {status:<18} {count}")
+
+
+if __name__ == "__main__":
+    main()
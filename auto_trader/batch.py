@@ -0,0 +1,178 @@
+"""
+Batch parsing for backfills and replays.
+
+parse_batch() runs the signal grammars over any iterable of messages, e.g.
+the raw_signal column of trades.csv or a Telegram Desktop channel export,
+spreading chunks across a process pool. Results stream back in input order
+and only a bounded number of chunks is in flight at once, so memory stays
+flat however long the history is.
+
+Usage:
+    python -m auto_trader.batch trades.csv --workers 4 --out parsed.csv
+    python -m auto_trader.batch result.json --source -1003771929527:emoji_card
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from .grammars import GrammarRegistry
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_FIELDS = ("asset", "direction", "expiry", "execute_time", "is_valid", "confidence")
+# --out row for a message a grammar's keyword prefilter rejected
+REJECTED = {"is_valid": False, "confidence": 0}
+
+# Registry built once per worker process by _init_worker
+_registry = None
+
+
+def _init_worker(assignments):
+    global _registry
+    _registry = GrammarRegistry(assignments)
+
+
+def _parse_chunk(chunk, registry=None):
+    parse = (registry or _registry).parse
+    return [
+        parse(item[1], item[0]) if isinstance(item, tuple) else parse(item)
+        for item in chunk
+    ]
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def parse_batch(messages, workers=None, chunk_size=500, assignments=None, max_in_flight=None):
+    """
+    Parses messages and yields one result per message, in input order.
+
+    messages are plain texts or (source_id, text) tuples; the source id picks
+    the grammar from assignments ({source_id: grammar name}, same format as
+    SIGNAL_GRAMMARS). Results are SignalParser.parse dicts, or None where a
+    grammar's keyword prefilter rejected the message.
+
+    workers=None uses one worker per CPU; 0 or 1 parses in the calling
+    process, since a single worker only adds pickling overhead.
+    At most max_in_flight chunks (default 2 per worker) are queued at once.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        registry = GrammarRegistry(assignments)
+        for chunk in _chunks(messages, chunk_size):
+            yield from _parse_chunk(chunk, registry)
+        return
+
+    max_in_flight = max_in_flight or workers * 2
+    pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(assignments,))
+    pending = deque()
+    try:
+        for chunk in _chunks(messages, chunk_size):
+            pending.append(pool.submit(_parse_chunk, chunk))
+            if len(pending) >= max_in_flight:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        # Also reached when the consumer stops iterating early
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def iter_csv_signals(path, column="raw_signal"):
+    """Streams one column of a CSV file (trades.csv by default)."""
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            text = row.get(column)
+            if text:
+                yield text
+
+
+def iter_export_messages(path, source_id=None):
+    """
+    Yields (source_id, text) for every text message in a Telegram Desktop
+    JSON export (result.json). The export is a single JSON document, so it is
+    loaded in full; only the parsing is streamed.
+    """
+    with open(path, encoding="utf-8") as f:
+        export = json.load(f)
+    if source_id is None and export.get("id") is not None:
+        # Desktop exports store the bare channel id
+        source_id = int(f"-100{export['id']}")
+    for message in export.get("messages", []):
+        text = message.get("text")
+        if isinstance(text, list):
+            # Formatted text is a list of plain strings and entity dicts
+            text = "".join(part if isinstance(part, str) else part.get("text", "") for part in text)
+        if text:
+            yield source_id, text
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parse a signal history in bulk.")
+    parser.add_argument("path", help="trades.csv-style CSV or Telegram Desktop result.json")
+    parser.add_argument("--column", default="raw_signal", help="CSV column holding the message")
+    parser.add_argument("--source", action="append", default=[],
+                        help="source_id:grammar, may be repeated (as SIGNAL_GRAMMARS)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="default: one per CPU; 0 or 1 = no process pool")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--out", help="write one CSV row per message here, numbered from 1")
+    args = parser.parse_args(argv)
+
+    assignments = {}
+    for pair in args.source:
+        source, grammar = pair.rsplit(":", 1)
+        assignments[int(source)] = grammar
+
+    if args.path.endswith(".json"):
+        messages = iter_export_messages(args.path)
+    else:
+        messages = iter_csv_signals(args.path, args.column)
+
+    out = open(args.out, "w", newline="", encoding="utf-8") if args.out else None
+    writer = csv.writer(out) if out else None
+    if writer:
+        writer.writerow(("message",) + OUTPUT_FIELDS)
+
+    total = valid = rejected = 0
+    start = time.perf_counter()
+    try:
+        for result in parse_batch(messages, args.workers, args.chunk_size, assignments):
+            total += 1
+            if result is None:
+                rejected += 1
+                result = REJECTED
+            valid += result["is_valid"]
+            if writer:
+                # Rejected messages get a row too, so row n is always message n
+                writer.writerow([total] + [result.get(f) for f in OUTPUT_FIELDS])
+    finally:
+        if out:
+            out.close()
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"{total} messages: {valid} valid, {rejected} rejected by prefilter, "
+        f"{total - valid - rejected} invalid | {elapsed:.2f}s "
+        f"({total / elapsed if elapsed else 0:,.0f} msgs/s)",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
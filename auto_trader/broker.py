@@ -0,0 +1,103 @@
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Executor, Future
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class BrokerWorker(Executor):
+    """
+    One long-lived thread that owns the TradeExecutor and its IQ_Option
+    connection.
+
+    The iqoptionapi client is synchronous, shared and not thread-safe, so every
+    broker call (connect, pre-arm, buy, asset refresh...) is queued here and run
+    in submission order on the same thread: no locks, no two trades racing on
+    the websocket. Callers get a concurrent.futures.Future back (or await
+    run()), so several requests can be queued back-to-back without waiting for
+    each other. Being an Executor it also works with loop.run_in_executor().
+    """
+
+    def __init__(self, executor, name: str = "broker"):
+        self.executor = executor
+        self.name = name
+        self.processed = 0
+        self.failed = 0
+        self.max_depth = 0
+        self.busy_seconds = 0.0
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._shutdown = False
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        if self._shutdown:
+            raise RuntimeError("BrokerWorker has been shut down")
+        self.start()
+        future = Future()
+        self._queue.put((future, fn, args, kwargs))
+        self.max_depth = max(self.max_depth, self._queue.qsize())
+        return future
+
+    async def run(self, fn, *args, **kwargs):
+        """Awaitable form of submit() for use from the event loop."""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def in_worker(self) -> bool:
+        return threading.current_thread() is self._thread
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            future, fn, args, kwargs = item
+            if not future.set_running_or_notify_cancel():
+                continue  # cancelled while queued
+            started = time.monotonic()
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                self.failed += 1
+                logger.error(f"Broker call {getattr(fn, '__name__', fn)} failed: {e}")
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+            finally:
+                self.processed += 1
+                self.busy_seconds += time.monotonic() - started
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        self._shutdown = True
+        if cancel_futures:
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not _STOP:
+                    item[0].cancel()
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            if wait:
+                self._thread.join()
+
+    def stats(self) -> dict:
+        return {
+            "depth": self._queue.qsize(),
+            "max_depth": self.max_depth,
+            "processed": self.processed,
+            "failed": self.failed,
+            "busy_seconds": round(self.busy_seconds, 3),
+        }
@@ -0,0 +1,70 @@
+import hashlib
+from collections import deque
+
+
+def signal_key(parsed_signal: dict) -> tuple:
+    """
+    Duplicate-suppression key of a parsed signal:
+    (asset, direction, execute_time, content hash).
+
+    The content hash is taken over the message text with whitespace collapsed
+    and case folded, so the same message forwarded by several sources is one
+    signal, while a CALL and a PUT on the same pair (or the same pair at
+    another minute) are different ones.
+    """
+    text = " ".join((parsed_signal.get("raw_text") or "").split()).casefold()
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+    return (
+        parsed_signal.get("asset"),
+        parsed_signal.get("direction"),
+        parsed_signal.get("execute_time"),
+        digest,
+    )
+
+
+class DedupeIndex:
+    """
+    Expiring index of recently accepted signals: key → time last accepted.
+
+    Every entry lives for the same `ttl` (the longest cooldown in use), so
+    expiry order is insertion order and a FIFO of (time, key) is a complete
+    timing wheel: add(), seen_within() and eviction are all O(1) (amortised).
+    Eviction runs on every add() and check, so memory is bounded by the
+    number of signals accepted within one ttl. Times are whatever clock the
+    caller passes (wall clock live, simulated time in replays); an entry added
+    out of order is at worst kept until the entries ahead of it expire.
+    """
+
+    def __init__(self, ttl):
+        # A number of seconds, or a callable returning one (read at eviction
+        # time, so cooldowns can be changed at runtime)
+        self._ttl = ttl if callable(ttl) else (lambda: ttl)
+        self._last_seen = {}
+        self._order = deque()
+
+    def __len__(self):
+        return len(self._last_seen)
+
+    def __contains__(self, key):
+        return key in self._last_seen
+
+    def evict(self, now: float):
+        horizon = now - self._ttl()
+        order = self._order
+        last_seen = self._last_seen
+        while order and order[0][0] <= horizon:
+            seen, key = order.popleft()
+            # Only drop the key if this was its latest sighting
+            if last_seen.get(key) == seen:
+                del last_seen[key]
+
+    def seen_within(self, key, window: float, now: float) -> bool:
+        """True if `key` was added less than `window` seconds before `now`."""
+        self.evict(now)
+        seen = self._last_seen.get(key)
+        return seen is not None and now - seen < window
+
+    def add(self, key, now: float):
+        self.evict(now)
+        self._last_seen[key] = now
+        self._order.append((now, key))
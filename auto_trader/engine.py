@@ -1,81 +1,134 @@
 import logging
 import asyncio
+import time
+from collections import deque
 from datetime import datetime
-from .parser import SignalParser
+from .grammars import GrammarRegistry
 from .validator import SignalValidator
-from .executor import TradeExecutor
+from .executor import RESULT_TIMEOUT, TradeExecutor
 from .tracker import ResultTracker
-from config import SIGNAL_MAX_WAIT_SECONDS, ENABLE_AUTO_TRADING
+from .store import TradeStore
+from .ledger import PnLLedger
+from .outcomes import ResultCollector
+from .timing import seconds_until_signal_minute
+from .scheduler import TradeScheduler
+from .broker import BrokerWorker
+from .refresher import AssetRefresher
+from .supervisor import ConnectionSupervisor
+from . import metrics
+from config import (
+    SIGNAL_MAX_WAIT_SECONDS, ENABLE_AUTO_TRADING, SIGNAL_GRAMMARS, PREARM_LEAD_SECONDS,
+    ASSET_REFRESH_INTERVAL, BROKER_HEARTBEAT_INTERVAL, TRADE_STORE_PATH,
+    RESULT_POLL_INTERVAL,
+)
 
 logger = logging.getLogger(__name__)
 
 
-def _seconds_until_signal_minute(signal_minute: int) -> float:
-    """
-    Calculate how many seconds until the local clock reaches `signal_minute`.
-
-    The minute number is timezone-agnostic: `:23` is `:23` everywhere, so we
-    simply compare it to the current local minute without any UTC conversion.
-
-    Returns:
-        positive float  → seconds to wait (we're before the target minute)
-        0.0             → already inside the target minute, execute now
-        negative float  → target minute has already passed, caller should skip
-    """
-    now = datetime.now()
-    current_minute = now.minute
-    current_second = now.second
-
-    if current_minute == signal_minute:
-        # Already inside the target minute — execute immediately
-        return 0.0
-
-    if current_minute < signal_minute:
-        # Target minute is still ahead this hour
-        wait = (signal_minute - current_minute) * 60 - current_second
-        return float(wait)
-
-    # current_minute > signal_minute → target minute has passed this hour
-    return float((signal_minute - current_minute) * 60 - current_second)  # negative
-
-
 class AutoTraderEngine:
     """
     Main orchestrator for the Binary Options Auto-Trading Extension.
-    Pipeline: parser → scheduler (minute-based) → validator → executor → tracker.
+    Pipeline: parser → scheduler (minute-based) → validator + pre-arm → executor → tracker.
     """
 
     def __init__(self):
-        self.parser = SignalParser()
-        self.validator = SignalValidator()
+        self.grammars = GrammarRegistry(SIGNAL_GRAMMARS)
+        # Today's P&L from settled trades; the validator's daily-loss guard reads it
+        self.ledger = PnLLedger()
+        self.validator = SignalValidator(self.ledger)
         self.executor = TradeExecutor()
-        self.tracker = ResultTracker()
+        self.store = TradeStore(TRADE_STORE_PATH) if TRADE_STORE_PATH else None
+        self.tracker = ResultTracker(store=self.store)
+        # One timer for every signal waiting on its minute
+        self.scheduler = TradeScheduler()
+        # The broker worker thread owns the IQ Option connection: every broker
+        # call is queued to it, and it stays warm between trades
+        self.broker = BrokerWorker(self.executor)
+        self.ack_latency_ms = deque(maxlen=500)
+        # Deadlines (time.monotonic()) of trades between their timing decision
+        # and placement; see buy_imminent()
+        self._pending_deadlines = []
+        self.refresher = AssetRefresher(
+            self.executor, self.broker, ASSET_REFRESH_INTERVAL, busy=self.buy_imminent
+        )
+        self.supervisor = ConnectionSupervisor(self.executor, self.broker, BROKER_HEARTBEAT_INTERVAL)
+        # Open positions by expiry; settled results go to the ledger and the journal
+        self.results = ResultCollector(
+            self.executor, self.broker, self.ledger, self.tracker,
+            retry=RESULT_POLL_INTERVAL, busy=self.buy_imminent,
+        )
+        self._background = []
+
+        # Served by the API's /metrics endpoint
+        metrics.register("broker", self.broker.stats)
+        metrics.register("broker_supervisor", self.supervisor.stats)
+        metrics.register("scheduler", self.scheduler.stats)
+        metrics.register("grammars", self.grammars.stats)
+        metrics.register("asset_refresher", self.refresher.stats)
+        metrics.register("trade_latency", self.latency_stats)
 
-        # Pre-connect to IQ Option eagerly at startup (in a background thread).
+        # Pre-connect to IQ Option eagerly at startup (on the broker thread).
         # This ensures the WebSocket and asset list are ready BEFORE the first
         # signal arrives, so actual trade execution is instant.
         if ENABLE_AUTO_TRADING:
             self._schedule_preconnect()
 
     def _schedule_preconnect(self):
-        """Schedule the IQ Option connection to run in the background at startup."""
+        """Queue the IQ Option connection, then the asset list, on the broker worker."""
+        self.broker.submit(self.executor.connect)
+        self.broker.submit(self.refresher.load)
+
+    def start(self):
+        """
+        Starts the background tasks (broker heartbeat, asset list refresh,
+        trade results). Needs a running loop.
+        """
+        if ENABLE_AUTO_TRADING and not self._background:
+            self._restore_validator()
+            self._background.append(asyncio.create_task(self.supervisor.run()))
+            self._background.append(asyncio.create_task(self.refresher.run()))
+            self._background.append(asyncio.create_task(self.results.run()))
+
+    def _restore_validator(self):
+        """Carries today's losses and recent trades (duplicate cooldowns) over a restart."""
+        if self.store is None:
+            return
         try:
-            loop = asyncio.get_event_loop()
-            loop.run_in_executor(None, self.executor.connect)
-        except RuntimeError:
-            # No event loop yet (e.g., imported at module level before loop starts)
-            # Connection will happen lazily on first trade instead.
-            pass
-
-    async def process_signal(self, text: str):
+            self.validator.current_daily_loss = self.store.daily_loss()
+            since = time.time() - self.validator.max_cooldown()
+            for row in self.store.recent_executed(since):
+                # Rebuild the dedupe keys from the stored text, as the signal
+                # was parsed then (grammar stats are left alone)
+                grammar = self.grammars.grammar_for(row["source_id"])
+                parsed = grammar.match(row["raw_signal"])
+                if parsed["is_valid"]:
+                    parsed["source_id"] = row["source_id"]
+                    self.validator.remember(parsed, row["received_at"])
+        except Exception as e:
+            logger.error(f"AutoTrader: Could not restore state from the trade store: {e}")
+
+    async def stop(self):
+        for task in self._background:
+            task.cancel()
+        await asyncio.gather(*self._background, return_exceptions=True)
+        self._background.clear()
+        await self.scheduler.close()
+        self.tracker.close()
+
+    async def process_signal(self, text: str, source_id: int = None):
         """
         Processes a raw telegram message.
+        The source chat id selects the provider's grammar (see SIGNAL_GRAMMARS).
         Waits (if necessary) until the signal's scheduled minute before trading.
         """
-        logger.info("AutoTrader received new signal text. Processing...")
-
         # 1. Parse
-        parsed = self.parser.parse(text)
+        parsed = self.grammars.parse(text, source_id)
+        if parsed is None:
+            logger.debug(f"AutoTrader: Chatter from {source_id} dropped by grammar prefilter.")
+            return
+
+        logger.info("AutoTrader received new signal text. Processing...")
+        parsed["source_id"] = source_id
         if not parsed.get("is_valid"):
             logger.debug("AutoTrader: Signal could not be parsed or is invalid.")
             self.tracker.log_trade(parsed, {"error": "Parse failed"}, "INVALID_FORMAT")
@@ -87,19 +140,18 @@ class AutoTraderEngine:
         )
 
         # 2. Minute-based timing check
+        wait = 0.0
         execute_time = parsed.get("execute_time")
         if execute_time:
             signal_minute = int(execute_time.split(":")[1])
-            wait = _seconds_until_signal_minute(signal_minute)
+            wait = seconds_until_signal_minute(signal_minute)
 
             if 0 < wait <= SIGNAL_MAX_WAIT_SECONDS:
                 logger.info(
                     f"AutoTrader: Current minute is :{datetime.now().minute:02d}, "
                     f"signal minute is :{signal_minute:02d}. "
-                    f"Sleeping {wait:.1f}s..."
+                    f"Waiting {wait:.1f}s..."
                 )
-                await asyncio.sleep(wait)
-                logger.info("AutoTrader: Scheduled minute reached. Executing trade now.")
 
             elif wait > SIGNAL_MAX_WAIT_SECONDS:
                 logger.warning(
@@ -126,15 +178,59 @@ class AutoTraderEngine:
         else:
             logger.info("AutoTrader: No execution time in signal. Executing immediately.")
 
-        # 3. Validate
+        deadline = time.monotonic() + wait
+        self._pending_deadlines.append(deadline)
+        try:
+            await self._execute(parsed, wait, deadline)
+        finally:
+            self._pending_deadlines.remove(deadline)
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending_deadlines)
+
+    def buy_imminent(self) -> bool:
+        """
+        True while a pending trade is about to use the broker thread: from
+        PREARM_LEAD_SECONDS + RESULT_TIMEOUT before its deadline (so a lookup
+        started just before cannot delay the pre-arm) until it is placed.
+        Background broker work (result lookups, asset refreshes) waits only
+        then, not for the whole time a signal waits for its minute.
+        """
+        horizon = time.monotonic() + PREARM_LEAD_SECONDS + RESULT_TIMEOUT
+        return any(deadline <= horizon for deadline in self._pending_deadlines)
+
+    async def _execute(self, parsed: dict, wait: float, deadline: float):
+        # 3. Pre-arm: validate, check the connection and the asset shortly
+        #    before the minute, so that only the buy call is left at the minute
+        if wait > PREARM_LEAD_SECONDS:
+            await self.scheduler.sleep(wait - PREARM_LEAD_SECONDS)
+
         if not self.validator.validate(parsed):
             logger.info("AutoTrader: Signal failed validation.")
             self.tracker.log_trade(parsed, {"error": "Validation failed"}, "VALIDATION_FAILED")
             return
 
-        # 4. Execute (in a separate thread since api-iqoption-faria is synchronous)
-        logger.info("AutoTrader: Signal validated. Handing off to executor...")
-        execution_result = await asyncio.to_thread(self.executor.execute_trade, parsed)
+        prepared = await self.broker.run(self.executor.prepare_trade, parsed)
+        if not prepared["success"]:
+            logger.error(f"AutoTrader: Trade execution failed: {prepared.get('error')}")
+            self._check_stale_asset(prepared)
+            self.tracker.log_trade(parsed, prepared, "EXECUTION_FAILED")
+            return
+
+        # 4. Fire at the deadline (the broker thread is already warm)
+        remaining = deadline - time.monotonic()
+        if remaining > 0:
+            lateness = await self.scheduler.sleep(remaining)
+            logger.info(
+                f"AutoTrader: Scheduled minute reached (+{lateness * 1000:.1f}ms). "
+                f"Executing trade now."
+            )
+        execution_result = await self.broker.run(self._place_timed, prepared["order"], deadline)
+        logger.info(
+            f"AutoTrader: Broker ack {execution_result['ack_ms']:.1f}ms after the scheduled time "
+            f"(buy call started +{execution_result['dispatch_ms']:.1f}ms)."
+        )
 
         # 5. Track
         if execution_result.get("success"):
@@ -142,12 +238,43 @@ class AutoTraderEngine:
                 f"AutoTrader: Trade successfully executed! ID: {execution_result.get('trade_id')}"
             )
             self.tracker.log_trade(parsed, execution_result, "EXECUTED")
+            if execution_result.get("trade_id") is not None:
+                self.results.track(execution_result["trade_id"], parsed)
         else:
             logger.error(
                 f"AutoTrader: Trade execution failed: {execution_result.get('error')}"
             )
+            self._check_stale_asset(execution_result)
             self.tracker.log_trade(parsed, execution_result, "EXECUTION_FAILED")
 
+    def _check_stale_asset(self, result: dict):
+        """An asset the catalog or buy() did not know may be newly listed: refresh early."""
+        asset = result.get("stale_asset")
+        if asset:
+            self.refresher.request(f"{asset} not listed")
+
+    def _place_timed(self, order: tuple, deadline: float) -> dict:
+        """Runs on the broker thread: place the order and time it against its deadline."""
+        started = time.monotonic()
+        result = self.executor.place_trade(order)
+        acked = time.monotonic()
+        result["dispatch_ms"] = (started - deadline) * 1000
+        result["ack_ms"] = (acked - deadline) * 1000
+        self.ack_latency_ms.append(result["ack_ms"])
+        return result
+
+    def latency_stats(self) -> dict:
+        """Scheduled-time → broker-acknowledgement latency over recent trades."""
+        samples = sorted(self.ack_latency_ms)
+        if not samples:
+            return {"trades": 0}
+        return {
+            "trades": len(samples),
+            "ack_avg_ms": round(sum(samples) / len(samples), 1),
+            "ack_p50_ms": round(samples[len(samples) // 2], 1),
+            "ack_max_ms": round(samples[-1], 1),
+        }
+
 
 # Provide a global instance for easy import
 auto_trader_engine = AutoTraderEngine()
@@ -1,8 +1,22 @@
 import logging
-from config import IQ_OPTION_EMAIL, IQ_OPTION_PASSWORD, TRADE_AMOUNT, USE_PRACTICE_ACCOUNT
+import time
+from config import (
+    IQ_OPTION_EMAIL, IQ_OPTION_PASSWORD, TRADE_AMOUNT, USE_PRACTICE_ACCOUNT, ASSET_ALIASES,
+)
+from .assets import AssetCatalog
 
 logger = logging.getLogger(__name__)
 
+# Minimum number of recently closed options fetched per result lookup
+RESULT_LOOKBACK = 20
+# Seconds a result lookup waits for the broker's reply (buy() allows 5 too)
+RESULT_TIMEOUT = 5.0
+RESULT_POLL_SECONDS = 0.05
+
+# Login error codes that retrying cannot fix: wrong credentials, or a 2FA
+# code the bot cannot enter
+AUTH_ERROR_CODES = ("invalid_credentials", "verify")
+
 # Note: The api-iqoption-faria library imports from iqoptionapi
 try:
     from iqoptionapi.stable_api import IQ_Option
@@ -13,121 +27,154 @@ except ImportError:
     OP_code = None
 
 
+def _is_auth_rejection(reason) -> bool:
+    """connect() returns the broker's JSON error body: {"code": "invalid_credentials", ...}"""
+    text = str(reason)
+    return any(f'"{code}"' in text for code in AUTH_ERROR_CODES)
+
+
 class TradeExecutor:
     def __init__(self):
         self.email = IQ_OPTION_EMAIL
         self.password = IQ_OPTION_PASSWORD
         self.api = None
         self.is_connected = False
+        # Set when a login can never succeed (no or rejected credentials);
+        # no further logins are attempted until a restart
+        self.auth_error = None
+        # Indexed snapshot of the live asset list. Loaded and replaced in the
+        # background by AssetRefresher (see refresher.py)
+        self.catalog = AssetCatalog.empty()
 
     def connect(self) -> bool:
         """
-        Establish a fresh connection to IQ Option.
-
-        After authenticating, calls get_ALL_Binary_ACTIVES_OPCODE() which fetches
-        the live binary + turbo asset list from IQ Option's servers and populates
-        the OP_code.ACTIVES dict. This dict is what api.buy() reads from, so it
-        must be up-to-date before any trade is placed.
+        Establish a fresh connection to IQ Option: log in and switch to the
+        configured balance.
 
-        The hardcoded constants.py that ships with the library is outdated and
-        missing most OTC pairs (EURAUD-OTC, USDMXN-OTC, CADCHF-OTC, etc.).
-        get_ALL_Binary_ACTIVES_OPCODE() fetches the current live list and
-        patches ACTIVES at runtime, solving the KeyError entirely.
+        The asset list is not fetched here. AssetRefresher loads it on the
+        broker thread right after the startup connect and keeps it current;
+        the catalog and the patched OP_code.ACTIVES survive a reconnect, so a
+        dropped session is back in one login instead of a login plus three
+        catalog calls.
         """
+        api = self._open_session()
+        if api is not None:
+            self.api = api
+            self.is_connected = True
+            return True
+        else:
+            self.is_connected = False
+            return False
+
+    def _open_session(self):
+        """Logs in a new IQ_Option session on the configured balance; None on failure."""
         if not IQ_Option:
             logger.error("IQ_Option module is not installed.")
-            return False
+            return None
+
+        if self.auth_error:
+            logger.error(f"Not logging in to IQ Option: {self.auth_error}. Fix .env and restart.")
+            return None
 
         if not self.email or not self.password:
             logger.error("IQ Option credentials missing in .env!")
-            return False
+            self.auth_error = "credentials missing"
+            return None
 
         logger.info("Connecting to IQ Option...")
-        self.api = IQ_Option(self.email, self.password)
-        check, reason = self.api.connect()
-
-        if check:
-            logger.info("Connected to IQ Option successfully.")
-            self.is_connected = True
-            balance_type = "PRACTICE" if USE_PRACTICE_ACCOUNT else "REAL"
-            self.api.change_balance(balance_type)
-            logger.info(f"Using {balance_type} account. Balance: {self.api.get_balance()}")
-            self._load_asset_list()
-            return True
-        else:
+        api = IQ_Option(self.email, self.password)
+        check, reason = api.connect()
+        if not check:
             logger.error(f"Failed to connect to IQ Option: {reason}")
-            self.is_connected = False
+            if _is_auth_rejection(reason):
+                self.auth_error = "login rejected"
+            return None
+
+        logger.info("Connected to IQ Option successfully.")
+        balance_type = "PRACTICE" if USE_PRACTICE_ACCOUNT else "REAL"
+        api.change_balance(balance_type)
+        logger.info(f"Using {balance_type} account. Balance: {api.get_balance()}")
+        return api
+
+    def is_alive(self) -> bool:
+        """Queries the live socket of the active session, not just the in-memory flag."""
+        if not self.is_connected or self.api is None:
+            return False
+        try:
+            return bool(self.api.check_connect())
+        except Exception:
             return False
 
-    def _load_asset_list(self) -> None:
+    def fetch_asset_catalog(self):
         """
         Fetch the live binary + turbo asset list from IQ Option and patch
         OP_code.ACTIVES so api.buy() can resolve all asset names, including
         OTC pairs that are missing from the stale hardcoded constants.py.
 
         Uses get_ALL_Binary_ACTIVES_OPCODE() — the officially supported method
-        in the stable_api.py for this purpose.
+        in the stable_api.py for this purpose. Open/closed status and payouts
+        are fetched alongside and the whole lot is indexed into a new
+        AssetCatalog. Returns it (None on failure) without installing it: the
+        caller swaps it in. Must run on the broker thread, like buy().
         """
         try:
-            logger.info("Fetching live asset list from IQ Option...")
+            logger.debug("Fetching live asset list from IQ Option...")
             self.api.get_ALL_Binary_ACTIVES_OPCODE()
-            otc_count = sum(1 for k in OP_code.ACTIVES if "OTC" in str(k))
-            logger.info(
-                f"Asset list loaded: {len(OP_code.ACTIVES)} total assets "
-                f"({otc_count} OTC). Ready to trade."
-            )
         except Exception as e:
             logger.error(f"Failed to load asset list: {e}. Trades may fail for unlisted assets.")
+            return None
+
+        open_times = {}
+        try:
+            all_open = self.api.get_all_open_time()
+            open_times = {kind: all_open.get(kind, {}) for kind in ("turbo", "binary")}
+        except Exception as e:
+            logger.warning(f"Could not fetch asset open times: {e}")
+
+        profits = {}
+        try:
+            profits = self.api.get_all_profit()
+        except Exception as e:
+            logger.warning(f"Could not fetch asset payouts: {e}")
+
+        return AssetCatalog(dict(OP_code.ACTIVES), open_times, profits, ASSET_ALIASES)
 
     def _ensure_connected(self) -> bool:
         """
         Verify the WebSocket session is still alive before every trade.
-        Uses api.check_connect() to query the live socket, not just the in-memory flag.
-        """
-        if not self.is_connected or self.api is None:
-            return self.connect()
 
-        try:
-            still_alive = self.api.check_connect()
-        except Exception:
-            still_alive = False
+        The ConnectionSupervisor normally finds a dropped socket first; this
+        is the last resort on the trade path: reconnect synchronously.
+        """
+        if self.is_alive():
+            return True
 
-        if not still_alive:
+        if self.api is not None:
             logger.warning("IQ Option WebSocket dropped. Reconnecting...")
-            self.is_connected = False
-            return self.connect()
-
-        return True
+        self.is_connected = False
+        return self.connect()
 
-    def _check_asset_available(self, asset: str) -> bool:
+    def _resolve_asset(self, asset: str):
         """
-        Check if the asset is in OP_code.ACTIVES before calling buy().
+        Look the asset up in the catalog before calling buy().
 
-        OP_code.ACTIVES is the dict that api.buy() reads from. If the asset
-        isn't there, buy() raises a KeyError. We check here first so we can
-        log a clear reason and avoid a misleading traceback.
+        api.buy() reads OP_code.ACTIVES and raises a KeyError for unknown names.
+        The catalog resolves provider spellings ("EUR/JPY OTC") and aliases to
+        the broker's own name in O(1), so we can log a clear reason instead of
+        a misleading traceback. Misses are reported once per name.
         """
-        if OP_code is None:
-            return False
+        info = self.catalog.resolve(asset)
+        if info is None:
+            self.catalog.report_missing(asset)
+        return info
 
-        if asset in OP_code.ACTIVES:
-            return True
-
-        otc_assets = sorted(k for k in OP_code.ACTIVES if "OTC" in str(k))
-        logger.warning(
-            f"Asset '{asset}' not found in ACTIVES. "
-            f"Known OTC assets ({len(otc_assets)}): {otc_assets}"
-        )
-        return False
-
-    def execute_trade(self, parsed_signal: dict) -> dict:
+    def prepare_trade(self, parsed_signal: dict) -> dict:
         """
-        Executes a binary options trade.
+        Pre-arms a trade: everything execute_trade() does before api.buy().
 
-        Error handling:
-          - Stale connection  → reconnect via _ensure_connected()
-          - Asset not listed  → log clearly and skip (not a connection issue)
-          - Other errors      → log and mark disconnected for safety
+        Verifies the WebSocket session and that the asset is listed, and
+        returns {"success": True, "order": (amount, asset, direction, expiry)}
+        ready for place_trade(), or {"success": False, "error": ...}.
         """
         # 1. Ensure WebSocket is alive
         if not self._ensure_connected():
@@ -138,13 +185,29 @@ class TradeExecutor:
         expiry = parsed_signal["expiry"]
         amount = TRADE_AMOUNT
 
-        # 2. Verify asset is in the live ACTIVES dict before calling buy()
-        if not self._check_asset_available(asset):
+        # 2. Verify asset is listed and open before calling buy()
+        info = self._resolve_asset(asset)
+        if info is None:
             return {
                 "success": False,
                 "error": f"Asset '{asset}' not in IQ Option asset list",
+                "stale_asset": asset,
             }
+        if info.is_open(expiry) is False:
+            return {"success": False, "error": f"Asset '{info.name}' is closed"}
 
+        return {"success": True, "order": (amount, info.name, direction, expiry)}
+
+    def place_trade(self, order: tuple) -> dict:
+        """
+        Places a pre-armed order (from prepare_trade) with a single api.buy().
+
+        Error handling:
+          - Asset not listed  → report with "stale_asset" set; the connection is
+                                fine, the catalog is refreshed in the background
+          - Other errors      → log and mark disconnected for safety
+        """
+        amount, asset, direction, expiry = order
         logger.info(f"Executing Trade: {asset} | {direction.upper()} | {expiry}m | ${amount}")
 
         try:
@@ -159,13 +222,77 @@ class TradeExecutor:
         except KeyError as e:
             logger.error(
                 f"KeyError on buy({asset}): {e}. "
-                "Asset may have been removed from ACTIVES. Reloading asset list..."
+                "Asset may have been removed from ACTIVES."
             )
-            self._load_asset_list()
-            self.is_connected = False
-            return {"success": False, "error": f"Asset lookup error: {e}"}
+            return {"success": False, "error": f"Asset lookup error: {e}", "stale_asset": asset}
 
         except Exception as e:
             logger.error(f"Exception during trade execution: {e}", exc_info=True)
             self.is_connected = False
             return {"success": False, "error": str(e)}
+
+    def check_results(self, trade_ids) -> dict:
+        """
+        Looks up the results of several trades in one request.
+
+        get_optioninfo_v2(n) returns the n most recently closed binary/turbo
+        options; the ones asked for are matched by id. Returns
+        {trade_id: (outcome, profit)} with outcome WIN/LOSS/DRAW and profit
+        net of the stake; trades that have not closed yet (or all of them, if
+        the broker does not answer within RESULT_TIMEOUT) are left out.
+        """
+        wanted = {str(trade_id): trade_id for trade_id in trade_ids}
+        if not wanted or not self.is_alive():
+            return {}
+
+        data = self._closed_options(max(2 * len(wanted), RESULT_LOOKBACK))
+        closed = (data or {}).get("msg", {}).get("closed_options", [])
+        results = {}
+        for option in closed:
+            ids = option.get("id")
+            for option_id in ids if isinstance(ids, list) else [ids]:
+                trade_id = wanted.get(str(option_id))
+                if trade_id is None:
+                    continue
+                amount = float(option.get("amount") or 0)
+                win = option.get("win")
+                if win == "win":
+                    results[trade_id] = ("WIN", float(option.get("win_amount") or 0) - amount)
+                elif win == "equal":
+                    results[trade_id] = ("DRAW", 0.0)
+                else:
+                    results[trade_id] = ("LOSS", -amount)
+        return results
+
+    def _closed_options(self, limit: int):
+        """
+        get_optioninfo_v2() without its unbounded busy-wait: the library spins
+        on `while get_options_v2_data == None: pass`, which would hang the
+        broker thread (and every buy queued behind it) if the socket dropped
+        mid-request. Sends the same request and polls for the reply against a
+        RESULT_TIMEOUT deadline instead; None on timeout.
+        """
+        ws = self.api.api
+        ws.get_options_v2_data = None
+        ws.get_options_v2(limit, "binary,turbo")
+        deadline = time.monotonic() + RESULT_TIMEOUT
+        while ws.get_options_v2_data is None:
+            if time.monotonic() >= deadline:
+                logger.warning(f"No reply to the result lookup within {RESULT_TIMEOUT:.0f}s.")
+                return None
+            time.sleep(RESULT_POLL_SECONDS)
+        return ws.get_options_v2_data
+
+    def execute_trade(self, parsed_signal: dict) -> dict:
+        """
+        Executes a binary options trade: prepare_trade() then place_trade().
+
+        Error handling:
+          - Stale connection  → reconnect via _ensure_connected()
+          - Asset not listed  → log clearly and skip (not a connection issue)
+          - Other errors      → log and mark disconnected for safety
+        """
+        prepared = self.prepare_trade(parsed_signal)
+        if not prepared["success"]:
+            return prepared
+        return self.place_trade(prepared["order"])
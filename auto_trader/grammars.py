@@ -0,0 +1,179 @@
+import re
+import time
+import logging
+from .parser import SignalParser
+
+logger = logging.getLogger(__name__)
+
+_DIRECTION_WORDS = {
+    "CALL": "CALL", "UP": "CALL", "BUY": "CALL",
+    "PUT": "PUT", "DOWN": "PUT", "SELL": "PUT",
+}
+
+
+def empty_result(text: str) -> dict:
+    """An invalid signal in the shape SignalParser.parse returns."""
+    return {
+        "asset": None,
+        "direction": None,
+        "expiry": None,
+        "execute_time": None,
+        "is_valid": False,
+        "confidence": 0.0,
+        "spans": {},
+        "raw_text": text,
+    }
+
+
+class GenericGrammar:
+    """
+    Fallback for sources without a dedicated format: the generic SignalParser.
+    """
+
+    def __init__(self, name: str = "generic", keywords=()):
+        self.name = name
+        self.keywords = tuple(k.upper() for k in keywords)
+        self._parser = SignalParser()
+
+    def match(self, text: str) -> dict:
+        return self._parser.parse(text)
+
+
+class SignalGrammar:
+    """
+    A provider's message format compiled into one pattern.
+
+    The pattern uses named groups: base and quote (the pair halves), otc
+    (optional, any text), direction (CALL/PUT or UP/DOWN/BUY/SELL), expiry
+    (minutes) and optionally hour and minute for the execution time.
+    keywords are plain substrings that must all appear in the message before
+    the pattern runs, so chatter is dropped without touching the regex engine.
+    """
+
+    def __init__(self, name: str, pattern: str, keywords=(), flags: int = 0):
+        self.name = name
+        self.keywords = tuple(k.upper() for k in keywords)
+        self.pattern = re.compile(pattern, flags | re.IGNORECASE)
+
+    def match(self, text: str) -> dict:
+        result = empty_result(text)
+        m = self.pattern.search(text)
+        if not m:
+            return result
+
+        groups = m.groupdict()
+        spans = result["spans"]
+        result["asset"] = (m["base"] + m["quote"]).upper()
+        spans["asset"] = (m.start("base"), m.end("quote"))
+        if groups.get("otc"):
+            result["asset"] += "-OTC"
+        result["direction"] = _DIRECTION_WORDS[m["direction"].upper()]
+        spans["direction"] = m.span("direction")
+        result["expiry"] = int(m["expiry"])
+        spans["expiry"] = m.span("expiry")
+        if groups.get("hour") is not None:
+            result["execute_time"] = f"{int(m['hour']):02d}:{m['minute']}"
+            spans["execute_time"] = (m.start("hour"), m.end("minute"))
+
+        result["is_valid"] = True
+        result["confidence"] = 1.0
+        return result
+
+
+# Built-in formats, referenced by name from SIGNAL_GRAMMARS
+GRAMMARS = {
+    # 📊 EURJPY-OTC ⏰ 08:16 ⌛️ 1 Minute 🔼 CALL BUY 🟢
+    "emoji_card": SignalGrammar(
+        "emoji_card",
+        r"📊\s*(?P<base>[A-Z]{3})/?(?P<quote>[A-Z]{3})(?P<otc>-OTC)?\b"
+        r"\W*⏰\s*(?P<hour>\d{1,2}):(?P<minute>\d{2})\b"
+        r"\W*(?P<expiry>\d+)\s*MIN(?:UTES?)?\b"
+        r"\W*(?P<direction>CALL|PUT)\b",
+        keywords=("📊", "⏰"),
+    ),
+    # Asset: EUR/USD / Direction: PUT / Expiry: M5 (or 5 min)
+    "labelled": SignalGrammar(
+        "labelled",
+        r"ASSET:\s*(?P<otc>OTC\s+)?(?P<base>[A-Z]{3})/?(?P<quote>[A-Z]{3})\b"
+        r".*?DIRECTION:\s*(?P<direction>CALL|PUT|UP|DOWN|BUY|SELL)\b"
+        r".*?EXPIRY:\s*M?(?P<expiry>\d+)",
+        keywords=("ASSET", "DIRECTION", "EXPIRY"),
+        flags=re.DOTALL,
+    ),
+    "generic": GenericGrammar(),
+}
+
+
+class GrammarStats:
+    __slots__ = ("hits", "misses", "rejected", "latency_ns")
+
+    def __init__(self):
+        self.hits = 0        # pattern matched
+        self.misses = 0      # passed the prefilter but did not match
+        self.rejected = 0    # dropped by the keyword prefilter
+        self.latency_ns = 0  # total time spent in parse(), all outcomes
+
+    def as_dict(self) -> dict:
+        calls = self.hits + self.misses + self.rejected
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "rejected": self.rejected,
+            "avg_latency_us": round(self.latency_ns / calls / 1000, 2) if calls else 0.0,
+        }
+
+
+class GrammarRegistry:
+    """
+    Picks the grammar for a message by its source chat id.
+
+    Sources without an entry use the default (generic) grammar, which keeps the
+    previous behaviour for every provider that has not been given a format.
+    """
+
+    def __init__(self, assignments=None, grammars=None, default: str = "generic"):
+        self.grammars = dict(grammars if grammars is not None else GRAMMARS)
+        self.default = self.grammars[default]
+        self._by_source = {}
+        self._stats = {name: GrammarStats() for name in self.grammars}
+        for source_id, name in (assignments or {}).items():
+            self.assign(source_id, name)
+
+    def assign(self, source_id: int, name: str):
+        if name not in self.grammars:
+            raise ValueError(f"Unknown signal grammar '{name}' for source {source_id}")
+        self._by_source[source_id] = self.grammars[name]
+
+    def grammar_for(self, source_id):
+        return self._by_source.get(source_id, self.default)
+
+    def parse(self, text: str, source_id=None):
+        """
+        Returns the parsed signal dict (same shape as SignalParser.parse;
+        is_valid is False when the grammar did not match), or None when the
+        keyword prefilter rejected the message as chatter.
+        """
+        grammar = self.grammar_for(source_id)
+        stats = self._stats[grammar.name]
+        start = time.perf_counter_ns()
+
+        text = text or ""
+        if grammar.keywords:
+            # Keywords are matched case-insensitively against one upper-cased copy
+            text_upper = text.upper()
+            if not all(k in text_upper for k in grammar.keywords):
+                stats.rejected += 1
+                stats.latency_ns += time.perf_counter_ns() - start
+                return None
+
+        result = grammar.match(text)
+        if result["is_valid"]:
+            stats.hits += 1
+        else:
+            stats.misses += 1
+        stats.latency_ns += time.perf_counter_ns() - start
+        return result
+
+    def stats(self) -> dict:
+        return {name: s.as_dict() for name, s in self._stats.items()}
+
@@ -0,0 +1,233 @@
+import atexit
+import csv
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import date, datetime
+
+logger = logging.getLogger(__name__)
+
+HEADER = [
+    "timestamp", "asset", "direction", "expiry",
+    "status", "trade_id", "error_message", "raw_signal", "profit",
+]
+
+# Rows with these statuses are fsynced before the writer moves on: they record
+# a real (or attempted) order or its result, unlike parse and validation
+# rejections
+DURABLE_STATUSES = frozenset({"EXECUTED", "EXECUTION_FAILED", "WIN", "LOSS", "DRAW"})
+
+_STOP = object()
+
+
+class TradeJournal:
+    """
+    Append-only CSV journal written by one background thread.
+
+    Rows are dicts keyed by HEADER. Extra keys such as source_id are kept for
+    the optional TradeStore, which receives every batch in one transaction
+    after it is written to the CSV. append() only puts the row on a queue, so
+    the event loop never touches the file. The writer thread keeps the file open and writes rows in batches:
+    when `batch_size` rows are pending or the oldest pending row is
+    `flush_interval` seconds old. Durability points are fsynced: a batch that
+    contains an order (DURABLE_STATUSES), a day rotation, flush() and close().
+
+    The live file is always `path` (trades.csv). On the first row of a new day
+    the previous day's file is renamed to trades.YYYY-MM-DD.csv and a new one
+    is started with the header. A live file that predates a HEADER column
+    keeps its own header until it is rotated. close() is registered with
+    atexit and drains everything still queued.
+    """
+
+    def __init__(self, path: str = "trades.csv", batch_size: int = 100,
+                 flush_interval: float = 1.0, rotate: bool = True, store=None):
+        self.path = path
+        self.store = store
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.rotate = rotate
+        self.written = 0
+        self.batches = 0
+        self.fsyncs = 0
+        self.rotations = 0
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._closed = False
+        self._file = None
+        self._writer = None
+        self._day = None
+
+    # -- producer side (any thread) -----------------------------------------
+
+    def _start(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="trade-journal", daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.close)
+
+    def append(self, row: dict, durable: bool = False) -> None:
+        """Queues one row; never blocks on I/O."""
+        if self._closed:
+            logger.error(f"Trade journal closed, dropping row: {row}")
+            return
+        self._start()
+        self._queue.put((row, durable))
+
+    def flush(self, timeout: float = None) -> bool:
+        """Blocks until every row queued so far is written and fsynced."""
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout: float = None) -> None:
+        """Writes and fsyncs everything queued, then stops the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+
+    # -- writer thread ------------------------------------------------------
+
+    def _run(self):
+        pending = []
+        durable = False
+        oldest = None
+        while True:
+            timeout = None
+            if pending:
+                timeout = max(0.0, oldest + self.flush_interval - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is not None and item is not _STOP and not isinstance(item, threading.Event):
+                row, is_durable = item
+                if not pending:
+                    oldest = time.monotonic()
+                pending.append(row)
+                durable = durable or is_durable
+                if len(pending) < self.batch_size:
+                    continue
+
+            # Size or time limit reached, or a flush/close marker
+            sync = durable or item is _STOP or isinstance(item, threading.Event)
+            if pending or sync:
+                self._write_batch(pending, sync)
+            pending = []
+            durable = False
+
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is _STOP:
+                self._close_file()
+                return
+
+    def _write_batch(self, rows: list, sync: bool):
+        try:
+            for row in rows:
+                self._open_for(_row_day(row))
+                self._writer.writerow(row)
+            if self._file is not None:
+                self._file.flush()
+                if sync:
+                    os.fsync(self._file.fileno())
+                    self.fsyncs += 1
+            self.written += len(rows)
+            if rows:
+                self.batches += 1
+        except Exception as e:
+            logger.error(f"Failed to write {len(rows)} trade(s) to {self.path}: {e}")
+
+        if self.store is not None and rows:
+            try:
+                self.store.insert_many(rows)
+            except Exception as e:
+                logger.error(f"Failed to store {len(rows)} trade(s): {e}")
+
+    def _open_for(self, day: date):
+        if self._file is not None and (not self.rotate or day == self._day):
+            return
+
+        if self._file is None:
+            self._day = self._file_day() or day
+        if self.rotate and self._day != day and os.path.exists(self.path):
+            self._close_file()
+            dated = _dated_path(self.path, self._day)
+            os.replace(self.path, dated)
+            self.rotations += 1
+            logger.info(f"Trade journal rotated to {dated}")
+        self._day = day
+
+        if self._file is None:
+            fieldnames = self._existing_header()
+            self._file = open(self.path, mode="a", newline="", encoding="utf-8")
+            self._writer = csv.DictWriter(
+                self._file, fieldnames=fieldnames or HEADER, extrasaction="ignore"
+            )
+            if not fieldnames:
+                self._writer.writeheader()
+
+    def _existing_header(self):
+        try:
+            with open(self.path, newline="", encoding="utf-8") as f:
+                return next(csv.reader(f), None)
+        except FileNotFoundError:
+            return None
+
+    def _file_day(self):
+        """Day of an existing live file (its last modification), if any."""
+        try:
+            return datetime.fromtimestamp(os.path.getmtime(self.path)).date()
+        except OSError:
+            return None
+
+    def _close_file(self):
+        if self._file is None:
+            return
+        try:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.fsyncs += 1
+            self._file.close()
+        except Exception as e:
+            logger.error(f"Failed to close trade journal {self.path}: {e}")
+        self._file = None
+        self._writer = None
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "batches": self.batches,
+            "fsyncs": self.fsyncs,
+            "rotations": self.rotations,
+        }
+
+
+def _row_day(row: dict) -> date:
+    try:
+        return datetime.strptime(row["timestamp"][:10], "%Y-%m-%d").date()
+    except (ValueError, TypeError, KeyError):
+        return date.today()
+
+
+def _dated_path(path: str, day: date) -> str:
+    """trades.csv → trades.2026-04-09.csv (trades.2026-04-09.1.csv if taken)"""
+    root, ext = os.path.splitext(path)
+    dated = f"{root}.{day.isoformat()}{ext}"
+    n = 0
+    while os.path.exists(dated):
+        n += 1
+        dated = f"{root}.{day.isoformat()}.{n}{ext}"
+    return dated
@@ -0,0 +1,76 @@
+import logging
+from datetime import date
+
+logger = logging.getLogger(__name__)
+
+OUTCOMES = ("WIN", "LOSS", "DRAW")
+
+
+class PnLLedger:
+    """
+    Running profit and loss of the current trading day.
+
+    Settled trades are added with record() as their results come in; every
+    figure is a running total, so the validator's daily-loss check is O(1).
+    The day rolls over on the first read or write after local midnight (the
+    `today` callable, injectable for tests and replays), which resets the
+    totals. `loss` is the sum of the day's losing amounts, as MAX_DAILY_LOSS
+    is compared against.
+    """
+
+    def __init__(self, today=date.today):
+        self._today = today
+        self.day = today()
+        self._reset()
+        self._seen = set()
+
+    def _reset(self):
+        self.pnl = 0.0
+        self.loss = 0.0
+        self.counts = dict.fromkeys(OUTCOMES, 0)
+
+    def _roll(self):
+        today = self._today()
+        if today != self.day:
+            logger.info(
+                f"Trading day {self.day} closed: P&L {self.pnl:+.2f}, "
+                f"{self.counts['WIN']}W/{self.counts['LOSS']}L/{self.counts['DRAW']}D."
+            )
+            self.day = today
+            self._reset()
+            self._seen.clear()
+
+    def record(self, trade_id, outcome: str, profit: float) -> bool:
+        """
+        Adds a settled trade (profit is negative for a loss). A trade_id is
+        only counted once per day; returns False for a repeat.
+        """
+        self._roll()
+        if trade_id is not None:
+            if trade_id in self._seen:
+                return False
+            self._seen.add(trade_id)
+        self.counts[outcome] = self.counts.get(outcome, 0) + 1
+        self.pnl += profit
+        if profit < 0:
+            self.loss -= profit
+        return True
+
+    @property
+    def daily_loss(self) -> float:
+        self._roll()
+        return self.loss
+
+    @daily_loss.setter
+    def daily_loss(self, value: float):
+        self._roll()
+        self.loss = value
+
+    def snapshot(self) -> dict:
+        self._roll()
+        return {
+            "day": self.day.isoformat(),
+            "pnl": round(self.pnl, 2),
+            "loss": round(self.loss, 2),
+            **{outcome.lower(): n for outcome, n in self.counts.items()},
+        }
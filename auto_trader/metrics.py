@@ -0,0 +1,30 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+# name -> zero-argument callable returning a JSON-serialisable dict
+_sources = {}
+
+
+def register(name: str, stats) -> None:
+    """
+    Publishes a component's stats() under `name`. Registering a name again
+    replaces the previous source.
+    """
+    _sources[name] = stats
+
+
+def snapshot() -> dict:
+    """
+    Current stats of every registered component, read on demand. The API's
+    /metrics endpoint serves this; it runs in the bot's process (start.py), so
+    a standalone api.py has nothing registered.
+    """
+    result = {}
+    for name, stats in list(_sources.items()):
+        try:
+            result[name] = stats()
+        except Exception as e:
+            logger.error(f"Could not read {name} metrics: {e}")
+            result[name] = {"error": str(e)}
+    return result
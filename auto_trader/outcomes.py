@@ -0,0 +1,160 @@
+import asyncio
+import heapq
+import logging
+import time
+from typing import NamedTuple
+
+from .timing import option_expiration
+
+logger = logging.getLogger(__name__)
+
+# Seconds after expiry the broker is given to report a result
+SETTLE_GRACE_SECONDS = 2.0
+# Trades still without a result this long after expiry are dropped
+GIVE_UP_SECONDS = 300.0
+# How soon lookups held back by a pending trade are tried again
+BUSY_RETRY_SECONDS = 1.0
+
+
+class OpenPosition(NamedTuple):
+    trade_id: object
+    signal: dict            # the parsed signal (asset, direction, expiry, source_id)
+    expires_at: float       # epoch seconds
+
+
+class ResultCollector:
+    """
+    Learns the result of every executed trade, feeds it to the P&L ledger
+    and writes it back to the trade journal (and so to the trade store).
+
+    Open positions sit in one heap ordered by when their result is due (the
+    option's expiration plus a short grace). Options expire on minute
+    boundaries, so the positions of a signal burst share a due time: a single
+    task sleeps until the earliest one, pops everything due and asks the
+    broker for all of their outcomes in one check_results() call on the
+    broker thread. A result that is not in yet is pushed back `retry`
+    seconds later. There is no thread or task per trade, so hundreds of open
+    positions cost one heap entry each.
+
+    Results fall due on minute boundaries, which is also when pre-armed buys
+    fire. The broker thread runs one call at a time, so while `busy()` returns
+    True (a buy is imminent) due positions are put back on the heap for
+    BUSY_RETRY_SECONDS rather than queueing a lookup ahead of the buy. The
+    GIVE_UP_SECONDS limit applies while deferring too.
+    """
+
+    def __init__(self, executor, broker, ledger, tracker=None, retry: float = 5.0, busy=None):
+        self.executor = executor
+        self.broker = broker
+        self.ledger = ledger
+        self.tracker = tracker
+        self.retry = retry
+        self.busy = busy or (lambda: False)
+        self.settled = 0
+        self.abandoned = 0
+        self.deferred = 0
+        self.lookups = 0
+        self.max_batch = 0
+        self._heap = []     # (due epoch, seq, OpenPosition)
+        self._seq = 0
+        self._wakeup = asyncio.Event()
+
+    def _push(self, due: float, position: OpenPosition):
+        self._seq += 1
+        heapq.heappush(self._heap, (due, self._seq, position))
+        if self._heap[0][2] is position:
+            # New earliest due time: make the collector re-plan its sleep
+            self._wakeup.set()
+
+    def track(self, trade_id, signal: dict, placed_at: float = None):
+        expires_at = option_expiration(placed_at or time.time(), signal["expiry"])
+        self._push(expires_at + SETTLE_GRACE_SECONDS, OpenPosition(trade_id, signal, expires_at))
+
+    @property
+    def open_positions(self) -> int:
+        return len(self._heap)
+
+    async def collect_due(self, now: float = None) -> int:
+        """Settles every position due by `now`; returns how many got a result."""
+        now = time.time() if now is None else now
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due.append(heapq.heappop(self._heap)[2])
+        if not due:
+            return 0
+        if self.busy():
+            self.deferred += 1
+            for position in due:
+                if not self._expired(position, now):
+                    self._push(now + BUSY_RETRY_SECONDS, position)
+            return 0
+
+        self.lookups += 1
+        self.max_batch = max(self.max_batch, len(due))
+        try:
+            results = await self.broker.run(
+                self.executor.check_results, [p.trade_id for p in due]
+            )
+        except Exception as e:
+            logger.error(f"Result lookup for {len(due)} trade(s) failed: {e}")
+            results = {}
+
+        settled = 0
+        for position in due:
+            result = results.get(position.trade_id)
+            if result is None:
+                if not self._expired(position, now):
+                    self._push(now + self.retry, position)
+                continue
+            self._settle(position, *result)
+            settled += 1
+        return settled
+
+    def _expired(self, position: OpenPosition, now: float) -> bool:
+        """Drops (and counts) a position still unsettled GIVE_UP_SECONDS after expiry."""
+        if now - position.expires_at <= GIVE_UP_SECONDS:
+            return False
+        logger.warning(f"No result for trade {position.trade_id}; no longer tracking it.")
+        self.abandoned += 1
+        return True
+
+    def _settle(self, position: OpenPosition, outcome: str, profit: float):
+        if not self.ledger.record(position.trade_id, outcome, profit):
+            return
+        self.settled += 1
+        if self.tracker is not None:
+            self.tracker.log_outcome(position.signal, position.trade_id, outcome, profit)
+        logger.info(
+            f"Trade {position.trade_id} ({position.signal.get('asset')}): {outcome} {profit:+.2f} "
+            f"(today {self.ledger.pnl:+.2f}, loss {self.ledger.loss:.2f})"
+        )
+
+    async def run(self) -> None:
+        heap = self._heap
+        while True:
+            if not heap:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            delay = heap[0][0] - time.time()
+            if delay > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self.collect_due()
+
+    def stats(self) -> dict:
+        return {
+            "open": len(self._heap),
+            "settled": self.settled,
+            "abandoned": self.abandoned,
+            "deferred": self.deferred,
+            "lookups": self.lookups,
+            "max_batch": self.max_batch,
+            **self.ledger.snapshot(),
+        }
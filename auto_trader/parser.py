@@ -3,18 +3,46 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Every field is an alternative of one compiled pattern, so a single finditer()
+# scan over the upper-cased text yields all tokens; m.lastindex (the last group
+# that matched) identifies which alternative fired. The leading (?<!\w) plays
+# the role of the per-pattern \b the old multi-search parser used.
+_TOKEN_RE = re.compile(
+    r"""
+    (?<!\w)(?:
+        (\d{1,2}):(\d\d)\b                    # 1, 2  execution time, 10:23
+      | (\d+)\s*(?:MINUTES|MINUTE|MIN|M)\b    # 3     expiry, 5 min / 5m
+      | M(\d+)\b                              # 4     expiry, M5
+      | (CALL|UP|BUY)\b                       # 5
+      | (PUT|DOWN|SELL)\b                     # 6
+      | ([A-Z]{3})/?([A-Z]{3})\b              # 7, 8  asset, EURUSD / EUR/USD
+    )
+    """,
+    re.VERBOSE,
+)
+_TIME, _EXPIRY, _M_EXPIRY, _CALL, _PUT, _ASSET = 2, 3, 4, 5, 6, 8
+
+# Contribution of each field to the confidence score
+_FIELD_WEIGHTS = {"asset": 0.35, "direction": 0.35, "expiry": 0.2, "execute_time": 0.1}
+# Multiplier applied when both CALL and PUT words appear. Several six-letter
+# tokens are not penalised: ordinary words such as EXPIRY match the pair shape.
+_AMBIGUITY_PENALTY = 0.6
+
+
 class SignalParser:
     """
     Parses Telegram messages to extract binary options trading signals.
     """
     def parse(self, text: str) -> dict:
         """
-        Extracts structured fields from raw message text.
+        Extracts structured fields from raw message text in a single scan.
         Returns a dict with:
         - asset (e.g., EURUSD)
         - direction (CALL / PUT)
         - expiry (int in minutes)
         - is_valid (bool)
+        - confidence (0.0 - 1.0, lower when fields are missing or ambiguous)
+        - spans ({field: (start, end)} offsets into raw_text)
         """
         result = {
             "asset": None,
@@ -22,47 +50,69 @@ class SignalParser:
             "expiry": None,
             "execute_time": None,   # HH:MM as parsed from the signal (provider's local time)
             "is_valid": False,
+            "confidence": 0.0,
+            "spans": {},
             "raw_text": text
         }
-        
+
         if not text:
             return result
-            
+
         text_upper = text.upper()
-            
-        # 1. Parse Asset (e.g., EURUSD, EUR/USD, OTC EURUSD)
-        # Look for 6 uppercase letters optionally separated by /
-        asset_match = re.search(r'\b([A-Z]{3})/?([A-Z]{3})\b', text_upper)
-        if asset_match:
-            result["asset"] = asset_match.group(1) + asset_match.group(2)
-            # Check for OTC keyword nearby in the text
-            if "OTC" in text_upper:
-                result["asset"] += "-OTC"
-                
-        # 2. Parse Direction (CALL/UP/BUY vs PUT/DOWN/SELL)
-        if re.search(r'\b(CALL|UP|BUY)\b', text_upper):
+        if len(text_upper) != len(text):
+            # Case mappings such as "ß" -> "SS" would shift every span; leave
+            # those characters as they are.
+            text_upper = "".join(c if len(c.upper()) != 1 else c.upper() for c in text)
+
+        spans = result["spans"]
+        call = put = m_expiry = None
+
+        for match in _TOKEN_RE.finditer(text_upper):
+            kind = match.lastindex
+            if kind == _ASSET:
+                if result["asset"] is None:
+                    result["asset"] = match[7] + match[8]
+                    spans["asset"] = match.span()
+            elif kind == _CALL:
+                call = call or match.span()
+            elif kind == _PUT:
+                put = put or match.span()
+            elif kind == _EXPIRY:
+                if result["expiry"] is None:
+                    result["expiry"] = int(match[3])
+                    spans["expiry"] = match.span()
+            elif kind == _TIME:
+                if result["execute_time"] is None:
+                    result["execute_time"] = f"{int(match[1]):02d}:{match[2]}"
+                    spans["execute_time"] = match.span()
+            elif kind == _M_EXPIRY:
+                m_expiry = m_expiry or match
+
+        # OTC keyword anywhere in the text marks the pair as OTC
+        if result["asset"] and "OTC" in text_upper:
+            result["asset"] += "-OTC"
+
+        # CALL/UP/BUY wins over PUT/DOWN/SELL when both appear
+        if call:
             result["direction"] = "CALL"
-        elif re.search(r'\b(PUT|DOWN|SELL)\b', text_upper):
+            spans["direction"] = call
+        elif put:
             result["direction"] = "PUT"
-            
-        # 3. Parse Expiry (e.g. 5 min, 5m, 15 minutes, M5)
-        expiry_match = re.search(r'\b(\d+)\s*(M|MIN|MINUTES|MINUTE)\b', text_upper)
-        if expiry_match:
-            result["expiry"] = int(expiry_match.group(1))
-        else:
-            # Maybe M5 format
-            m_match = re.search(r'\bM(\d+)\b', text_upper)
-            if m_match:
-                result["expiry"] = int(m_match.group(1))
-                
-        # 4. Parse Execution Time  (e.g. ⏰ 10:23 or just 10:23)
-        # Matches any HH:MM or H:MM pattern in the message.
-        time_match = re.search(r'\b(\d{1,2}):(\d{2})\b', text)
-        if time_match:
-            result["execute_time"] = f"{int(time_match.group(1)):02d}:{time_match.group(2)}"
+            spans["direction"] = put
 
-        # 5. Validation
+        # M5 format is only used when there is no "5 min" style expiry
+        if result["expiry"] is None and m_expiry:
+            result["expiry"] = int(m_expiry[4])
+            spans["expiry"] = m_expiry.span()
+
+        # Validation
         if result["asset"] and result["direction"] and result["expiry"]:
             result["is_valid"] = True
-            
+
+        # Confidence
+        confidence = sum(w for field, w in _FIELD_WEIGHTS.items() if result[field] is not None)
+        if call and put:
+            confidence *= _AMBIGUITY_PENALTY
+        result["confidence"] = round(confidence, 3)
+
         return result
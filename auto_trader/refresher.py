@@ -0,0 +1,124 @@
+import asyncio
+import logging
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# On-demand refreshes (after a KeyError or an unlisted asset) are not run
+# more often than this, however many misses come in
+MIN_REFRESH_INTERVAL = 60.0
+# How often a deferred refresh re-checks whether the trade path is idle
+BUSY_RETRY_SECONDS = 1.0
+# Until a first list has loaded (e.g. the startup login failed) it is retried
+# this often instead of every `interval`
+EMPTY_RETRY_SECONDS = 10.0
+
+
+class AssetRefresher:
+    """
+    Keeps the executor's AssetCatalog current in the background.
+
+    The first list is loaded by load(), queued on the broker thread right
+    behind the startup connect(). After that, every `interval` seconds, or
+    earlier when request() is called, the asset
+    list is fetched on the broker thread (the IQ_Option client is not
+    thread-safe) and the new catalog replaces the old one in a single
+    assignment, so a trade always sees either the old or the new snapshot.
+
+    The broker thread runs one call at a time, so a fetch that is in progress
+    would hold up a buy queued behind it. While `busy()` returns True (a buy
+    is due shortly, see AutoTraderEngine.buy_imminent) the refresh is deferred.
+    """
+
+    def __init__(self, executor, broker, interval: float, busy=None, samples: int = 100):
+        self.executor = executor
+        self.broker = broker
+        self.interval = interval
+        self.busy = busy or (lambda: False)
+        self.refreshes = 0
+        self.failures = 0
+        self.deferred = 0
+        self.last_refresh = None    # time.monotonic() of the last successful swap
+        self._durations = deque(maxlen=samples)
+        self._requested = asyncio.Event()
+        self._last_request = float("-inf")
+
+    def request(self, reason: str = "") -> bool:
+        """
+        Asks for an early refresh (rate-limited to MIN_REFRESH_INTERVAL).
+        Never blocks; returns True if the request was accepted.
+        """
+        now = time.monotonic()
+        if now - self._last_request < MIN_REFRESH_INTERVAL:
+            return False
+        self._last_request = now
+        logger.info(f"Asset list refresh requested{f' ({reason})' if reason else ''}.")
+        self._requested.set()
+        return True
+
+    def load(self) -> bool:
+        """
+        Fetches and swaps in a new catalog; runs on the broker thread. Does
+        nothing while disconnected: there is nothing to fetch from.
+        """
+        if not self.executor.is_connected:
+            return False
+        return self._fetch_and_swap()
+
+    def _fetch_and_swap(self) -> bool:
+        started = time.monotonic()
+        catalog = self.executor.fetch_asset_catalog()
+        duration = time.monotonic() - started
+        self._durations.append(duration)
+        if catalog is None:
+            self.failures += 1
+            return False
+        self.executor.catalog = catalog
+        self.refreshes += 1
+        self.last_refresh = time.monotonic()
+        logger.info(
+            f"Asset list refreshed in {duration * 1000:.0f}ms: {len(catalog)} assets "
+            f"({catalog.otc_count} OTC)."
+        )
+        return True
+
+    async def refresh(self) -> bool:
+        """Fetches and swaps in a new catalog now. Returns True on success."""
+        try:
+            return await self.broker.run(self.load)
+        except Exception as e:
+            self.failures += 1
+            logger.error(f"Asset list refresh failed: {e}")
+            return False
+
+    async def run(self) -> None:
+        logger.info(f"Refreshing the IQ Option asset list every {self.interval:.0f}s")
+        while True:
+            timeout = self.interval if len(self.executor.catalog) else EMPTY_RETRY_SECONDS
+            try:
+                await asyncio.wait_for(self._requested.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._requested.clear()
+
+            while self.busy():
+                self.deferred += 1
+                await asyncio.sleep(BUSY_RETRY_SECONDS)
+            await self.refresh()
+
+    def stats(self) -> dict:
+        durations = sorted(self._durations)
+        stats = {
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "deferred": self.deferred,
+            "assets": len(self.executor.catalog),
+        }
+        if self.last_refresh is not None:
+            stats["age_seconds"] = round(time.monotonic() - self.last_refresh, 1)
+        if durations:
+            stats["last_ms"] = round(self._durations[-1] * 1000, 1)
+            stats["avg_ms"] = round(sum(durations) / len(durations) * 1000, 1)
+            stats["max_ms"] = round(durations[-1] * 1000, 1)
+        return stats
@@ -0,0 +1,109 @@
+import asyncio
+import heapq
+import logging
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class TradeScheduler:
+    """
+    Fires pending trade executions at time.monotonic() deadlines.
+
+    All waits share one heap and one timer task instead of one asyncio.sleep()
+    per signal. The timer sleeps until shortly before the earliest deadline and
+    then yields to the loop in a tight asyncio.sleep(0) loop for the last
+    `spin` seconds, because the event loop's own timers are only accurate to
+    about a millisecond plus whatever the loop is busy with. Being monotonic,
+    deadlines are unaffected by wall-clock adjustments while a signal waits.
+
+    Lateness (fire time minus deadline) of every firing is recorded as jitter.
+    """
+
+    def __init__(self, spin: float = 0.002, samples: int = 1000):
+        self.spin = spin
+        self.fired = 0
+        self._heap = []
+        self._seq = 0
+        self._jitter = deque(maxlen=samples)
+        self._wakeup = None
+        self._task = None
+
+    def _ensure_timer(self):
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def schedule(self, delay: float) -> asyncio.Future:
+        """Returns a future resolved with the lateness in seconds once `delay` has elapsed."""
+        self._ensure_timer()
+        future = asyncio.get_running_loop().create_future()
+        deadline = time.monotonic() + max(delay, 0.0)
+        self._seq += 1
+        heapq.heappush(self._heap, (deadline, self._seq, future))
+        if self._heap[0][2] is future:
+            # New earliest deadline: make the timer re-plan its sleep
+            self._wakeup.set()
+        return future
+
+    async def sleep(self, delay: float) -> float:
+        """Drop-in for asyncio.sleep(delay); returns how late it woke up, in seconds."""
+        return await self.schedule(delay)
+
+    async def _run(self):
+        heap = self._heap
+        while True:
+            while heap and heap[0][2].done():
+                heapq.heappop(heap)  # cancelled waiters
+            if not heap:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            deadline = heap[0][0]
+            remaining = deadline - time.monotonic()
+            if remaining > self.spin:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), remaining - self.spin)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            while time.monotonic() < deadline:
+                await asyncio.sleep(0)
+
+            now = time.monotonic()
+            while heap and heap[0][0] <= now:
+                deadline, _, future = heapq.heappop(heap)
+                if future.done():
+                    continue
+                lateness = now - deadline
+                self._jitter.append(lateness)
+                self.fired += 1
+                future.set_result(lateness)
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for _, _, future in self._heap:
+            future.cancel()
+        self._heap.clear()
+
+    def stats(self) -> dict:
+        jitter = sorted(self._jitter)
+        if not jitter:
+            return {"pending": len(self._heap), "fired": self.fired}
+        return {
+            "pending": len(self._heap),
+            "fired": self.fired,
+            "jitter_avg_ms": round(sum(jitter) / len(jitter) * 1000, 3),
+            "jitter_p99_ms": round(jitter[min(len(jitter) - 1, int(len(jitter) * 0.99))] * 1000, 3),
+            "jitter_max_ms": round(jitter[-1] * 1000, 3),
+        }
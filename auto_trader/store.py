@@ -0,0 +1,304 @@
+"""
+SQLite trade store.
+
+Every row written to the trade journal is also inserted here (one
+transaction per journal batch) so questions like "P&L per asset per provider
+today" are an indexed query instead of a scan of trades.csv. The database
+runs in WAL mode: the journal thread writes while the engine, the validator
+and the API read without blocking each other. Each thread uses its own
+connection.
+
+Usage:
+    python -m auto_trader.store import trades.csv trades.2026-04-09.csv
+    python -m auto_trader.store summary --day 2026-04-09
+"""
+
+import argparse
+import csv
+import logging
+import os
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+
+from .ledger import OUTCOMES
+
+logger = logging.getLogger(__name__)
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS trades (
+    id            INTEGER PRIMARY KEY,
+    timestamp     TEXT NOT NULL,
+    asset         TEXT,
+    direction     TEXT,
+    expiry        INTEGER,
+    status        TEXT NOT NULL,
+    trade_id      TEXT,
+    error_message TEXT,
+    raw_signal    TEXT,
+    source_id     INTEGER,
+    outcome       TEXT,
+    profit        REAL
+);
+CREATE INDEX IF NOT EXISTS trades_timestamp ON trades (timestamp);
+CREATE INDEX IF NOT EXISTS trades_asset ON trades (asset, timestamp);
+CREATE INDEX IF NOT EXISTS trades_status ON trades (status, timestamp);
+CREATE INDEX IF NOT EXISTS trades_source ON trades (source_id, timestamp);
+CREATE INDEX IF NOT EXISTS trades_trade_id ON trades (trade_id) WHERE trade_id IS NOT NULL;
+CREATE TABLE IF NOT EXISTS imported_files (
+    path  TEXT PRIMARY KEY,
+    size  INTEGER,
+    rows  INTEGER,  -- data rows of the file read so far (resume point)
+    at    TEXT
+);
+"""
+
+_COLUMNS = (
+    "timestamp", "asset", "direction", "expiry", "status", "trade_id",
+    "error_message", "raw_signal", "source_id", "outcome", "profit",
+)
+_INSERT = (
+    f"INSERT INTO trades ({', '.join(_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in _COLUMNS)})"
+)
+
+# Columns summary() may group by
+GROUPABLE = ("asset", "source_id", "direction", "expiry", "status")
+
+
+def _day_range(day) -> tuple:
+    """[start, end) timestamp strings for one local calendar day."""
+    if day is None:
+        day = date.today()
+    elif isinstance(day, str):
+        day = date.fromisoformat(day)
+    start = datetime(day.year, day.month, day.day)
+    return start.strftime(TIMESTAMP_FORMAT), (start + timedelta(days=1)).strftime(TIMESTAMP_FORMAT)
+
+
+def _blank_to_none(value):
+    return None if value in ("", None) else value
+
+
+def _values(row: dict) -> tuple:
+    return tuple(_blank_to_none(row.get(column)) for column in _COLUMNS)
+
+
+# Same insert, skipped when an identical row is already stored (the trades.csv
+# columns only: source_id is not in the CSV). Used by import_csv, since the
+# journal has usually mirrored the live file's rows into the store already.
+_INSERT_NEW = (
+    f"INSERT INTO trades ({', '.join(_COLUMNS)}) "
+    f"SELECT {', '.join('?' for _ in _COLUMNS)} WHERE NOT EXISTS ("
+    "SELECT 1 FROM trades WHERE timestamp = ? AND status = ? AND asset IS ? "
+    "AND direction IS ? AND trade_id IS ? AND raw_signal IS ?)"
+)
+_KEY_COLUMNS = ("timestamp", "status", "asset", "direction", "trade_id", "raw_signal")
+
+_UPDATE_OUTCOME = "UPDATE trades SET outcome = ?, profit = ? WHERE trade_id = ?"
+
+
+def _apply(conn: sqlite3.Connection, rows, skip_known: bool = False) -> int:
+    """
+    Inserts journal rows. Result rows (status WIN/LOSS/DRAW, written when a
+    trade settles) update their trade's row instead of adding one. With
+    `skip_known`, rows already in the store are not inserted again.
+    """
+    inserts, updates = [], []
+    for row in rows:
+        if row.get("status") in OUTCOMES:
+            profit = row.get("profit")
+            updates.append((
+                row["status"],
+                float(profit) if profit not in ("", None) else None,
+                str(row.get("trade_id")),
+            ))
+        elif skip_known:
+            key = tuple(
+                None if _blank_to_none(row.get(c)) is None else str(row[c]) for c in _KEY_COLUMNS
+            )
+            inserts.append(_values(row) + key)
+        else:
+            inserts.append(_values(row))
+    inserted = conn.executemany(_INSERT_NEW if skip_known else _INSERT, inserts).rowcount
+    conn.executemany(_UPDATE_OUTCOME, updates)
+    return max(inserted, 0)
+
+
+class TradeStore:
+    def __init__(self, path: str = "trades.db"):
+        self.path = path
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            # WAL + NORMAL: commits survive an application crash; only a power
+            # loss can drop the last few (orders are fsynced in trades.csv)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with self._schema_lock:
+                if not self._schema_ready:
+                    conn.executescript(_SCHEMA)
+                    self._schema_ready = True
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        """Closes the calling thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # -- writes --------------------------------------------------------------
+
+    def insert_many(self, rows) -> int:
+        """
+        Applies journal rows (dicts keyed like trades.csv plus source_id) in
+        one transaction; returns the number of trades inserted.
+        """
+        conn = self._conn()
+        with conn:
+            return _apply(conn, rows)
+
+    def update_outcome(self, trade_id, outcome: str, profit: float) -> bool:
+        """Records a settled trade's result (WIN/LOSS/DRAW) and profit. False if unknown."""
+        conn = self._conn()
+        with conn:
+            cursor = conn.execute(_UPDATE_OUTCOME, (outcome, profit, str(trade_id)))
+        return cursor.rowcount > 0
+
+    def import_csv(self, path: str, force: bool = False) -> int:
+        """
+        Loads a trades.csv-format file; returns the number of rows inserted.
+
+        trades.csv is append-only, so a file imported before is resumed after
+        the rows already read (a file that shrank was replaced and is read
+        from the start; `force` always starts over). Rows the store already
+        holds, e.g. mirrored by the trade journal, are never inserted twice.
+        """
+        key = os.path.abspath(path)
+        size = os.path.getsize(path)
+        conn = self._conn()
+        start = 0
+        seen = conn.execute(
+            "SELECT size, rows FROM imported_files WHERE path = ?", (key,)
+        ).fetchone()
+        if seen is not None and not force:
+            if seen["size"] == size:
+                logger.info(f"{path} already imported, skipping.")
+                return 0
+            if seen["size"] < size:
+                start = seen["rows"] or 0
+
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        with conn:
+            inserted = _apply(
+                conn, [row for row in rows[start:] if row.get("timestamp")], skip_known=True
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO imported_files (path, size, rows, at) VALUES (?, ?, ?, ?)",
+                (key, size, len(rows), datetime.now().strftime(TIMESTAMP_FORMAT)),
+            )
+        logger.info(f"Imported {inserted} trade(s) from {path}.")
+        return inserted
+
+    # -- queries -------------------------------------------------------------
+
+    def summary(self, day=None, group_by=("asset", "source_id")) -> list:
+        """
+        Executed trades for one day (default today) aggregated per group:
+        [{asset, source_id, trades, wins, losses, draws, open, profit}, ...],
+        most profitable first.
+        """
+        for column in group_by:
+            if column not in GROUPABLE:
+                raise ValueError(f"Cannot group trades by '{column}'")
+        start, end = _day_range(day)
+        groups = ", ".join(group_by)
+        select = f"{groups}, " if group_by else ""
+        group = f"GROUP BY {groups} " if group_by else ""
+        rows = self._conn().execute(
+            f"SELECT {select}"
+            "COUNT(*) AS trades, "
+            "COUNT(CASE WHEN outcome = 'WIN' THEN 1 END) AS wins, "
+            "COUNT(CASE WHEN outcome = 'LOSS' THEN 1 END) AS losses, "
+            "COUNT(CASE WHEN outcome = 'DRAW' THEN 1 END) AS draws, "
+            "COUNT(*) - COUNT(outcome) AS open, "
+            "ROUND(COALESCE(SUM(profit), 0), 2) AS profit "
+            "FROM trades WHERE status = 'EXECUTED' AND timestamp >= ? AND timestamp < ? "
+            f"{group}ORDER BY profit DESC",
+            (start, end),
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def status_counts(self, day=None) -> dict:
+        start, end = _day_range(day)
+        rows = self._conn().execute(
+            "SELECT status, COUNT(*) AS n FROM trades "
+            "WHERE timestamp >= ? AND timestamp < ? GROUP BY status",
+            (start, end),
+        ).fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+    def daily_loss(self, day=None) -> float:
+        """Sum of the losses (as a positive number) of the day's settled trades."""
+        start, end = _day_range(day)
+        (loss,) = self._conn().execute(
+            "SELECT COALESCE(-SUM(profit), 0) FROM trades "
+            "WHERE status = 'EXECUTED' AND profit < 0 AND timestamp >= ? AND timestamp < ?",
+            (start, end),
+        ).fetchone()
+        return float(loss)
+
+    def recent_executed(self, since: float) -> list:
+        """
+        Executed trades since `since` (epoch seconds), oldest first, as
+        {received_at (epoch seconds), raw_signal, source_id} dicts.
+        """
+        rows = self._conn().execute(
+            "SELECT timestamp, raw_signal, source_id FROM trades "
+            "WHERE status = 'EXECUTED' AND timestamp >= ? ORDER BY timestamp",
+            (datetime.fromtimestamp(since).strftime(TIMESTAMP_FORMAT),),
+        ).fetchall()
+        return [
+            {
+                "received_at": datetime.strptime(row["timestamp"], TIMESTAMP_FORMAT).timestamp(),
+                "raw_signal": row["raw_signal"] or "",
+                "source_id": row["source_id"],
+            }
+            for row in rows
+        ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Trade store maintenance and queries.")
+    parser.add_argument("--db", default=os.getenv("TRADE_STORE_PATH", "trades.db"))
+    commands = parser.add_subparsers(dest="command", required=True)
+    load = commands.add_parser("import", help="import trades.csv-format files")
+    load.add_argument("paths", nargs="+")
+    load.add_argument("--force", action="store_true", help="re-import files seen before")
+    report = commands.add_parser("summary", help="P&L per asset and provider for a day")
+    report.add_argument("--day", help="YYYY-MM-DD, default today")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    store = TradeStore(args.db)
+    if args.command == "import":
+        total = sum(store.import_csv(path, force=args.force) for path in args.paths)
+        print(f"{total} trade(s) imported into {args.db}")
+    else:
+        for row in store.summary(args.day):
+            print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import asyncio
+import logging
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# Failed reconnects back off exponentially (interval * 2^n) up to this
+MAX_BACKOFF_SECONDS = 300.0
+
+
+class ConnectionSupervisor:
+    """
+    Heartbeats the IQ Option session in the background and reconnects as soon
+    as it drops, so a dead websocket is found and replaced between signals
+    rather than by the next trade's _ensure_connected().
+
+    Each heartbeat is one check_connect() queued on the broker thread; on a
+    drop it runs a full connect() there. There is deliberately no second
+    "standby" session: iqoptionapi keeps its websocket state (connection flag,
+    SSID, balance id) in module-level globals, so two sessions in one process
+    share and overwrite each other's state.
+
+    A failed reconnect is retried with exponential backoff capped at
+    MAX_BACKOFF_SECONDS, so a broker outage does not turn into a login every
+    heartbeat. A login the broker rejects (or missing credentials) is not
+    retried at all: repeated bad logins can get the account locked.
+    """
+
+    def __init__(self, executor, broker, interval: float, samples: int = 100):
+        self.executor = executor
+        self.broker = broker
+        self.interval = interval
+        self.heartbeats = 0
+        self.drops = 0
+        self.reconnects = 0
+        self.reconnect_failures = 0
+        self.consecutive_failures = 0
+        self.gave_up = False
+        self._retry_at = 0.0    # time.monotonic() before which no reconnect is tried
+        self._durations = deque(maxlen=samples)
+
+    def check(self) -> bool:
+        """
+        One supervision round; runs on the broker thread. Returns True if the
+        session is alive afterwards.
+        """
+        self.heartbeats += 1
+        if self.executor.is_alive():
+            # Also covers a reconnect made by the trade path
+            self.consecutive_failures = 0
+            return True
+        if self.consecutive_failures == 0:
+            self.drops += 1
+        if self.gave_up or time.monotonic() < self._retry_at:
+            return False
+        return self._recover()
+
+    def _recover(self) -> bool:
+        executor = self.executor
+        started = time.monotonic()
+        executor.is_connected = False
+        logger.warning("IQ Option session dropped. Reconnecting in the background...")
+        ok = executor.connect()
+        duration = time.monotonic() - started
+        self._durations.append(duration)
+
+        if ok:
+            self.reconnects += 1
+            self.consecutive_failures = 0
+            logger.info(f"IQ Option session restored in {duration * 1000:.0f}ms.")
+            return True
+
+        self.reconnect_failures += 1
+        self.consecutive_failures += 1
+        if executor.auth_error:
+            self.gave_up = True
+            logger.error(
+                f"IQ Option {executor.auth_error}; background reconnects stopped until restart."
+            )
+        else:
+            delay = min(self.interval * 2 ** self.consecutive_failures, MAX_BACKOFF_SECONDS)
+            self._retry_at = time.monotonic() + delay
+            logger.warning(
+                f"IQ Option reconnect failed ({self.consecutive_failures} in a row); "
+                f"next attempt in {delay:.0f}s."
+            )
+        return False
+
+    async def run(self) -> None:
+        logger.info(f"Heartbeating the IQ Option session every {self.interval:.0f}s")
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.broker.run(self.check)
+            except Exception as e:
+                logger.error(f"Broker heartbeat failed: {e}")
+
+    def stats(self) -> dict:
+        durations = sorted(self._durations)
+        stats = {
+            "heartbeats": self.heartbeats,
+            "drops": self.drops,
+            "reconnects": self.reconnects,
+            "reconnect_failures": self.reconnect_failures,
+            "consecutive_failures": self.consecutive_failures,
+            "gave_up": self.gave_up,
+        }
+        if durations:
+            stats["reconnect_last_ms"] = round(self._durations[-1] * 1000, 1)
+            stats["reconnect_avg_ms"] = round(sum(durations) / len(durations) * 1000, 1)
+            stats["reconnect_max_ms"] = round(durations[-1] * 1000, 1)
+        return stats
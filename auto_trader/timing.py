@@ -0,0 +1,46 @@
+from datetime import datetime
+
+
+def seconds_until_signal_minute(signal_minute: int, now: datetime = None) -> float:
+    """
+    Calculate how many seconds until the local clock reaches `signal_minute`.
+
+    The minute number is timezone-agnostic: `:23` is `:23` everywhere, so we
+    simply compare it to the current local minute without any UTC conversion.
+    Minutes are compared across the hour boundary (a :00 signal received at
+    12:59 is 1 minute ahead, not 59 behind), and the wait includes the
+    sub-second part of `now` so it ends exactly on the minute.
+    `now` defaults to the wall clock; the backtester passes simulated time.
+
+    Returns:
+        positive float  → seconds to wait (we're before the target minute)
+        0.0             → already inside the target minute, execute now
+        negative float  → target minute has already passed, caller should skip
+    """
+    now = now or datetime.now()
+    seconds_into_minute = now.second + now.microsecond / 1_000_000
+
+    # Signed distance in minutes, taken the short way round the hour so that
+    # :00 seen at 12:59 is one minute ahead and :59 seen at 13:00 is one behind
+    delta = (signal_minute - now.minute + 30) % 60 - 30
+
+    if delta == 0:
+        # Already inside the target minute — execute immediately
+        return 0.0
+
+    # Seconds until the target minute starts; negative once it has passed
+    return delta * 60 - seconds_into_minute
+
+
+def option_expiration(placed_at: float, expiry_minutes: int) -> float:
+    """
+    Epoch second at which a turbo option bought at `placed_at` expires.
+
+    IQ Option expires turbo options on minute boundaries: the first one that
+    is at least 30 seconds away, plus the remaining minutes of the expiry
+    (as iqoptionapi's get_expiration_time() computes it). Trades placed
+    around the same signal minute therefore share one expiration time.
+    """
+    minute = int(placed_at // 60) * 60
+    first = minute + 60 if minute + 60 - placed_at >= 30 else minute + 120
+    return float(first + (max(expiry_minutes, 1) - 1) * 60)
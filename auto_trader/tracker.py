@@ -1,43 +1,52 @@
-import os
-import csv
 import logging
 from datetime import datetime
+from .journal import TradeJournal, DURABLE_STATUSES
 
 logger = logging.getLogger(__name__)
 
 class ResultTracker:
-    def __init__(self, filename="trades.csv"):
+    def __init__(self, filename="trades.csv", store=None):
         self.filename = filename
-        self._ensure_file_exists()
-        
-    def _ensure_file_exists(self):
-        if not os.path.exists(self.filename):
-            try:
-                with open(self.filename, mode='w', newline='') as f:
-                    writer = csv.writer(f)
-                    writer.writerow([
-                        "timestamp", "asset", "direction", "expiry", 
-                        "status", "trade_id", "error_message", "raw_signal"
-                    ])
-            except Exception as e:
-                logger.error(f"Failed to create tracker CSV: {e}")
-                
+        # Optional TradeStore (SQLite) for indexed queries over the same rows
+        self.store = store
+        # Rows are written in batches by the journal's thread, not on the event loop
+        self.journal = TradeJournal(filename, store=store)
+
     def log_trade(self, parsed_signal: dict, execution_result: dict, status: str):
         """
         status: e.g. 'EXECUTED', 'VALIDATION_FAILED', 'EXECUTION_FAILED', 'INVALID_FORMAT'
         """
         try:
-            with open(self.filename, mode='a', newline='') as f:
-                writer = csv.writer(f)
-                writer.writerow([
-                    datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    parsed_signal.get("asset", ""),
-                    parsed_signal.get("direction", ""),
-                    parsed_signal.get("expiry", ""),
-                    status,
-                    execution_result.get("trade_id", ""),
-                    execution_result.get("error", ""),
-                    parsed_signal.get("raw_text", "").replace("\n", " ").strip()
-                ])
+            self.journal.append({
+                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "asset": parsed_signal.get("asset", ""),
+                "direction": parsed_signal.get("direction", ""),
+                "expiry": parsed_signal.get("expiry", ""),
+                "status": status,
+                "trade_id": execution_result.get("trade_id", ""),
+                "error_message": execution_result.get("error", ""),
+                "raw_signal": parsed_signal.get("raw_text", "").replace("\n", " ").strip(),
+                "source_id": parsed_signal.get("source_id"),
+            }, durable=status in DURABLE_STATUSES)
         except Exception as e:
             logger.error(f"Failed to log trade to CSV: {e}")
+
+    def log_outcome(self, parsed_signal: dict, trade_id, outcome: str, profit: float):
+        """Journals a settled trade: status WIN/LOSS/DRAW and the profit net of the stake."""
+        try:
+            self.journal.append({
+                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "asset": parsed_signal.get("asset", ""),
+                "direction": parsed_signal.get("direction", ""),
+                "expiry": parsed_signal.get("expiry", ""),
+                "status": outcome,
+                "trade_id": trade_id,
+                "profit": round(profit, 2),
+                "source_id": parsed_signal.get("source_id"),
+            }, durable=True)
+        except Exception as e:
+            logger.error(f"Failed to log trade outcome to CSV: {e}")
+
+    def close(self):
+        """Writes out every queued row (also done at interpreter exit)."""
+        self.journal.close()
@@ -1,31 +1,60 @@
 import logging
 import time
-from config import MAX_DAILY_LOSS
+from config import MAX_DAILY_LOSS, DUPLICATE_COOLDOWNS
+from .ledger import PnLLedger
+from .dedupe import DedupeIndex, signal_key
 
 logger = logging.getLogger(__name__)
 
 class SignalValidator:
-    def __init__(self):
-        # Keeps track of recently traded assets to avoid duplicates
-        # Format: { asset: timestamp }
-        self.recent_trades = {}
-        self.duplicate_cooldown_seconds = 300 # 5 minutes
-        self.current_daily_loss = 0.0
+    def __init__(self, ledger: PnLLedger = None):
+        # Keeps track of recently traded signals to avoid duplicates, keyed by
+        # (asset, direction, execute_time, content hash); entries expire on
+        # their own once past the longest cooldown
+        self.recent_trades = DedupeIndex(self.max_cooldown)
+        self.duplicate_cooldown_seconds = 300 # 5 minutes, for sources without their own
+        # { source_id: seconds } from DUPLICATE_COOLDOWNS
+        self.source_cooldowns = dict(DUPLICATE_COOLDOWNS)
+        # Today's settled results, fed by the result collector; resets at midnight
+        self.ledger = ledger if ledger is not None else PnLLedger()
+
+    @property
+    def current_daily_loss(self) -> float:
+        return self.ledger.daily_loss
+
+    @current_daily_loss.setter
+    def current_daily_loss(self, value: float):
+        self.ledger.daily_loss = value
         
-    def validate(self, parsed_signal: dict) -> bool:
+    def cooldown_for(self, source_id) -> float:
+        return self.source_cooldowns.get(source_id, self.duplicate_cooldown_seconds)
+
+    def max_cooldown(self) -> float:
+        return max([self.duplicate_cooldown_seconds, *self.source_cooldowns.values()])
+
+    def remember(self, parsed_signal: dict, at: float):
+        """Marks a signal as traded at `at` (used to restore state after a restart)."""
+        self.recent_trades.add(signal_key(parsed_signal), at)
+
+    def validate(self, parsed_signal: dict, now: float = None) -> bool:
+        """
+        `now` (epoch seconds) defaults to the wall clock; replays pass the
+        simulated time so cooldowns follow the signal history.
+        """
         if not parsed_signal.get("is_valid"):
             logger.warning("Signal invalid or incomplete.")
             return False
             
         asset = parsed_signal["asset"]
         
-        # 1. Check duplicate signals
-        now = time.time()
-        if asset in self.recent_trades:
-            last_time = self.recent_trades[asset]
-            if now - last_time < self.duplicate_cooldown_seconds:
-                logger.warning(f"Duplicate signal for {asset} within {self.duplicate_cooldown_seconds}s. Skipping.")
-                return False
+        # 1. Check duplicate signals (the cooldown is the sending source's)
+        if now is None:
+            now = time.time()
+        key = signal_key(parsed_signal)
+        cooldown = self.cooldown_for(parsed_signal.get("source_id"))
+        if self.recent_trades.seen_within(key, cooldown, now):
+            logger.warning(f"Duplicate signal for {asset} within {cooldown}s. Skipping.")
+            return False
                 
         # 2. Check daily loss limit
         if self.current_daily_loss >= MAX_DAILY_LOSS:
@@ -36,5 +65,5 @@ class SignalValidator:
         # Add checks for weekends or specific non-trading hours if needed
         
         # Validated!
-        self.recent_trades[asset] = now
+        self.recent_trades.add(key, now)
         return True
@@ -0,0 +1,94 @@
+"""
+Fan-out latency benchmark for SignalForwarder.forward_message
+
+Uses a stub Telegram client (no network) to measure how long it takes for one
+message to reach its LAST target, comparing sequential copying against the
+concurrent fan-out mode.
+
+Usage:
+    python benchmarks/bench_fanout.py --targets 4 --rtt 0.15 --delay 2
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# config.py refuses to import without credentials; the stub never connects.
+os.environ.setdefault("API_ID", "1")
+os.environ.setdefault("API_HASH", "benchmark")
+os.environ.setdefault("PHONE_NUMBER", "+10000000000")
+os.environ.setdefault("ENABLE_AUTO_TRADING", "false")
+
+import bot  # noqa: E402
+from forwarding.routing_config import RoutingConfig  # noqa: E402
+from telethon.tl.types import InputPeerChannel  # noqa: E402
+
+SOURCE_ID = -1000000000001
+
+
+class StubClient:
+    """Minimal stand-in for TelegramClient that simulates request latency."""
+
+    def __init__(self, rtt: float):
+        self.rtt = rtt
+        self.delivered = {}  # target_id -> perf_counter() of delivery
+
+    async def get_entity(self, entity_id):
+        return InputPeerChannel(channel_id=-entity_id - 1000000000000, access_hash=0)
+
+    async def send_message(self, entity, **kwargs):
+        await asyncio.sleep(self.rtt)
+        self.delivered[entity.channel_id] = time.perf_counter()
+
+
+def make_message():
+    return SimpleNamespace(
+        id=1,
+        peer_id=SimpleNamespace(channel_id=-SOURCE_ID - 1000000000000),
+        reply_to=None,
+        text="EURUSD-OTC ⏰ 10:23 ⌛️ 1 Minute 🔼 CALL",
+        message="EURUSD-OTC ⏰ 10:23 ⌛️ 1 Minute 🔼 CALL",
+        media=None,
+        entities=None,
+    )
+
+
+async def run_once(targets: int, rtt: float, concurrent: bool) -> float:
+    bot.CONCURRENT_FANOUT = concurrent
+    mappings = [
+        {"source_id": SOURCE_ID, "target_id": -1000000001000 - i} for i in range(targets)
+    ]
+    client = StubClient(rtt)
+    forwarder = bot.SignalForwarder(client, RoutingConfig(mappings, [], frozenset()))
+    await forwarder.entities.preload(m["target_id"] for m in mappings)
+
+    start = time.perf_counter()
+    await forwarder.forward_message(make_message())
+    return max(client.delivered.values()) - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--targets", type=int, default=4)
+    parser.add_argument("--rtt", type=float, default=0.15, help="simulated send latency (s)")
+    parser.add_argument("--delay", type=float, default=bot.FORWARD_DELAY)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    bot.FORWARD_DELAY = args.delay
+    bot.RATE_LIMIT_PER_CHAT = 1 / args.delay
+
+    print(f"targets={args.targets} rtt={args.rtt}s FORWARD_DELAY={args.delay}s")
+    for label, concurrent in (("sequential", False), ("fan-out", True)):
+        latency = asyncio.run(run_once(args.targets, args.rtt, concurrent))
+        print(f"  {label:<10} last target reached after {latency * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Signal parser throughput benchmark
+
+Runs the previous multi-pass parser (text.upper() plus one re.search per
+field) and the single-pass tokenizer in auto_trader.parser over the
+raw_signal column of trades.csv and a synthetic corpus, reports how often
+they agree on the extracted fields and the messages/second of each.
+
+Usage:
+    python benchmarks/bench_parser.py --csv trades.csv --synthetic 50000
+"""
+
+import argparse
+import csv
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from auto_trader.parser import SignalParser  # noqa: E402
+
+FIELDS = ("asset", "direction", "expiry", "execute_time", "is_valid")
+
+
+def legacy_parse(text):
+    """The previous SignalParser.parse, kept here as the baseline."""
+    result = {"asset": None, "direction": None, "expiry": None,
+              "execute_time": None, "is_valid": False, "raw_text": text}
+    if not text:
+        return result
+    text_upper = text.upper()
+    asset_match = re.search(r'\b([A-Z]{3})/?([A-Z]{3})\b', text_upper)
+    if asset_match:
+        result["asset"] = asset_match.group(1) + asset_match.group(2)
+        if "OTC" in text_upper:
+            result["asset"] += "-OTC"
+    if re.search(r'\b(CALL|UP|BUY)\b', text_upper):
+        result["direction"] = "CALL"
+    elif re.search(r'\b(PUT|DOWN|SELL)\b', text_upper):
+        result["direction"] = "PUT"
+    expiry_match = re.search(r'\b(\d+)\s*(M|MIN|MINUTES|MINUTE)\b', text_upper)
+    if expiry_match:
+        result["expiry"] = int(expiry_match.group(1))
+    else:
+        m_match = re.search(r'\bM(\d+)\b', text_upper)
+        if m_match:
+            result["expiry"] = int(m_match.group(1))
+    time_match = re.search(r'\b(\d{1,2}):(\d{2})\b', text)
+    if time_match:
+        result["execute_time"] = f"{int(time_match.group(1)):02d}:{time_match.group(2)}"
+    if result["asset"] and result["direction"] and result["expiry"]:
+        result["is_valid"] = True
+    return result
+
+
+def csv_signals(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, newline="", encoding="utf-8") as f:
+        return [row["raw_signal"] for row in csv.DictReader(f) if row.get("raw_signal")]
+
+
+def synthetic_signals(count, rng):
+    pairs = ["EURUSD", "GBPJPY", "EUR/JPY", "USDMXN", "AUDCAD", "eurgbp"]
+    templates = [
+        "📊 {pair}{otc} ⏰ {hh}:{mm} ⌛️ {n} Minute {arrow} {dir} 🟢",
+        "Asset: {pair}\nDirection: {dir}\nExpiry: M{n}",
+        "{pair} - {n}m - {dir}",
+        "{otc_word}{pair} {dir} {n} min at {hh}:{mm}",
+        "Good morning traders, next session starts at {hh}:{mm}. Stay tuned!",
+        "Result: WIN ✅✅ {pair}",
+        # Longer channel chatter: every field search runs to the end of it
+        ("Good morning traders! 🌞 Yesterday we closed 7 of 9 signals in profit, great "
+         "discipline everyone. Remember to manage your risk and never stake more than two "
+         "percent of the balance on a single trade. Next session starts at {hh}:{mm}, "
+         "stay tuned and keep notifications on for the channel."),
+    ]
+    signals = []
+    for _ in range(count):
+        otc = rng.random() < 0.5
+        direction = rng.choice(["CALL BUY", "PUT SELL", "UP", "down", "CALL", "PUT"])
+        signals.append(rng.choice(templates).format(
+            pair=rng.choice(pairs),
+            otc="-OTC" if otc else "",
+            otc_word="OTC " if otc else "",
+            hh=rng.randrange(24), mm=f"{rng.randrange(60):02d}",
+            n=rng.choice([1, 2, 5, 15]),
+            arrow="🔼" if "CALL" in direction or "UP" in direction else "🔽",
+            dir=direction,
+        ))
+    return signals
+
+
+def bench(label, parse, corpus, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in corpus:
+            parse(text)
+    elapsed = time.perf_counter() - start
+    rate = len(corpus) * rounds / elapsed
+    print(f"  {label:<12} {rate:12,.0f} msgs/s")
+    return rate
+
+
+def run(name, corpus, parse, rounds):
+    if not corpus:
+        print(f"{name}: empty corpus, skipped")
+        return
+    agree = sum(
+        all(legacy_parse(t)[f] == parse(t)[f] for f in FIELDS) for t in corpus
+    )
+    print(f"{name}: {len(corpus)} messages, field agreement {agree}/{len(corpus)}")
+    old = bench("multi-pass", legacy_parse, corpus, rounds)
+    new = bench("single-pass", parse, corpus, rounds)
+    print(f"  speedup      {new / old:12.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--csv", default="trades.csv")
+    parser.add_argument("--synthetic", type=int, default=50000)
+    parser.add_argument("--rounds", type=int, default=200,
+                        help="passes over the (small) trades.csv corpus")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    parse = SignalParser().parse
+    run("trades.csv", csv_signals(args.csv), parse, args.rounds)
+    run("synthetic", synthetic_signals(args.synthetic, random.Random(args.seed)), parse, 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Routing lookup micro-benchmark
+
+Compares the old string-keyed mapping index (f"{source_id}#{topic_id}" keys
+rebuilt for every message) against the compiled forwarding.router.Router over
+a synthetic set of mappings.
+
+Usage:
+    python benchmarks/bench_router.py --mappings 10000 --lookups 200000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from forwarding.router import Router  # noqa: E402
+
+
+class LegacyIndex:
+    """The previous SignalForwarder lookup, kept here as the baseline."""
+
+    def __init__(self, mappings):
+        self.source_to_targets = {}
+        for mapping in mappings:
+            source_id = mapping["source_id"]
+            source_topic_id = mapping.get("source_topic_id")
+            key = f"{source_id}#{source_topic_id}" if source_topic_id else str(source_id)
+            self.source_to_targets.setdefault(key, []).append(
+                {
+                    "target_id": mapping["target_id"],
+                    "target_topic_id": mapping.get("target_topic_id"),
+                }
+            )
+
+    def get_targets_for_message(self, message):
+        source_id = (
+            message.peer_id.channel_id if hasattr(message.peer_id, "channel_id") else None
+        )
+        if not source_id:
+            return []
+        source_id = -1000000000000 - source_id if source_id > 0 else source_id
+
+        source_topic_id = None
+        if message.reply_to:
+            reply = message.reply_to
+            if getattr(reply, "reply_to_top_id", None):
+                source_topic_id = reply.reply_to_top_id
+            elif getattr(reply, "reply_to_msg_id", None):
+                source_topic_id = reply.reply_to_msg_id
+        else:
+            candidate_key = f"{source_id}#{message.id}"
+            if candidate_key in self.source_to_targets:
+                return self.source_to_targets[candidate_key]
+
+        if source_topic_id:
+            key = f"{source_id}#{source_topic_id}"
+            if key in self.source_to_targets:
+                return self.source_to_targets[key]
+
+        return self.source_to_targets.get(str(source_id), [])
+
+
+def synthetic_mappings(count, rng):
+    mappings = []
+    for n in range(count):
+        source_id = -1003000000000 - n // 10  # 10 mappings per source chat
+        mapping = {"source_id": source_id, "target_id": -1004000000000 - rng.randrange(500)}
+        if n % 2:
+            mapping["source_topic_id"] = n % 10 + 1
+            mapping["target_topic_id"] = rng.randrange(1, 300)
+        mappings.append(mapping)
+    return mappings
+
+
+def synthetic_messages(mappings, count, rng):
+    messages = []
+    for _ in range(count):
+        mapping = rng.choice(mappings)
+        channel_id = -mapping["source_id"] - 1000000000000
+        kind = rng.randrange(4)
+        if kind == 0:  # topic root / plain channel post
+            reply_to = None
+        elif kind == 1:  # direct reply to topic root
+            reply_to = SimpleNamespace(reply_to_msg_id=rng.randrange(1, 12), reply_to_top_id=None)
+        elif kind == 2:  # nested reply in topic
+            reply_to = SimpleNamespace(reply_to_msg_id=5000, reply_to_top_id=rng.randrange(1, 12))
+        else:  # unmapped chat
+            channel_id += 10**7
+            reply_to = None
+        messages.append(
+            SimpleNamespace(
+                id=rng.randrange(1, 5000),
+                peer_id=SimpleNamespace(channel_id=channel_id),
+                reply_to=reply_to,
+            )
+        )
+    return messages
+
+
+def bench(label, lookup, messages):
+    start = time.perf_counter()
+    for message in messages:
+        lookup(message)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<10} {elapsed * 1e9 / len(messages):8.1f} ns/lookup")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mappings", type=int, default=10000)
+    parser.add_argument("--lookups", type=int, default=200000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    mappings = synthetic_mappings(args.mappings, rng)
+    messages = synthetic_messages(mappings, args.lookups, rng)
+
+    legacy = LegacyIndex(mappings)
+    router = Router(mappings)
+
+    # Both must agree on every message before timing means anything
+    for message in messages:
+        expected = [
+            (t["target_id"], t["target_topic_id"])
+            for t in legacy.get_targets_for_message(message)
+        ]
+        assert list(router.targets_for_message(message)) == expected
+
+    print(f"mappings={args.mappings} lookups={args.lookups}")
+    old = bench("legacy", legacy.get_targets_for_message, messages)
+    new = bench("compiled", router.targets_for_message, messages)
+    print(f"  speedup    {old / new:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,19 +7,40 @@ Supports groups, channels, and forum topics
 import asyncio
 import re
 import logging
-from datetime import datetime
+from typing import NamedTuple
 from telethon import TelegramClient, events
 from telethon.errors.common import TypeNotFoundError
-from telethon.errors import AuthKeyDuplicatedError
+from telethon.errors import (
+    AuthKeyDuplicatedError,
+    ChannelPrivateError,
+    FileReferenceExpiredError,
+    FloodWaitError,
+)
 from telethon.tl.types import Message
-import os
 from config import (
     API_ID,
     API_HASH,
     PHONE_NUMBER,
     SESSION_NAME,
     FORWARD_MAPPINGS,
+    CONTACT_FILTER_SOURCES,
+    FORWARDING_CONFIG_FILE,
+    CONFIG_RELOAD_INTERVAL,
     FORWARD_DELAY,
+    CONCURRENT_FANOUT,
+    RATE_LIMIT_PER_CHAT,
+    RATE_LIMIT_CHAT_BURST,
+    RATE_LIMIT_GLOBAL,
+    RATE_LIMIT_GLOBAL_BURST,
+    FLOOD_WAIT_RETRIES,
+    ENTITY_CACHE_TTL,
+    FORWARD_WORKERS,
+    FORWARD_QUEUE_SIZE,
+    FORWARD_DRAIN_TIMEOUT,
+    MEDIA_RELAY_MEMORY_LIMIT,
+    MEDIA_RELAY_TTL,
+    MEDIA_CACHE_SIZE,
+    ALBUM_WINDOW,
     LOG_FILE,
     LOG_LEVEL,
     AUTO_TRADE_SOURCES,
@@ -27,7 +48,17 @@ from config import (
     ENABLE_FORWARDING,
     ENABLE_AUTO_TRADING,
 )
+from auto_trader import metrics
 from auto_trader.engine import auto_trader_engine
+from forwarding.albums import AlbumAggregator
+from forwarding.entities import EntityCache
+from forwarding.media_cache import MediaCache, media_key
+from forwarding.pipeline import ForwardJob, ForwardPipeline
+from forwarding.ratelimit import RateLimiter
+from forwarding.relay import MediaRelay
+from forwarding.router import Router, Target, marked_source_id
+from forwarding.schedule import ScheduleClock, ScheduleGate
+from forwarding.routing_config import ConfigWatcher, RoutingConfig, load_routing_config
 
 # Setup logging
 logging.basicConfig(
@@ -57,12 +88,9 @@ logging.getLogger("telethon.network.mtprotosender").addFilter(_SuppressTypeNotFo
 # ============================================================================
 # CONTACT INFO FILTER
 # ============================================================================
-# Messages from these source IDs that contain links, phone numbers, or
-# @usernames will be skipped and NOT forwarded.
-CONTACT_FILTER_SOURCES = {
-    -1002871747055,  # OBIOFLAGOS FX COMMUNITY
-    -1003108945324,  # Gilly Options Signals
-}
+# Messages from CONTACT_FILTER_SOURCES (see config.py / the forwarding config
+# file) that contain links, phone numbers, or @usernames will be skipped and
+# NOT forwarded.
 
 # Patterns that indicate contact info in message text
 _CONTACT_PATTERNS = re.compile(
@@ -82,168 +110,80 @@ def _contains_contact_info(text: str) -> bool:
     return bool(_CONTACT_PATTERNS.search(text))
 
 
-# ---------------------------------------------------------------------------
-# SCHEDULED FORWARDING GATE
-# ---------------------------------------------------------------------------
-
-def _build_schedule_index() -> dict:
-    """Build a lookup: (source_id, target_id) -> schedule rule."""
-    return {
-        (rule["source_id"], rule["target_id"]): rule
-        for rule in SCHEDULED_FORWARDING
-    }
-
-
-_SCHEDULE_INDEX = _build_schedule_index()
+class RoutingState(NamedTuple):
+    """Compiled forwarding config, swapped atomically as one object on reload."""
 
+    config: RoutingConfig
+    router: Router
+    schedule: ScheduleGate
 
-def _is_forwarding_allowed(source_id: int, target_id: int) -> bool:
-    """Return True if a source→target pair is allowed to forward right now.
-
-    - If there is no schedule rule for this pair, forwarding is always allowed.
-    - Otherwise the current weekday must be in rule['days'].
-    - If all_day is True any time on that day is accepted.
-    - Otherwise the current local time must fall within [start_time, end_time).
-    """
-    rule = _SCHEDULE_INDEX.get((source_id, target_id))
-    if rule is None:
-        return True  # no restriction configured
-
-    now = datetime.now()
-    if now.weekday() not in rule["days"]:
-        return False
-
-    if rule.get("all_day", False):
-        return True
-
-    # Parse time window
-    start_h, start_m = map(int, rule["start_time"].split(":"))
-    end_h, end_m = map(int, rule["end_time"].split(":"))
-    current_minutes = now.hour * 60 + now.minute
-    start_minutes = start_h * 60 + start_m
-    end_minutes = end_h * 60 + end_m
-    return start_minutes <= current_minutes < end_minutes
+    @property
+    def source_ids(self) -> set:
+        return self.router.source_ids
 
 
 class SignalForwarder:
     """Handles message forwarding based on configured mappings"""
 
-    def __init__(self, client: TelegramClient, mappings: list):
+    def __init__(self, client: TelegramClient, routing_config: RoutingConfig):
         self.client = client
-        self.mappings = mappings
-        self.source_to_targets = self._build_mapping_index()
-        self.entity_names = {}  # Cache for entity names
+        self.routing = self.compile_routing(routing_config)
+        self.entities = EntityCache(client, ENTITY_CACHE_TTL)
+        self.rate_limiter = RateLimiter(
+            RATE_LIMIT_PER_CHAT,
+            RATE_LIMIT_CHAT_BURST,
+            RATE_LIMIT_GLOBAL,
+            RATE_LIMIT_GLOBAL_BURST,
+        )
+        self._destination_locks = {}  # (target_id, topic_id) -> asyncio.Lock
+        self.relay = MediaRelay(client, MEDIA_RELAY_MEMORY_LIMIT, MEDIA_RELAY_TTL)
+        self.media_cache = MediaCache(MEDIA_CACHE_SIZE)
 
     async def get_entity_name(self, entity_id):
-        """Get and cache entity name for logging"""
-        if entity_id not in self.entity_names:
-            try:
-                entity = await self.client.get_entity(entity_id)
-                name = getattr(entity, "title", getattr(entity, "username", "Unknown"))
-                self.entity_names[entity_id] = name
-            except Exception:
-                self.entity_names[entity_id] = "Unknown"
-        return self.entity_names[entity_id]
-
-    def _build_mapping_index(self):
-        """Build an index for quick lookup of targets based on source"""
-        index = {}
-
-        for mapping in self.mappings:
-            source_id = mapping["source_id"]
-            source_topic_id = mapping.get("source_topic_id")
-
-            # Create a key for this source (group or group+topic)
-            if source_topic_id:
-                key = f"{source_id}#{source_topic_id}"
-            else:
-                key = str(source_id)
-
-            # Add target info to this source key
-            if key not in index:
-                index[key] = []
-
-            index[key].append(
-                {
-                    "target_id": mapping["target_id"],
-                    "target_topic_id": mapping.get("target_topic_id"),
-                }
-            )
-
-        return index
-
-    def get_targets_for_message(self, message: Message):
-        """Get all target destinations for a given message.
-
-        Telegram forum topics use three different structures depending on the message:
-          1. Root/first message of a topic: reply_to is None, but message.id == topic_id
-          2. Direct reply to topic root: reply_to.reply_to_msg_id == topic_id,
-             reply_to_top_id is None (or same as reply_to_msg_id)
-          3. Nested reply inside a topic: reply_to.reply_to_top_id == topic_id
-        """
-        source_id = (
-            message.peer_id.channel_id
-            if hasattr(message.peer_id, "channel_id")
-            else None
+        """Get entity name for logging, resolving it if it isn't cached yet"""
+        name = self.entities.name(entity_id)
+        if name == "Unknown" and await self.entities.resolve(entity_id):
+            name = self.entities.name(entity_id)
+        return name
+
+    @staticmethod
+    def compile_routing(routing_config: RoutingConfig) -> RoutingState:
+        return RoutingState(
+            config=routing_config,
+            router=Router(routing_config.mappings),
+            schedule=ScheduleGate(routing_config.schedules),
         )
 
-        if not source_id:
-            return []
-
-        # Make it negative (Telegram convention)
-        source_id = -1000000000000 - source_id if source_id > 0 else source_id
-
-        source_topic_id = None
+    @property
+    def mappings(self) -> list:
+        return self.routing.config.mappings
 
-        if message.reply_to:
-            reply = message.reply_to
-            # Case 3: nested reply — reply_to_top_id points to the topic root
-            if getattr(reply, "reply_to_top_id", None):
-                source_topic_id = reply.reply_to_top_id
-            # Case 2: direct reply to topic root — only reply_to_msg_id is set
-            elif getattr(reply, "reply_to_msg_id", None):
-                source_topic_id = reply.reply_to_msg_id
-        else:
-            # Case 1: this IS the root/first message of a topic.
-            # Its message.id equals the topic_id in Telegram's forum model.
-            # Check if this message id matches any configured source topic for this group.
-            candidate_key = f"{source_id}#{message.id}"
-            if candidate_key in self.source_to_targets:
-                return self.source_to_targets[candidate_key]
-
-        # Try exact topic match
-        if source_topic_id:
-            key = f"{source_id}#{source_topic_id}"
-            if key in self.source_to_targets:
-                return self.source_to_targets[key]
+    def get_targets_for_message(self, message: Message) -> tuple:
+        """Get all target destinations for a given message (see Router)"""
+        return self.routing.router.targets_for_message(message)
 
-        # Fall back to group-level match (no topic filter)
-        key = str(source_id)
-        return self.source_to_targets.get(key, [])
+    def plan_jobs(self, message: Message, album: tuple = ()) -> list:
+        """Classify a message into one ForwardJob per configured target.
 
-    async def forward_message(self, message: Message):
-        """Copy message to all configured targets (without 'Forwarded from' label)"""
+        For an album, `message` is its first item (used for routing) and
+        `album` holds every item in order.
+        """
         targets = self.get_targets_for_message(message)
 
         if not targets:
             logger.debug(f"No targets configured for message from {message.peer_id}")
-            return
+            return []
 
-        source_id = (
-            message.peer_id.channel_id
-            if hasattr(message.peer_id, "channel_id")
-            else None
-        )
-        source_id = (
-            -1000000000000 - source_id if source_id and source_id > 0 else source_id
-        )
+        source_id = marked_source_id(message)
 
-        # Get source name for logging
-        source_name = await self.get_entity_name(source_id)
+        # Get source name for logging (cached, no network lookup)
+        source_name = self.entities.name(source_id)
 
         # Get message preview
         msg_preview = ""
-        if message.text:
+        if album:
+            msg_preview = f"[Album of {len(album)}]"
+        elif message.text:
             msg_preview = message.text[:50].replace("\n", " ")
             if len(message.text) > 50:
                 msg_preview += "..."
@@ -253,55 +193,92 @@ class SignalForwarder:
         logger.info(f"📨 New message from {source_name} ({source_id}): {msg_preview}")
         logger.info(f"   Copying to {len(targets)} target(s)")
 
+        # --- Schedule gate --- (clock is read once for all targets of this message)
+        schedule = self.routing.schedule
+        clock = ScheduleClock()
+        jobs = []
         for idx, target in enumerate(targets, 1):
-            try:
-                target_id = target["target_id"]
-                target_topic_id = target.get("target_topic_id")
+            if not schedule.allowed(source_id, target.target_id, clock):
+                logger.info(
+                    f"   ⏰ [{idx}/{len(targets)}] Skipped (outside schedule window) "
+                    f"for source {source_id} → target {target.target_id}"
+                )
+                continue
+            jobs.append(
+                ForwardJob(message, target, idx, len(targets), source_id, tuple(album))
+            )
+        return jobs
 
-                # --- Schedule gate ---
-                if not _is_forwarding_allowed(source_id, target_id):
-                    logger.info(
-                        f"   ⏰ [{idx}/{len(targets)}] Skipped (outside schedule window) "
-                        f"for source {source_id} → target {target_id}"
-                    )
-                    continue
+    async def forward_message(self, message: Message, album: tuple = ()):
+        """Copy message to all configured targets (without 'Forwarded from' label)"""
+        jobs = self.plan_jobs(message, album)
 
-                # Get target name for logging
-                target_name = await self.get_entity_name(target_id)
+        if CONCURRENT_FANOUT:
+            # Fan out to every target at once; pacing is handled per destination
+            await asyncio.gather(*(self.send_job(job) for job in jobs), return_exceptions=True)
+            return
 
-                # Get target entity
-                target_entity = await self.client.get_entity(target_id)
+        for job in jobs:
+            if await self.send_job(job):
+                # Anti-spam delay
+                await asyncio.sleep(FORWARD_DELAY)
 
+    async def send_job(self, job: ForwardJob) -> bool:
+        """Copy one planned job to its target. Returns True if it was sent."""
+        return await self._copy_to_target(
+            job.message, job.target, job.idx, job.total, job.album
+        )
+
+    async def _copy_to_target(
+        self,
+        message: Message,
+        target: Target,
+        idx: int,
+        total: int,
+        album: tuple = (),
+    ) -> bool:
+        """Copy a message (or a whole album) to a single target. Returns True if it was sent."""
+        target_id, target_topic_id = target
+
+        topic_suffix = f" → Topic #{target_topic_id}" if target_topic_id else ""
+
+        # Resolved target peer and name from the entity cache (no network lookup)
+        target_name = self.entities.name(target_id)
+        target_entity = self.entities.peer(target_id)
+
+        # One send at a time per destination keeps posts in arrival order
+        lock = self._destination_locks.setdefault(
+            (target_id, target_topic_id), asyncio.Lock()
+        )
+
+        async with lock:
+            try:
                 # Copy the message (not forward - no "Forwarded from" label)
                 # This preserves all content: text, media, files, formatting, etc.
-                if target_topic_id:
-                    # Send to specific topic in forum group
-                    await self.client.send_message(
-                        entity=target_entity,
-                        message=message.text or "",
-                        file=message.media if message.media else None,
-                        formatting_entities=message.entities,
-                        link_preview=False,
-                        reply_to=target_topic_id,  # Post in specific topic
-                    )
-                    logger.info(
-                        f"   ✓ [{idx}/{len(targets)}] Copied to {target_name} ({target_id}) → Topic #{target_topic_id}"
-                    )
-                else:
-                    # Send to group/channel (no specific topic)
-                    await self.client.send_message(
-                        entity=target_entity,
-                        message=message.text or "",
-                        file=message.media if message.media else None,
-                        formatting_entities=message.entities,
-                        link_preview=False,
+                # reply_to=None posts to the group/channel, a topic id posts in that topic.
+                if album:
+                    await self._send_album_copy(
+                        target_id, target_entity, album, target_topic_id
                     )
                     logger.info(
-                        f"   ✓ [{idx}/{len(targets)}] Copied to {target_name} ({target_id})"
+                        f"   ✓ [{idx}/{total}] Copied album of {len(album)} to "
+                        f"{target_name} ({target_id}){topic_suffix}"
                     )
-
-                # Anti-spam delay
-                await asyncio.sleep(FORWARD_DELAY)
+                    return True
+
+                await self._send_reusing_media(
+                    target_id, target_entity, message, target_topic_id
+                )
+                logger.info(
+                    f"   ✓ [{idx}/{total}] Copied to {target_name} ({target_id}){topic_suffix}"
+                )
+                return True
+
+            except ChannelPrivateError as e:
+                # Lost access (kicked / channel went private): drop the cached peer
+                self.entities.invalidate(target_id)
+                logger.error(f"   ❌ [{idx}/{total}] Failed to copy to {target_id}: {e}")
+                return False
 
             except Exception as e:
                 # Check for protected chat restriction
@@ -310,63 +287,159 @@ class SignalForwarder:
                 if (
                     "protected chat" in error_str or "sendmediarequest" in error_str
                 ) and message.media:
-                    logger.warning(
-                        f"   ⚠️ Protected chat detected. Downloading and re-uploading media..."
-                    )
-                    path = None
-                    try:
-                        # Download media to a temp file
-                        path = await message.download_media()
-                        if path:
-                            logger.info(f"   ⬇️ Downloaded media to {path}")
-
-                            # Send with the downloaded file
-                            if target_topic_id:
-                                await self.client.send_message(
-                                    entity=target_entity,
-                                    message=message.text or "",
-                                    file=path,
-                                    formatting_entities=message.entities,
-                                    link_preview=False,
-                                    reply_to=target_topic_id,
-                                )
-                                logger.info(
-                                    f"   ✓ [{idx}/{len(targets)}] Copied (via download) to {target_name} → Topic #{target_topic_id}"
-                                )
-                            else:
-                                await self.client.send_message(
-                                    entity=target_entity,
-                                    message=message.text or "",
-                                    file=path,
-                                    formatting_entities=message.entities,
-                                    link_preview=False,
-                                )
-                                logger.info(
-                                    f"   ✓ [{idx}/{len(targets)}] Copied (via download) to {target_name}"
-                                )
-                        else:
-                            logger.error(
-                                f"   ❌ Failed to download media from protected chat"
-                            )
-
-                    except Exception as upload_e:
-                        logger.error(f"   ❌ Failed to re-upload media: {upload_e}")
-
-                    finally:
-                        # Clean up
-                        if path and os.path.exists(path):
-                            try:
-                                os.remove(path)
-                                logger.debug(f"   🗑️ Deleted temp file {path}")
-                            except Exception as cleanup_e:
-                                logger.warning(
-                                    f"   ⚠️ Failed to delete temp file {path}: {cleanup_e}"
-                                )
-                else:
-                    logger.error(
-                        f"   ❌ [{idx}/{len(targets)}] Failed to copy to {target.get('target_id', 'Unknown')}: {e}"
+                    return await self._copy_via_relay(
+                        message, target_id, target_entity, target_name, target_topic_id,
+                        idx, total, album,
                     )
 
+                logger.error(f"   ❌ [{idx}/{total}] Failed to copy to {target_id}: {e}")
+                return False
+
+    async def _send_reusing_media(
+        self, target_id, target_entity, message: Message, target_topic_id
+    ):
+        """Send a copy, reusing a cached file reference for media we've sent before."""
+        key = media_key(message.media)
+        cached = self.media_cache.get(key)
+        if cached is not None:
+            try:
+                return await self._send_with_backoff(
+                    target_id,
+                    lambda: self._send_copy(target_entity, message, cached, target_topic_id),
+                )
+            except FileReferenceExpiredError:
+                logger.info("   ♻️ Cached media reference expired, refreshing")
+                self.media_cache.discard(key)
+
+        sent = await self._send_with_backoff(
+            target_id,
+            lambda: self._send_copy(target_entity, message, message.media, target_topic_id),
+        )
+        self.media_cache.remember(key, sent)
+        return sent
+
+    async def _send_album_copy(
+        self, target_id, target_entity, album: list, target_topic_id, relay=False
+    ):
+        """Send a whole album (grouped media) to one target as a single multi-file send.
+
+        Cached file references are used where available; with relay=True the
+        remaining items are relayed (protected chats) instead of referenced.
+        """
+        keys = [media_key(m.media) for m in album]
+        for use_cache in (True, False):
+            files = []
+            for m, key in zip(album, keys):
+                media = self.media_cache.get(key) if use_cache else None
+                if media is None and relay:
+                    media = await self.relay.get(m)
+                    if media is None:
+                        raise ValueError(f"failed to relay album item {m.id}")
+                files.append(media or m.media)
+
+            try:
+                sent = await self._send_with_backoff(
+                    target_id,
+                    lambda: self.client.send_file(
+                        target_entity,
+                        files,
+                        caption=[m.text or "" for m in album],
+                        formatting_entities=[m.entities or [] for m in album],
+                        reply_to=target_topic_id,
+                    ),
+                )
+            except FileReferenceExpiredError:
+                if not use_cache:
+                    raise
+                logger.info("   ♻️ Cached album reference expired, refreshing")
+                for key in keys:
+                    self.media_cache.discard(key)
+                continue
+
+            for key, sent_message in zip(keys, sent):
+                self.media_cache.remember(key, sent_message)
+            return sent
+
+    async def _send_with_backoff(self, target_id, send):
+        """Rate-limited send that pauses only this target on FloodWaitError.
+
+        `send` is a zero-argument callable returning the send coroutine, so it
+        can be retried after a FloodWait pause.
+        """
+        for attempt in range(FLOOD_WAIT_RETRIES + 1):
+            await self.rate_limiter.acquire(target_id)
+            try:
+                return await send()
+            except FloodWaitError as e:
+                self.rate_limiter.pause(target_id, e.seconds)
+                if attempt == FLOOD_WAIT_RETRIES:
+                    raise
+
+    async def _send_copy(self, target_entity, message: Message, file, target_topic_id):
+        """Send the message text/formatting with the given file to one target."""
+        return await self.client.send_message(
+            entity=target_entity,
+            message=message.text or "",
+            file=file if file else None,
+            formatting_entities=message.entities,
+            link_preview=False,
+            reply_to=target_topic_id,
+        )
+
+    async def _copy_via_relay(
+        self, message: Message, target_id, target_entity, target_name, target_topic_id,
+        idx, total, album=(),
+    ) -> bool:
+        """Protected chats can't be copied by reference: relay the media once for all targets."""
+        logger.warning(
+            "   ⚠️ Protected chat detected. Relaying media (downloaded and uploaded once)..."
+        )
+        topic_suffix = f" → Topic #{target_topic_id}" if target_topic_id else ""
+
+        if album:
+            try:
+                await self._send_album_copy(
+                    target_id, target_entity, album, target_topic_id, relay=True
+                )
+                logger.info(
+                    f"   ✓ [{idx}/{total}] Copied album of {len(album)} (via relay) "
+                    f"to {target_name}{topic_suffix}"
+                )
+                return True
+            except Exception as upload_e:
+                logger.error(f"   ❌ Failed to re-upload album: {upload_e}")
+                return False
+
+        media = await self.relay.get(message)
+        if media is None:
+            logger.error("   ❌ Failed to download media from protected chat")
+            return False
+
+        try:
+            sent = await self._send_with_backoff(
+                target_id,
+                lambda: self._send_copy(target_entity, message, media, target_topic_id),
+            )
+            # Later duplicates of this file can be sent by reference
+            self.media_cache.remember(media_key(message.media), sent)
+            logger.info(
+                f"   ✓ [{idx}/{total}] Copied (via relay) to {target_name}{topic_suffix}"
+            )
+            return True
+
+        except Exception as upload_e:
+            logger.error(f"   ❌ Failed to re-upload media: {upload_e}")
+            return False
+
+
+def _mapped_chat_ids(mappings: list) -> set:
+    """Every source and target chat id referenced by the mappings"""
+    chat_ids = set()
+    for mapping in mappings:
+        chat_ids.add(mapping["source_id"])
+        chat_ids.add(mapping["target_id"])
+    return chat_ids
+
 
 async def main():
     """Main bot function"""
@@ -374,45 +447,70 @@ async def main():
     # Initialize client
     client = TelegramClient(SESSION_NAME, API_ID, API_HASH)
 
+    # Forwarding config: FORWARDING_CONFIG_FILE if present, else the config.py literals
+    default_routing = RoutingConfig(
+        mappings=FORWARD_MAPPINGS,
+        schedules=SCHEDULED_FORWARDING,
+        contact_filter_sources=frozenset(CONTACT_FILTER_SOURCES),
+    )
+    routing_config = load_routing_config(FORWARDING_CONFIG_FILE, default_routing)
+
     # Initialize forwarder
-    forwarder = SignalForwarder(client, FORWARD_MAPPINGS)
+    forwarder = SignalForwarder(client, routing_config)
+    # Served by the API's /metrics endpoint, with the pipeline below
+    metrics.register("entity_cache", forwarder.entities.stats)
+    metrics.register("media_cache", forwarder.media_cache.stats)
+    metrics.register("rate_limiter", forwarder.rate_limiter.stats)
+
+    # Sender pool fed by the message handler (FORWARD_WORKERS=0 sends inline).
+    # CONCURRENT_FANOUT=false keeps sends sequential: one worker for everything
+    pipeline = None
+    if FORWARD_WORKERS > 0:
+        workers = FORWARD_WORKERS if CONCURRENT_FANOUT else 1
+        pipeline = ForwardPipeline(forwarder.send_job, workers, FORWARD_QUEUE_SIZE)
+        metrics.register("forward_pipeline", pipeline.stats)
+
+    async def dispatch(message, album=()):
+        """Hand a message (or a complete album) to the senders"""
+        if pipeline:
+            for job in forwarder.plan_jobs(message, album):
+                await pipeline.submit(job)
+        else:
+            await forwarder.forward_message(message, album)
+
+    # Album items arrive one update each; batch them into a single send per target
+    albums = AlbumAggregator(
+        ALBUM_WINDOW, lambda messages: dispatch(messages[0], messages)
+    )
 
     # Get all unique source IDs to monitor
-    source_ids = set()
-    for mapping in FORWARD_MAPPINGS:
-        source_ids.add(mapping["source_id"])
-        
-    source_ids.update(AUTO_TRADE_SOURCES)
+    source_ids = forwarder.routing.source_ids | AUTO_TRADE_SOURCES
 
     logger.info(
-        f"Monitoring {len(source_ids)} source(s) with {len(FORWARD_MAPPINGS)} mapping(s)"
+        f"Monitoring {len(source_ids)} source(s) with {len(forwarder.mappings)} mapping(s)"
     )
     logger.info(f"📡 Forwarding enabled: {ENABLE_FORWARDING}")
     logger.info(f"📈 Auto-trading enabled: {ENABLE_AUTO_TRADING}")
 
-    # Register event handler for new messages
-    @client.on(events.NewMessage(chats=list(source_ids)))
+    # Register event handler for new messages. The builder is kept so its chat
+    # filter can be updated in place when the forwarding config is reloaded.
+    new_message_event = events.NewMessage(chats=list(source_ids))
+
+    @client.on(new_message_event)
     async def handle_new_message(event):
         """Handle incoming messages from monitored sources"""
         try:
             message = event.message
 
             # Log message details
-            source_id = (
-                message.peer_id.channel_id
-                if hasattr(message.peer_id, "channel_id")
-                else None
-            )
-            source_id = (
-                -1000000000000 - source_id if source_id and source_id > 0 else source_id
-            )
+            source_id = marked_source_id(message)
 
             logger.info(
                 f"📨 New message from {source_id}: {message.message[:50] if message.message else '[Media]'}..."
             )
 
             # Skip messages with contact info from filtered sources
-            if source_id in CONTACT_FILTER_SOURCES:
+            if source_id in forwarder.routing.config.contact_filter_sources:
                 text = message.message or ""
                 if _contains_contact_info(text):
                     logger.info(
@@ -424,11 +522,17 @@ async def main():
             if ENABLE_AUTO_TRADING and source_id in AUTO_TRADE_SOURCES:
                 text_to_process = message.message or ""
                 if text_to_process:
-                    asyncio.create_task(auto_trader_engine.process_signal(text_to_process))
+                    asyncio.create_task(
+                        auto_trader_engine.process_signal(text_to_process, source_id)
+                    )
 
-            # Forward the message
-            if ENABLE_FORWARDING:
-                await forwarder.forward_message(message)
+            # Forward the message (album items are buffered until the album is
+            # complete; a buffered album from this chat goes out before it)
+            if ENABLE_FORWARDING and message.grouped_id:
+                albums.add(message)
+            elif ENABLE_FORWARDING:
+                await albums.flush_chat(message.chat_id)
+                await dispatch(message)
             else:
                 logger.debug("   ⏭️ Forwarding disabled — skipping.")
 
@@ -441,15 +545,55 @@ async def main():
     # Get current user info
     me = await client.get_me()
     logger.info(f"✓ Bot started as {me.first_name} (@{me.username})")
+
+    # Resolve every source and target once so the send path never hits the network
+    await forwarder.entities.preload(_mapped_chat_ids(forwarder.mappings))
+
+    async def reload_routing(new_config: RoutingConfig):
+        """Swap in a new forwarding config without touching the Telegram session"""
+        new_state = forwarder.compile_routing(new_config)
+        new_sources = new_state.source_ids | AUTO_TRADE_SOURCES
+
+        # Resolve new chats before they can be routed to
+        await forwarder.entities.preload(
+            _mapped_chat_ids(new_config.mappings) - _mapped_chat_ids(forwarder.mappings)
+        )
+
+        # Widen the chat filter first, swap, then narrow it — so no update from
+        # a chat that is in both the old and the new config is ever dropped.
+        chats = new_message_event.chats
+        if isinstance(chats, set):
+            chats |= new_sources
+        forwarder.routing = new_state
+        if isinstance(chats, set):
+            chats &= new_sources
+        else:
+            new_message_event.chats = list(new_sources)
+
+        logger.info(
+            f"🔄 Forwarding config reloaded: {len(new_sources)} source(s), "
+            f"{len(new_config.mappings)} mapping(s), {len(new_config.schedules)} schedule rule(s)"
+        )
+
+    watcher = ConfigWatcher(
+        FORWARDING_CONFIG_FILE, CONFIG_RELOAD_INTERVAL, default_routing, reload_routing
+    )
+    watcher_task = asyncio.create_task(watcher.run())
+    auto_trader_engine.start()
+
+    # The handler has been live since client.start(); anything it submitted
+    # meanwhile is queued and sent now that the target peers are resolved
+    if pipeline:
+        pipeline.start()
     logger.info(
-        f"✓ Monitoring {len(source_ids)} source(s) with {len(FORWARD_MAPPINGS)} mapping(s)"
+        f"✓ Monitoring {len(source_ids)} source(s) with {len(forwarder.mappings)} mapping(s)"
     )
     logger.info("=" * 80)
     logger.info("ACTIVE MAPPINGS:")
     logger.info("=" * 80)
 
     # Print detailed mapping summary with names
-    for idx, mapping in enumerate(FORWARD_MAPPINGS, 1):
+    for idx, mapping in enumerate(forwarder.mappings, 1):
         source_id = mapping["source_id"]
         source_name = await forwarder.get_entity_name(source_id)
         source_topic_id = mapping.get("source_topic_id")
@@ -485,24 +629,32 @@ async def main():
     # the same time (e.g. overlapping deploys). The session is now revoked by
     # Telegram — reconnecting is pointless and will keep failing. We exit cleanly
     # so Fly.io restarts with a single fresh connection.
-    while True:
-        try:
-            await client.run_until_disconnected()
-            break  # clean disconnect (e.g. KeyboardInterrupt forwarded)
-        except AuthKeyDuplicatedError:
-            logger.error(
-                "🔑 AuthKeyDuplicatedError: session used from two IPs simultaneously — "
-                "session is now revoked. Exiting so it can be restarted cleanly."
-            )
-            raise  # let start.py / Fly.io restart the process
-        except TypeNotFoundError as e:
-            logger.warning(
-                f"⚠️  Telethon TypeNotFoundError (unknown TL constructor — harmless): {e}. "
-                "Reconnecting in 5 s..."
-            )
-            await asyncio.sleep(5)
-            # Re-connect and keep the same handlers alive
-            await client.connect()
+    try:
+        while True:
+            try:
+                await client.run_until_disconnected()
+                break  # clean disconnect (e.g. KeyboardInterrupt forwarded)
+            except AuthKeyDuplicatedError:
+                logger.error(
+                    "🔑 AuthKeyDuplicatedError: session used from two IPs simultaneously — "
+                    "session is now revoked. Exiting so it can be restarted cleanly."
+                )
+                raise  # let start.py / Fly.io restart the process
+            except TypeNotFoundError as e:
+                logger.warning(
+                    f"⚠️  Telethon TypeNotFoundError (unknown TL constructor — harmless): {e}. "
+                    "Reconnecting in 5 s..."
+                )
+                await asyncio.sleep(5)
+                # Re-connect and keep the same handlers alive
+                await client.connect()
+    finally:
+        # Graceful shutdown: let queued forwards finish before exiting
+        watcher_task.cancel()
+        await auto_trader_engine.stop()
+        await albums.flush_all()
+        if pipeline:
+            await pipeline.drain(FORWARD_DRAIN_TIMEOUT)
 
 
 if __name__ == "__main__":
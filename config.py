@@ -158,6 +158,46 @@ FORWARD_MAPPINGS = [
 
 # Bot Settings
 FORWARD_DELAY = 2  # Seconds to wait between forwards (anti-spam protection)
+# When enabled, a message is copied to all of its targets at the same time and
+# pacing is applied per destination (see RATE_LIMIT_*) instead of sleeping
+# FORWARD_DELAY after every single send. When disabled, every send happens one
+# at a time: the sender pool is limited to a single worker (and with
+# FORWARD_WORKERS=0 targets are sent inline, sleeping FORWARD_DELAY between them).
+CONCURRENT_FANOUT = os.getenv("CONCURRENT_FANOUT", "true").lower() == "true"
+
+# Token-bucket rate limiting. Every target chat has its own bucket (sends per
+# second + burst size), and every send also draws from one account-wide bucket.
+# By default each chat sustains one send every FORWARD_DELAY seconds.
+RATE_LIMIT_PER_CHAT = float(os.getenv("RATE_LIMIT_PER_CHAT", str(1 / FORWARD_DELAY)))
+RATE_LIMIT_CHAT_BURST = float(os.getenv("RATE_LIMIT_CHAT_BURST", "3"))
+RATE_LIMIT_GLOBAL = float(os.getenv("RATE_LIMIT_GLOBAL", "10"))
+RATE_LIMIT_GLOBAL_BURST = float(os.getenv("RATE_LIMIT_GLOBAL_BURST", "10"))
+# How many times to retry a send after a FloodWaitError (the target is paused
+# for the requested number of seconds before each retry)
+FLOOD_WAIT_RETRIES = int(os.getenv("FLOOD_WAIT_RETRIES", "1"))
+# Resolved source/target peers are cached at startup and refreshed in the
+# background once they are older than this many seconds
+ENTITY_CACHE_TTL = int(os.getenv("ENTITY_CACHE_TTL", "3600"))
+# Sender pool between the message handler and Telegram. Jobs are queued per
+# destination (bounded, FORWARD_QUEUE_SIZE each) and drained by FORWARD_WORKERS
+# workers. Set FORWARD_WORKERS=0 to send inline from the handler instead.
+FORWARD_WORKERS = int(os.getenv("FORWARD_WORKERS", "4"))
+FORWARD_QUEUE_SIZE = int(os.getenv("FORWARD_QUEUE_SIZE", "100"))
+# Seconds to wait for queued forwards to finish on shutdown
+FORWARD_DRAIN_TIMEOUT = float(os.getenv("FORWARD_DRAIN_TIMEOUT", "30"))
+# Media from protected chats is relayed once for all targets: documents are
+# streamed from download straight into upload; photos are buffered in memory
+# up to MEDIA_RELAY_MEMORY_LIMIT bytes (spilling to disk only beyond that).
+MEDIA_RELAY_MEMORY_LIMIT = int(os.getenv("MEDIA_RELAY_MEMORY_LIMIT", str(20 * 1024 * 1024)))
+# Seconds an uploaded relay handle is reused for further targets of the same message
+MEDIA_RELAY_TTL = int(os.getenv("MEDIA_RELAY_TTL", "600"))
+# Number of sent photo/document references kept (LRU) so the same file can be
+# sent to further targets and later duplicates without re-uploading
+MEDIA_CACHE_SIZE = int(os.getenv("MEDIA_CACHE_SIZE", "512"))
+# Album items (same grouped_id) are buffered until no new item has arrived for
+# this many seconds, then copied as one multi-file message per target
+ALBUM_WINDOW = float(os.getenv("ALBUM_WINDOW", "0.8"))
+
 SESSION_NAME = "sessions/user"  # Session file location
 
 # Logging Configuration
@@ -186,6 +226,46 @@ USE_PRACTICE_ACCOUNT = os.getenv("USE_PRACTICE_ACCOUNT", "true").lower() == "tru
 # Default 120 = wait at most 2 minutes.
 SIGNAL_MAX_WAIT_SECONDS = int(os.getenv("SIGNAL_MAX_WAIT_SECONDS", "120"))
 
+# Seconds before a signal's minute at which the trade is pre-armed (broker
+# connection checked, asset verified) so that only the buy call is left at
+# the minute itself
+PREARM_LEAD_SECONDS = float(os.getenv("PREARM_LEAD_SECONDS", "5"))
+
+# Seconds between background refreshes of the IQ Option asset list (open
+# status, payouts, newly listed OTC pairs). Trades never wait for a refresh.
+ASSET_REFRESH_INTERVAL = float(os.getenv("ASSET_REFRESH_INTERVAL", "300"))
+
+# Seconds between background health checks of the IQ Option session. A drop
+# is reconnected right away instead of by the next trade.
+BROKER_HEARTBEAT_INTERVAL = float(os.getenv("BROKER_HEARTBEAT_INTERVAL", "10"))
+
+# SQLite database (WAL mode) holding every trades.csv row for fast queries:
+# P&L per asset/provider, today's loss for the validator, the API's /trades
+# endpoints. Set to an empty string to keep the CSV only.
+TRADE_STORE_PATH = os.getenv("TRADE_STORE_PATH", "trades.db")
+
+# Trade results are fetched at each option expiry; a result the broker has not
+# reported yet is asked for again after this many seconds. Results feed the
+# day's P&L ledger (which MAX_DAILY_LOSS is checked against) and trades.csv.
+RESULT_POLL_INTERVAL = float(os.getenv("RESULT_POLL_INTERVAL", "5"))
+
+# Per-source duplicate-signal cooldowns, as comma-separated source_id:seconds
+# pairs, e.g. DUPLICATE_COOLDOWNS=-1003771929527:120,-1001234567890:600
+# A signal (same asset, direction, minute and text) seen again within its
+# source's cooldown is skipped. Unlisted sources use 300 seconds.
+DUPLICATE_COOLDOWNS_STR = os.getenv("DUPLICATE_COOLDOWNS", "")
+DUPLICATE_COOLDOWNS = {}
+if DUPLICATE_COOLDOWNS_STR:
+    try:
+        DUPLICATE_COOLDOWNS = {
+            int(source.strip()): float(seconds)
+            for source, seconds in (
+                pair.rsplit(":", 1) for pair in DUPLICATE_COOLDOWNS_STR.split(",") if pair.strip()
+            )
+        }
+    except ValueError:
+        pass
+
 # Parse comma-separated list of group IDs
 AUTO_TRADE_SOURCES_STR = os.getenv("AUTO_TRADE_SOURCES", "")
 AUTO_TRADE_SOURCES = set()
@@ -197,6 +277,35 @@ if AUTO_TRADE_SOURCES_STR:
     except ValueError:
         pass
 
+# Extra asset spellings, as comma-separated alias=BROKER_NAME pairs, e.g.
+#   ASSET_ALIASES=GOLD=XAUUSD,GOLD OTC=XAUUSD-OTC
+# Separators, case and the position of "OTC" are normalised anyway, so
+# "EUR/JPY OTC" already resolves to EURJPY-OTC without an alias.
+ASSET_ALIASES_STR = os.getenv("ASSET_ALIASES", "")
+ASSET_ALIASES = dict(
+    (alias.strip(), target.strip())
+    for alias, target in (
+        pair.split("=", 1) for pair in ASSET_ALIASES_STR.split(",") if "=" in pair
+    )
+)
+
+# Per-provider signal formats, as comma-separated source_id:grammar pairs, e.g.
+#   SIGNAL_GRAMMARS=-1003771929527:emoji_card,-1001234567890:labelled
+# Built-in grammars live in auto_trader/grammars.py (emoji_card, labelled,
+# generic). Sources not listed use the generic parser.
+SIGNAL_GRAMMARS_STR = os.getenv("SIGNAL_GRAMMARS", "")
+SIGNAL_GRAMMARS = {}
+if SIGNAL_GRAMMARS_STR:
+    try:
+        SIGNAL_GRAMMARS = {
+            int(source.strip()): grammar.strip()
+            for source, grammar in (
+                pair.rsplit(":", 1) for pair in SIGNAL_GRAMMARS_STR.split(",") if pair.strip()
+            )
+        }
+    except ValueError:
+        pass
+
 # ============================================================================
 # SCHEDULED FORWARDING CONFIGURATION
 # ============================================================================
@@ -212,7 +321,14 @@ if AUTO_TRADE_SOURCES_STR:
 #   all_day     : If True, forward at any time on the allowed days (ignores
 #                 start_time / end_time)
 #   start_time  : "HH:MM" – start of the forwarding window (24-hour clock)
-#   end_time    : "HH:MM" – end of the forwarding window (24-hour clock)
+#   end_time    : "HH:MM" – end of the forwarding window (24-hour clock).
+#                 An end before the start runs overnight into the next day.
+#   windows     : Optional list of {"start": "HH:MM", "end": "HH:MM"} to allow
+#                 several windows per day (replaces start_time / end_time)
+#   timezone    : Optional IANA name (e.g. "Africa/Lagos"); default is the
+#                 server's local time
+#
+# Several rules for the same source→target pair are combined (any match allows).
 #
 # To allow forwarding on Mon / Wed / Fri between 17:00 and 20:00:
 #   days=[0, 2, 4], all_day=False, start_time="17:00", end_time="20:00"
@@ -238,6 +354,28 @@ SCHEDULED_FORWARDING = [
     },
 ]
 
+# ============================================================================
+# CONTACT INFO FILTER
+# ============================================================================
+# Messages from these source IDs that contain links, phone numbers, or
+# @usernames will be skipped and NOT forwarded.
+CONTACT_FILTER_SOURCES = {
+    -1002871747055,  # OBIOFLAGOS FX COMMUNITY
+    -1003108945324,  # Gilly Options Signals
+}
+
+# ============================================================================
+# HOT-RELOADABLE FORWARDING CONFIG
+# ============================================================================
+# FORWARD_MAPPINGS, SCHEDULED_FORWARDING and CONTACT_FILTER_SOURCES above are the
+# defaults. If FORWARDING_CONFIG_FILE exists (JSON, or YAML with PyYAML
+# installed), its "forward_mappings", "scheduled_forwarding" and
+# "contact_filter_sources" keys override them. The file is checked every
+# CONFIG_RELOAD_INTERVAL seconds and changes are applied without restarting the
+# Telegram session. See forwarding.example.json.
+FORWARDING_CONFIG_FILE = os.getenv("FORWARDING_CONFIG_FILE", "forwarding.json")
+CONFIG_RELOAD_INTERVAL = float(os.getenv("CONFIG_RELOAD_INTERVAL", "5"))
+
 # Validate required credentials
 if not API_ID or not API_HASH or not PHONE_NUMBER:
     raise ValueError(
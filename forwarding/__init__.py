@@ -0,0 +1 @@
+# Forwarding Package
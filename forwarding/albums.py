@@ -0,0 +1,101 @@
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Telegram allows at most 10 items in one album
+MAX_ALBUM_SIZE = 10
+
+
+class AlbumAggregator:
+    """
+    Collects the messages of a Telegram album (same grouped_id) into one batch.
+
+    Each album item arrives as its own NewMessage update. Items are buffered
+    per grouped_id, and the album is handed to `on_album` once no new item has
+    arrived for `window` seconds (or once it reaches 10 items). That way every
+    target gets one multi-file send instead of N separate posts.
+
+    Buffering must not reorder a chat: albums of one chat are delivered one
+    after another, a new album flushes the chat's earlier ones, and callers
+    await flush_chat() before handing on any other message from that chat.
+    """
+
+    def __init__(self, window: float, on_album):
+        self.window = window
+        self.on_album = on_album  # async callable taking a list of messages
+        self._albums = {}  # grouped_id -> [messages]
+        self._timers = {}  # grouped_id -> asyncio.TimerHandle
+        self._chats = {}   # grouped_id -> chat_id
+        self._last = {}    # chat_id -> latest delivery task of that chat
+        self._tasks = set()
+        self.albums_flushed = 0
+
+    def add(self, message) -> None:
+        grouped_id = message.grouped_id
+        if grouped_id not in self._albums:
+            self._flush_chat_albums(message.chat_id)
+            self._chats[grouped_id] = message.chat_id
+        album = self._albums.setdefault(grouped_id, [])
+        album.append(message)
+
+        timer = self._timers.pop(grouped_id, None)
+        if timer:
+            timer.cancel()
+
+        if len(album) >= MAX_ALBUM_SIZE:
+            self._flush(grouped_id)
+        else:
+            loop = asyncio.get_running_loop()
+            self._timers[grouped_id] = loop.call_later(self.window, self._flush, grouped_id)
+
+    def _flush(self, grouped_id) -> None:
+        timer = self._timers.pop(grouped_id, None)
+        if timer:
+            timer.cancel()
+        chat_id = self._chats.pop(grouped_id, None)
+        messages = sorted(self._albums.pop(grouped_id, []), key=lambda m: m.id)
+        if not messages:
+            return
+
+        self.albums_flushed += 1
+        logger.debug(f"Album {grouped_id} complete with {len(messages)} item(s)")
+        task = asyncio.create_task(self._deliver(messages, self._last.get(chat_id)))
+        self._last[chat_id] = task
+        self._tasks.add(task)
+        task.add_done_callback(lambda t: self._done(chat_id, t))
+
+    def _done(self, chat_id, task) -> None:
+        self._tasks.discard(task)
+        if self._last.get(chat_id) is task:
+            del self._last[chat_id]
+
+    def _flush_chat_albums(self, chat_id) -> None:
+        for grouped_id, album_chat in list(self._chats.items()):
+            if album_chat == chat_id:
+                self._flush(grouped_id)
+
+    async def _deliver(self, messages, previous) -> None:
+        if previous is not None:
+            # Same chat: the earlier album goes out first
+            await asyncio.gather(previous, return_exceptions=True)
+        try:
+            await self.on_album(messages)
+        except Exception as e:
+            logger.error(f"❌ Error handling album: {e}", exc_info=True)
+
+    async def flush_chat(self, chat_id) -> None:
+        """Deliver the chat's buffered albums now and wait until they are handed on."""
+        self._flush_chat_albums(chat_id)
+        task = self._last.get(chat_id)
+        if task is not None:
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def flush_all(self) -> None:
+        """Deliver every buffered album now and wait for delivery (used on shutdown)."""
+        for timer in self._timers.values():
+            timer.cancel()
+        for grouped_id in list(self._albums):
+            self._flush(grouped_id)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
@@ -0,0 +1,96 @@
+import asyncio
+import logging
+import time
+from typing import NamedTuple
+
+from telethon import utils
+
+logger = logging.getLogger(__name__)
+
+
+class CachedEntity(NamedTuple):
+    peer: object  # InputPeerChannel / InputPeerChat / InputPeerUser
+    name: str
+    resolved_at: float
+
+
+class EntityCache:
+    """
+    Resolved InputPeer cache for every chat the bot talks to.
+
+    All sources and targets are resolved once at startup (preload), so the
+    send path only does a dict lookup. Entries older than `ttl` seconds are
+    still served but refreshed in the background. A miss never blocks: the
+    raw chat id is returned (Telethon resolves it from the session file) and
+    a background resolve fills the cache for next time.
+    """
+
+    def __init__(self, client, ttl: float):
+        self.client = client
+        self.ttl = ttl
+        self._entries = {}
+        self._refreshing = set()
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    async def preload(self, chat_ids) -> None:
+        """Resolve all given chats concurrently (startup pre-resolution)."""
+        chat_ids = set(chat_ids)
+        await asyncio.gather(*(self.resolve(chat_id) for chat_id in chat_ids))
+        logger.info(f"Entity cache: resolved {len(self._entries)}/{len(chat_ids)} chat(s)")
+
+    async def resolve(self, chat_id) -> CachedEntity:
+        """Fetch a chat from Telegram and store it. Network call — not for the hot path."""
+        try:
+            entity = await self.client.get_entity(chat_id)
+            entry = CachedEntity(
+                peer=utils.get_input_peer(entity),
+                name=getattr(entity, "title", getattr(entity, "username", "Unknown")),
+                resolved_at=time.monotonic(),
+            )
+            self._entries[chat_id] = entry
+            return entry
+        except Exception as e:
+            logger.warning(f"Entity cache: failed to resolve {chat_id}: {e}")
+            return None
+        finally:
+            self._refreshing.discard(chat_id)
+
+    def peer(self, chat_id):
+        """Return the cached InputPeer for `chat_id` without any network lookup."""
+        entry = self._entries.get(chat_id)
+        if entry is None:
+            self.misses += 1
+            self._refresh_in_background(chat_id)
+            return chat_id
+
+        self.hits += 1
+        if time.monotonic() - entry.resolved_at > self.ttl:
+            self._refresh_in_background(chat_id)
+        return entry.peer
+
+    def name(self, chat_id) -> str:
+        """Cached display name for logging ("Unknown" if not resolved yet)."""
+        entry = self._entries.get(chat_id)
+        return entry.name if entry else "Unknown"
+
+    def invalidate(self, chat_id) -> None:
+        """Drop a chat (e.g. after ChannelPrivateError) and re-resolve it in the background."""
+        self._entries.pop(chat_id, None)
+        self._refresh_in_background(chat_id)
+
+    def _refresh_in_background(self, chat_id) -> None:
+        if chat_id in self._refreshing:
+            return
+        self._refreshing.add(chat_id)
+        self.refreshes += 1
+        asyncio.get_running_loop().create_task(self.resolve(chat_id))
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+        }
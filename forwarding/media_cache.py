@@ -0,0 +1,74 @@
+import logging
+from collections import OrderedDict
+
+from telethon import utils
+from telethon.tl import types
+
+logger = logging.getLogger(__name__)
+
+
+def media_key(media):
+    """Cache key for a source message's media: ("photo"|"document", id), or None."""
+    if isinstance(media, types.MessageMediaPhoto) and isinstance(media.photo, types.Photo):
+        return ("photo", media.photo.id)
+    if isinstance(media, types.MessageMediaDocument) and isinstance(
+        media.document, types.Document
+    ):
+        return ("document", media.document.id)
+    return None
+
+
+class MediaCache:
+    """
+    LRU cache of source media id -> InputMediaPhoto / InputMediaDocument.
+
+    After media has been sent successfully once, the InputPhoto/InputDocument
+    of the sent copy is stored and reused for the remaining targets and for
+    later duplicates of the same file. A reference send is cheap and never
+    re-uploads. When Telegram rejects a reference (FileReferenceExpiredError),
+    the caller discards it and stores the fresh one from the next send.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    def get(self, key):
+        if key is None:
+            return None
+        media = self._entries.get(key)
+        if media is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return media
+
+    def remember(self, key, sent_message) -> None:
+        """Store the reference from a successfully sent message."""
+        media = getattr(sent_message, "media", None)
+        if key is None or media_key(media) is None:
+            return
+        self._entries[key] = utils.get_input_media(media)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def discard(self, key) -> None:
+        """Drop an expired reference so the next send stores a fresh one."""
+        if self._entries.pop(key, None) is not None:
+            self.refreshes += 1
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+        }
@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import time
+from typing import NamedTuple
+
+logger = logging.getLogger(__name__)
+
+
+class ForwardJob(NamedTuple):
+    """One message (or one album) going to one target."""
+
+    message: object
+    target: tuple  # forwarding.router.Target
+    idx: int
+    total: int
+    source_id: int
+    album: tuple = ()  # every item of an album, in order; empty for single messages
+    enqueued_at: float = 0.0
+
+    @property
+    def destination(self):
+        return tuple(self.target)
+
+
+class ForwardPipeline:
+    """
+    Bounded producer/consumer pipeline between the NewMessage handler and the
+    senders.
+
+    The handler only classifies a message and submits one job per target.
+    Each destination gets its own bounded FIFO lane. A destination with jobs
+    waiting is put on one shared ready queue, drained by a pool of `workers`
+    tasks; a worker sends the head job of a destination, then puts the
+    destination back at the end of the ready queue if it still has jobs. A
+    destination is served by at most one worker at a time, so its posts stay
+    in order, and a destination that is slow or paused by a FloodWait holds
+    only that one worker: the rest keep serving every other destination.
+
+    When a lane is full, submit() waits (backpressure) and the wait is
+    recorded in the metrics. Jobs are accepted from construction until
+    drain(): the message handler is live as soon as the client connects, and
+    anything submitted before start() is held until the workers come up.
+    """
+
+    def __init__(self, send, workers: int, maxsize: int):
+        self.send = send  # async callable taking a ForwardJob
+        self.workers = workers
+        self.maxsize = maxsize
+        self.lanes = {}  # destination -> asyncio.Queue of its pending jobs
+        self._ready = asyncio.Queue()  # destinations with jobs and no worker on them
+        self._scheduled = set()  # destinations on the ready queue or being sent
+        self._tasks = []
+        self.accepting = True
+
+        # Backpressure / throughput metrics
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.blocked_submits = 0
+        self.submit_wait_total = 0.0
+        self.queue_latency_total = 0.0
+        self.max_depth = 0
+
+    def start(self) -> None:
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"forward-worker-{n}")
+            for n in range(self.workers)
+        ]
+        logger.info(
+            f"Forward pipeline started: {self.workers} worker(s), "
+            f"queue size {self.maxsize or 'unbounded'} per destination"
+        )
+
+    async def submit(self, job: ForwardJob) -> None:
+        """Enqueue a job, waiting if its destination's lane is full."""
+        if not self.accepting:
+            logger.warning(f"   ⏭️ Pipeline is shutting down, dropping job for {job.destination}")
+            return
+
+        destination = job.destination
+        lane = self.lanes.get(destination)
+        if lane is None:
+            lane = self.lanes[destination] = asyncio.Queue(self.maxsize)
+
+        if lane.full():
+            self.blocked_submits += 1
+            logger.warning(
+                f"   ⚠️ Forward queue full ({lane.qsize()}) for {destination}, applying backpressure"
+            )
+            start = time.monotonic()
+            await lane.put(job._replace(enqueued_at=time.monotonic()))
+            self.submit_wait_total += time.monotonic() - start
+        else:
+            lane.put_nowait(job._replace(enqueued_at=time.monotonic()))
+
+        if destination not in self._scheduled:
+            self._scheduled.add(destination)
+            self._ready.put_nowait(destination)
+
+        self.submitted += 1
+        self.max_depth = max(self.max_depth, lane.qsize())
+
+    async def _worker(self) -> None:
+        while True:
+            destination = await self._ready.get()
+            lane = self.lanes[destination]
+            job = lane.get_nowait()
+            self.queue_latency_total += time.monotonic() - job.enqueued_at
+            try:
+                await self.send(job)
+                self.completed += 1
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"❌ Forward worker error for {destination}: {e}", exc_info=True)
+            finally:
+                # Back of the line, so busy destinations take turns with the rest
+                if lane.empty():
+                    self._scheduled.discard(destination)
+                else:
+                    self._ready.put_nowait(destination)
+                lane.task_done()
+
+    def depth(self) -> int:
+        return sum(lane.qsize() for lane in self.lanes.values())
+
+    async def drain(self, timeout: float) -> None:
+        """Stop accepting jobs, wait for queued jobs to finish, then stop the workers."""
+        self.accepting = False
+        logger.info(f"Draining forward pipeline ({self.depth()} job(s) queued)...")
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(lane.join() for lane in self.lanes.values())), timeout
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Forward pipeline drain timed out, {self.depth()} job(s) dropped")
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        logger.info(f"Forward pipeline stopped: {self.stats()}")
+
+    def stats(self) -> dict:
+        done = self.completed + self.failed
+        return {
+            "depth": self.depth(),
+            "destinations": len(self.lanes),
+            "max_depth": self.max_depth,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "blocked_submits": self.blocked_submits,
+            "submit_wait_total": round(self.submit_wait_total, 3),
+            "avg_queue_latency": round(self.queue_latency_total / done, 4) if done else 0.0,
+        }
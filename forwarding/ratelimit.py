@@ -0,0 +1,102 @@
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Classic token bucket: holds up to `capacity` tokens, refilled at `rate`
+    tokens per second. Callers reserve a token and get back how long they must
+    wait for it, so concurrent callers are served in the order they asked.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, now: float) -> float:
+        """Take one token and return the seconds to wait before using it."""
+        self._refill(now)
+        self.tokens -= 1
+        if self.tokens >= 0 or self.rate <= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+    def pause_remaining(self, now: float) -> float:
+        return max(0.0, self.paused_until - now)
+
+
+class RateLimiter:
+    """
+    Per-destination rate limiting with a shared account-wide budget.
+
+    Every target chat gets its own TokenBucket, and every send also draws one
+    token from the global bucket so the account as a whole stays within
+    Telegram's limits. A FloodWaitError for one chat pauses only that chat's
+    bucket; other targets keep sending.
+    """
+
+    def __init__(
+        self,
+        per_chat_rate: float,
+        per_chat_burst: float,
+        global_rate: float,
+        global_burst: float,
+    ):
+        self.per_chat_rate = per_chat_rate
+        self.per_chat_burst = per_chat_burst
+        self.global_bucket = TokenBucket(global_rate, global_burst)
+        self.buckets = {}
+        self.flood_waits = 0  # FloodWaitErrors reported via pause()
+
+    def _bucket(self, chat_id) -> TokenBucket:
+        bucket = self.buckets.get(chat_id)
+        if bucket is None:
+            bucket = self.buckets[chat_id] = TokenBucket(
+                self.per_chat_rate, self.per_chat_burst
+            )
+        return bucket
+
+    async def acquire(self, chat_id) -> None:
+        """Wait until a message may be sent to `chat_id`."""
+        bucket = self._bucket(chat_id)
+
+        # Honour any FloodWait pause first so a paused chat doesn't hold
+        # global tokens while it waits.
+        while (delay := bucket.pause_remaining(time.monotonic())) > 0:
+            await asyncio.sleep(delay)
+
+        wait = bucket.reserve(time.monotonic())
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+        wait = self.global_bucket.reserve(time.monotonic())
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def pause(self, chat_id, seconds: float) -> None:
+        """Stop sending to `chat_id` for `seconds` (e.g. after a FloodWaitError)."""
+        bucket = self._bucket(chat_id)
+        bucket.paused_until = max(bucket.paused_until, time.monotonic() + seconds)
+        self.flood_waits += 1
+        logger.warning(f"   ⏸️ FloodWait: pausing sends to {chat_id} for {seconds}s")
+
+    def is_paused(self, chat_id) -> bool:
+        bucket = self.buckets.get(chat_id)
+        return bool(bucket and bucket.pause_remaining(time.monotonic()) > 0)
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            "flood_waits": self.flood_waits,
+            "paused_chats": sum(1 for b in self.buckets.values() if b.pause_remaining(now) > 0),
+        }
@@ -0,0 +1,116 @@
+import asyncio
+import logging
+import tempfile
+import time
+
+from telethon.tl import types
+
+logger = logging.getLogger(__name__)
+
+
+class _DownloadStream:
+    """
+    Read-only file object whose async read() pulls chunks straight from
+    client.iter_download(). Telethon's upload_file awaits read() for each part,
+    so bytes flow from download into upload without touching disk and with
+    only about one chunk buffered at a time.
+    """
+
+    def __init__(self, chunks, name: str):
+        self._chunks = chunks.__aiter__()
+        self._buffer = bytearray()
+        self.name = name
+
+    async def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buffer) < size:
+            try:
+                self._buffer += await self._chunks.__anext__()
+            except StopAsyncIteration:
+                break
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+
+class MediaRelay:
+    """
+    Download-once / upload-once relay for media from protected chats.
+
+    Protected chats can't be copied by reference, so their media has to be
+    re-uploaded. The first target that needs a message's media starts the
+    relay. Every other target of the same message awaits the same result and
+    reuses the uploaded handle, so the file is downloaded and uploaded once no
+    matter how many targets there are.
+
+    Documents with a known size are streamed chunk by chunk from download
+    into upload. Photos, or files without a size, are buffered in a
+    SpooledTemporaryFile that stays in memory up to `memory_limit` bytes.
+    """
+
+    def __init__(self, client, memory_limit: int, ttl: float):
+        self.client = client
+        self.memory_limit = memory_limit
+        self.ttl = ttl  # uploaded handles expire server-side after < 1 day
+        self._relays = {}  # (chat_id, message_id) -> (task, started_at)
+        self.downloads = 0
+        self.reuses = 0
+
+    async def get(self, message):
+        """Return an InputMedia with the message's media uploaded, or None on failure."""
+        self._evict_expired()
+        key = (message.chat_id, message.id)
+        entry = self._relays.get(key)
+        if entry is None:
+            self.downloads += 1
+            task = asyncio.create_task(self._relay(message))
+            self._relays[key] = (task, time.monotonic())
+        else:
+            self.reuses += 1
+            task = entry[0]
+
+        try:
+            return await asyncio.shield(task)
+        except Exception as e:
+            logger.error(f"   ❌ Failed to relay media: {e}")
+            self._relays.pop(key, None)
+            return None
+
+    async def _relay(self, message):
+        file = message.file
+        name = (file.name if file else None) or f"media{(file.ext if file else '') or ''}"
+        document = message.document
+
+        if document is not None and file and file.size:
+            logger.info(f"   ⬇️⬆️ Streaming {file.size} bytes from protected chat")
+            stream = _DownloadStream(self.client.iter_download(document), name)
+            handle = await self.client.upload_file(stream, file_size=file.size, file_name=name)
+            return types.InputMediaUploadedDocument(
+                file=handle,
+                mime_type=document.mime_type,
+                attributes=document.attributes,
+            )
+
+        # Photos (or unknown size): download once into a spooled buffer that
+        # only spills to disk past memory_limit
+        with tempfile.SpooledTemporaryFile(max_size=self.memory_limit) as buffer:
+            if not await self.client.download_media(message, file=buffer):
+                raise ValueError("nothing was downloaded")
+            logger.info(f"   ⬇️ Downloaded {buffer.tell()} bytes from protected chat")
+            buffer.seek(0)
+            handle = await self.client.upload_file(buffer, file_name=name)
+
+        if message.photo is not None:
+            return types.InputMediaUploadedPhoto(file=handle)
+        return types.InputMediaUploadedDocument(
+            file=handle,
+            mime_type=(file.mime_type if file else None) or "application/octet-stream",
+            attributes=[types.DocumentAttributeFilename(name)],
+        )
+
+    def _evict_expired(self) -> None:
+        now = time.monotonic()
+        for key, (task, started_at) in list(self._relays.items()):
+            if task.done() and now - started_at > self.ttl:
+                del self._relays[key]
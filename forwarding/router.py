@@ -0,0 +1,94 @@
+from typing import NamedTuple, Optional
+
+
+class Target(NamedTuple):
+    """An immutable forwarding destination."""
+
+    target_id: int
+    target_topic_id: Optional[int] = None
+
+
+def marked_source_id(message) -> Optional[int]:
+    """Marked (-100...) channel id of the chat a message came from, or None."""
+    channel_id = getattr(message.peer_id, "channel_id", None)
+    if not channel_id:
+        return None
+    # Make it negative (Telegram convention)
+    return -1000000000000 - channel_id if channel_id > 0 else channel_id
+
+
+class Router:
+    """
+    Routing table compiled once from FORWARD_MAPPINGS.
+
+    Layout: {source_id: (group_targets, {topic_id: topic_targets})} where every
+    target list is a precomputed tuple of Target. Resolving a message is an
+    int-keyed dict probe or two, with no string formatting per message.
+    """
+
+    def __init__(self, mappings: list):
+        self.mappings = mappings
+        self._table = self._compile(mappings)
+
+    @staticmethod
+    def _compile(mappings: list) -> dict:
+        groups = {}
+        topics = {}
+        for mapping in mappings:
+            source_id = mapping["source_id"]
+            source_topic_id = mapping.get("source_topic_id")
+            target = Target(mapping["target_id"], mapping.get("target_topic_id"))
+
+            if source_topic_id:
+                topics.setdefault(source_id, {}).setdefault(source_topic_id, []).append(target)
+            else:
+                groups.setdefault(source_id, []).append(target)
+
+        return {
+            source_id: (
+                tuple(groups.get(source_id, ())),
+                {
+                    topic_id: tuple(targets)
+                    for topic_id, targets in topics.get(source_id, {}).items()
+                },
+            )
+            for source_id in groups.keys() | topics.keys()
+        }
+
+    @property
+    def source_ids(self) -> set:
+        return set(self._table)
+
+    def resolve(self, source_id, topic_id=None) -> tuple:
+        """Targets for a (source, topic) pair, falling back to the group-level targets."""
+        entry = self._table.get(source_id)
+        if entry is None:
+            return ()
+        group_targets, topics = entry
+        if topic_id:
+            return topics.get(topic_id, group_targets)
+        return group_targets
+
+    def targets_for_message(self, message) -> tuple:
+        """Get all target destinations for a given message.
+
+        Telegram forum topics use three different structures depending on the message:
+          1. Root/first message of a topic: reply_to is None, but message.id == topic_id
+          2. Direct reply to topic root: reply_to.reply_to_msg_id == topic_id,
+             reply_to_top_id is None (or same as reply_to_msg_id)
+          3. Nested reply inside a topic: reply_to.reply_to_top_id == topic_id
+        """
+        source_id = marked_source_id(message)
+        if not source_id:
+            return ()
+
+        reply = message.reply_to
+        if reply is None:
+            # Case 1: the root message's id is the topic id
+            return self.resolve(source_id, message.id)
+        # Case 3: nested reply — reply_to_top_id points to the topic root
+        # Case 2: direct reply to topic root — only reply_to_msg_id is set
+        topic_id = getattr(reply, "reply_to_top_id", None) or getattr(
+            reply, "reply_to_msg_id", None
+        )
+        return self.resolve(source_id, topic_id)
@@ -0,0 +1,123 @@
+import asyncio
+import json
+import logging
+import os
+from typing import NamedTuple
+
+from .schedule import ScheduleGate
+
+logger = logging.getLogger(__name__)
+
+# PyYAML is optional: JSON files work without it
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+
+class RoutingConfig(NamedTuple):
+    """Everything that decides where (and when) messages get forwarded."""
+
+    mappings: list
+    schedules: list
+    contact_filter_sources: frozenset
+
+
+def _validate(cfg: RoutingConfig) -> None:
+    for mapping in cfg.mappings:
+        if not isinstance(mapping.get("source_id"), int) or not isinstance(
+            mapping.get("target_id"), int
+        ):
+            raise ValueError(f"Mapping needs integer source_id and target_id: {mapping}")
+    for rule in cfg.schedules:
+        if "source_id" not in rule or "target_id" not in rule or "days" not in rule:
+            raise ValueError(f"Schedule rule needs source_id, target_id and days: {rule}")
+    try:
+        ScheduleGate(cfg.schedules)
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid schedule rule: {e!r}") from e
+
+
+def load_routing_config(path: str, defaults: RoutingConfig) -> RoutingConfig:
+    """
+    Load forwarding config from a JSON or YAML file.
+
+    Recognised keys: forward_mappings, scheduled_forwarding and
+    contact_filter_sources. A missing key keeps its value from `defaults`
+    (the literals in config.py). If the file doesn't exist, `defaults` is
+    returned unchanged. Raises ValueError if the file is malformed.
+    """
+    if not os.path.exists(path):
+        return defaults
+
+    with open(path, encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            if yaml is None:
+                raise ValueError(f"{path} is YAML but PyYAML is not installed")
+            data = yaml.safe_load(f) or {}
+        else:
+            data = json.load(f)
+
+    if not isinstance(data, dict):
+        raise ValueError(f"{path} must contain a mapping at the top level")
+
+    cfg = RoutingConfig(
+        mappings=list(data.get("forward_mappings", defaults.mappings)),
+        schedules=list(data.get("scheduled_forwarding", defaults.schedules)),
+        contact_filter_sources=frozenset(
+            data.get("contact_filter_sources", defaults.contact_filter_sources)
+        ),
+    )
+    _validate(cfg)
+    return cfg
+
+
+class ConfigWatcher:
+    """
+    Polls the config file and calls `on_change(cfg)` whenever it changes.
+
+    Polling the file's mtime/size is cheap and works on every platform and
+    volume type (including Fly.io mounts) without extra dependencies. A file
+    that fails to parse is logged and ignored, so the running config stays.
+    """
+
+    def __init__(self, path: str, interval: float, defaults: RoutingConfig, on_change):
+        self.path = path
+        self.interval = interval
+        self.defaults = defaults
+        self.on_change = on_change  # async callable taking a RoutingConfig
+        self._signature = self._stat()
+        self.reloads = 0
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+            return (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            return None
+
+    async def check(self) -> bool:
+        """Reload if the file changed since the last check. Returns True on reload."""
+        signature = self._stat()
+        if signature == self._signature:
+            return False
+        self._signature = signature
+
+        try:
+            cfg = load_routing_config(self.path, self.defaults)
+        except Exception as e:
+            logger.error(f"❌ Ignoring invalid forwarding config {self.path}: {e}")
+            return False
+
+        await self.on_change(cfg)
+        self.reloads += 1
+        return True
+
+    async def run(self) -> None:
+        logger.info(f"Watching {self.path} for forwarding config changes")
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check()
+            except Exception as e:
+                logger.error(f"❌ Forwarding config reload failed: {e}", exc_info=True)
@@ -0,0 +1,120 @@
+import logging
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+logger = logging.getLogger(__name__)
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+
+def _parse_hhmm(value: str) -> int:
+    """'17:30' -> minutes since midnight. '24:00' is allowed as end of day."""
+    hours, minutes = map(int, value.split(":"))
+    if not (0 <= hours <= 24 and 0 <= minutes < 60) or hours * 60 + minutes > MINUTES_PER_DAY:
+        raise ValueError(f"invalid time {value!r}")
+    return hours * 60 + minutes
+
+
+def _set_range(bits: bytearray, start: int, end: int) -> None:
+    """Set minute slots [start, end) of the week, wrapping past Sunday midnight."""
+    for slot in range(start, end):
+        slot %= MINUTES_PER_WEEK
+        bits[slot >> 3] |= 1 << (slot & 7)
+
+
+def compile_rule(rule: dict) -> bytearray:
+    """
+    Compile one schedule rule into a weekly bitmap of 7 x 1440 minute slots.
+
+    Supported rule fields (see SCHEDULED_FORWARDING in config.py):
+      days      : weekdays the rule applies to (0 = Monday ... 6 = Sunday)
+      all_day   : whole day on those weekdays
+      start_time / end_time : one "HH:MM" window
+      windows   : list of {"start": "HH:MM", "end": "HH:MM"} for several windows
+    A window whose end is before its start runs overnight into the next day
+    (e.g. Friday 22:00-02:00 also covers Saturday 00:00-02:00).
+    """
+    bits = bytearray(MINUTES_PER_WEEK // 8)
+    if rule.get("all_day", False):
+        windows = [(0, MINUTES_PER_DAY)]
+    elif "windows" in rule:
+        windows = [(_parse_hhmm(w["start"]), _parse_hhmm(w["end"])) for w in rule["windows"]]
+    else:
+        windows = [(_parse_hhmm(rule["start_time"]), _parse_hhmm(rule["end_time"]))]
+
+    for day in rule["days"]:
+        if not 0 <= day <= 6:
+            raise ValueError(f"invalid weekday {day!r}")
+        day_start = day * MINUTES_PER_DAY
+        for start, end in windows:
+            if end < start:
+                end += MINUTES_PER_DAY  # overnight window
+            _set_range(bits, day_start + start, day_start + end)
+    return bits
+
+
+class ScheduleClock:
+    """
+    The current time, read once per message and converted into a minute-of-week
+    slot once per timezone. Every schedule check for that message then reuses it.
+    """
+
+    __slots__ = ("now", "_slots")
+
+    def __init__(self, now: datetime = None):
+        self.now = now or datetime.now(timezone.utc)
+        self._slots = {}
+
+    def slot(self, tz) -> int:
+        """Minute-of-week in `tz` (None = the machine's local time)."""
+        slot = self._slots.get(tz)
+        if slot is None:
+            local = self.now.astimezone(tz)
+            slot = self._slots[tz] = (
+                local.weekday() * MINUTES_PER_DAY + local.hour * 60 + local.minute
+            )
+        return slot
+
+
+class ScheduleGate:
+    """
+    Precompiled SCHEDULED_FORWARDING rules.
+
+    Each (source_id, target_id) pair maps to one weekly bitmap per timezone
+    (rules in the same timezone are OR-ed together), so checking a pair is a
+    bit test against the per-message ScheduleClock. Pairs without rules are
+    always allowed.
+    """
+
+    def __init__(self, rules: list):
+        self._pairs = {}
+        for rule in rules:
+            tz = ZoneInfo(rule["timezone"]) if rule.get("timezone") else None
+            pair = (rule["source_id"], rule["target_id"])
+            bitmaps = self._pairs.setdefault(pair, {})
+            bits = compile_rule(rule)
+            if tz in bitmaps:
+                bits = bytearray(a | b for a, b in zip(bitmaps[tz], bits))
+            bitmaps[tz] = bits
+
+        # Freeze into tuples for the hot path
+        self._pairs = {
+            pair: tuple((tz, bytes(bits)) for tz, bits in bitmaps.items())
+            for pair, bitmaps in self._pairs.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self._pairs)
+
+    def allowed(self, source_id: int, target_id: int, clock: ScheduleClock) -> bool:
+        """Return True if a source→target pair is allowed to forward at `clock`."""
+        bitmaps = self._pairs.get((source_id, target_id))
+        if bitmaps is None:
+            return True  # no restriction configured
+
+        for tz, bits in bitmaps:
+            slot = clock.slot(tz)
+            if bits[slot >> 3] >> (slot & 7) & 1:
+                return True
+        return False
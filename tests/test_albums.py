@@ -0,0 +1,87 @@
+import unittest
+import asyncio
+import sys
+import os
+from types import SimpleNamespace
+
+# Ensure the root path is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from forwarding.albums import AlbumAggregator
+
+def item(msg_id, grouped_id, chat_id=-100):
+    return SimpleNamespace(id=msg_id, grouped_id=grouped_id, chat_id=chat_id)
+
+class TestAlbumAggregator(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.delivered = []
+
+        async def on_album(messages):
+            self.delivered.append([m.id for m in messages])
+
+        self.aggregator = AlbumAggregator(window=0.05, on_album=on_album)
+
+    async def test_items_are_batched_in_order(self):
+        for msg_id in (12, 10, 11):
+            self.aggregator.add(item(msg_id, grouped_id=1))
+        self.aggregator.add(item(20, grouped_id=2, chat_id=-200))
+        self.assertEqual(self.delivered, [])
+
+        await asyncio.sleep(0.1)
+        self.assertCountEqual(self.delivered, [[10, 11, 12], [20]])
+        self.assertEqual(self.aggregator.albums_flushed, 2)
+
+    async def test_window_restarts_on_each_item(self):
+        self.aggregator.add(item(1, grouped_id=1))
+        await asyncio.sleep(0.03)
+        self.aggregator.add(item(2, grouped_id=1))
+        await asyncio.sleep(0.03)
+        self.assertEqual(self.delivered, [])
+        await asyncio.sleep(0.05)
+        self.assertEqual(self.delivered, [[1, 2]])
+
+    async def test_full_album_flushes_immediately(self):
+        for msg_id in range(10):
+            self.aggregator.add(item(msg_id, grouped_id=1))
+        await asyncio.sleep(0)
+        self.assertEqual(self.delivered, [list(range(10))])
+
+    async def test_later_message_waits_for_buffered_album(self):
+        async def slow_album(messages):
+            await asyncio.sleep(0.02)
+            self.delivered.append([m.id for m in messages])
+
+        self.aggregator.on_album = slow_album
+        self.aggregator.add(item(1, grouped_id=1))
+        self.aggregator.add(item(2, grouped_id=1))
+        self.aggregator.add(item(5, grouped_id=3, chat_id=-200))
+
+        # A text from the album's chat is handed on only after the album
+        await self.aggregator.flush_chat(-100)
+        self.delivered.append([3])
+        self.assertEqual(self.delivered, [[1, 2], [3]])
+
+        # Another chat's album is still buffered
+        await asyncio.sleep(0.1)
+        self.assertEqual(self.delivered, [[1, 2], [3], [5]])
+
+    async def test_next_album_of_a_chat_follows_the_previous_one(self):
+        async def slow_first(messages):
+            if messages[0].id == 1:
+                await asyncio.sleep(0.03)
+            self.delivered.append([m.id for m in messages])
+
+        self.aggregator.on_album = slow_first
+        self.aggregator.add(item(1, grouped_id=1))
+        self.aggregator.add(item(2, grouped_id=2))
+        self.assertEqual(self.aggregator.albums_flushed, 1)
+        await self.aggregator.flush_all()
+        self.assertEqual(self.delivered, [[1], [2]])
+
+    async def test_flush_all(self):
+        self.aggregator.add(item(1, grouped_id=1))
+        await self.aggregator.flush_all()
+        self.assertEqual(self.delivered, [[1]])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import sys
+import unittest
+
+# Ensure the root path is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from auto_trader.assets import AssetCatalog, normalize_asset
+from auto_trader.executor import TradeExecutor
+
+ACTIVES = {"EURUSD": 1, "EURJPY-OTC": 80, "USDMXN-OTC": 1548, "XAUUSD": 74}
+OPEN_TIMES = {
+    "turbo": {"EURUSD": {"open": False}, "EURJPY-OTC": {"open": True}},
+    "binary": {"EURUSD": {"open": True}},
+}
+PROFITS = {"EURJPY-OTC": {"turbo": 0.87, "binary": 0.82}}
+
+
+class TestNormalizeAsset(unittest.TestCase):
+    def test_spellings(self):
+        for spelling in ("EURJPY-OTC", "EUR/JPY OTC", "otc eurjpy", "eur-jpy (OTC)"):
+            self.assertEqual(normalize_asset(spelling), "EURJPY-OTC")
+        self.assertEqual(normalize_asset("eur/usd"), "EURUSD")
+
+
+class TestAssetCatalog(unittest.TestCase):
+    def setUp(self):
+        self.catalog = AssetCatalog(ACTIVES, OPEN_TIMES, PROFITS, {"GOLD": "XAUUSD"})
+
+    def test_resolve(self):
+        self.assertEqual(self.catalog.resolve("EUR/JPY OTC").name, "EURJPY-OTC")
+        self.assertEqual(self.catalog.resolve("EURJPY-OTC").active_id, 80)
+        self.assertEqual(self.catalog.resolve("gold").name, "XAUUSD")
+        self.assertIsNone(self.catalog.resolve("CADCHF-OTC"))
+        self.assertNotIn("EURJPY", self.catalog)  # OTC and regular pairs stay distinct
+
+    def test_open_status_and_payout(self):
+        eurusd = self.catalog.resolve("EURUSD")
+        self.assertFalse(eurusd.is_open(1))     # turbo closed
+        self.assertTrue(eurusd.is_open(15))     # binary open
+        otc = self.catalog.resolve("EURJPY-OTC")
+        self.assertEqual(otc.payout_for(1), 0.87)
+        self.assertEqual(otc.payout_for(15), 0.82)
+        self.assertIsNone(self.catalog.resolve("USDMXN-OTC").is_open(1))  # unknown
+
+    def test_counts(self):
+        self.assertEqual(len(self.catalog), 4)
+        self.assertEqual(self.catalog.otc_count, 2)
+
+    def test_missing_reported_once(self):
+        with self.assertLogs("auto_trader.assets", level="WARNING") as logs:
+            self.catalog.report_missing("CADCHF-OTC")
+            self.catalog.report_missing("CADCHF-OTC")
+            self.catalog.report_missing("AUDNZD-OTC")
+        self.assertEqual(len(logs.records), 2)
+
+
+class ConnectedApi:
+    def check_connect(self):
+        return True
+
+
+class TestPrepareTrade(unittest.TestCase):
+    def setUp(self):
+        self.executor = TradeExecutor()
+        self.executor.api = ConnectedApi()
+        self.executor.is_connected = True
+        self.executor.catalog = AssetCatalog(ACTIVES, OPEN_TIMES, PROFITS)
+
+    def test_order_uses_broker_name(self):
+        signal = {"asset": "EUR/JPY OTC", "direction": "CALL", "expiry": 1}
+        prepared = self.executor.prepare_trade(signal)
+        self.assertTrue(prepared["success"])
+        self.assertEqual(prepared["order"][1:], ("EURJPY-OTC", "call", 1))
+
+    def test_closed_and_unlisted(self):
+        closed = self.executor.prepare_trade({"asset": "EURUSD", "direction": "PUT", "expiry": 1})
+        self.assertIn("closed", closed["error"])
+        missing = self.executor.prepare_trade({"asset": "CADCHF-OTC", "direction": "PUT", "expiry": 1})
+        self.assertFalse(missing["success"])
+
+
+if __name__ == '__main__':
+    unittest.main()
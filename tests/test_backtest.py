@@ -0,0 +1,114 @@
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+# Ensure the root path is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from auto_trader.backtest import Backtester, PriceBook, PriceSeries, SignalRecord
+from auto_trader.timing import seconds_until_signal_minute
+
+START = datetime(2026, 4, 9, 12, 0, 0)
+
+
+def rising_book(asset="EURUSD", minutes=120, step=0.001):
+    """One price per second that rises steadily."""
+    base = START.timestamp()
+    points = [(base + s, 1.0 + step * s) for s in range(minutes * 60)]
+    return PriceBook({asset: PriceSeries(points)})
+
+
+def signal(at_minute, text, second=0, source_id=-100):
+    return SignalRecord(START + timedelta(minutes=at_minute, seconds=second), text, source_id)
+
+
+class TestPriceSeries(unittest.TestCase):
+    def test_price_at(self):
+        series = PriceSeries([(30.0, 3.0), (10.0, 1.0), (20.0, 2.0)])
+        self.assertIsNone(series.price_at(5.0))
+        self.assertEqual(series.price_at(10.0), 1.0)
+        self.assertEqual(series.price_at(29.9), 2.0)
+        self.assertEqual(series.price_at(1000.0, max_age=10_000), 3.0)
+        self.assertIsNone(series.price_at(1000.0, max_age=60))
+
+    def test_from_csv_and_otc_fallback(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "prices.csv")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("timestamp,asset,price\n")
+                f.write("100,eurusd,1.1\n")
+                f.write("2026-04-09T12:00:00,EURUSD,1.2\n")
+            book = PriceBook.from_csv(path)
+        self.assertEqual(book.price_at("EURUSD-OTC", 100.0), 1.1)
+        self.assertEqual(book.price_at("EURUSD", START.timestamp()), 1.2)
+
+
+class TestTiming(unittest.TestCase):
+    def test_simulated_now(self):
+        now = START.replace(minute=15, second=20)
+        self.assertEqual(seconds_until_signal_minute(16, now), 40.0)
+        self.assertEqual(seconds_until_signal_minute(15, now), 0.0)
+        self.assertLess(seconds_until_signal_minute(14, now), 0)
+
+
+class TestBacktester(unittest.TestCase):
+    def test_win_loss_and_timing(self):
+        backtester = Backtester(rising_book(), stake=1.0, payout=0.8, max_wait=120)
+        results = backtester.run([
+            signal(0, "EURUSD CALL 1m 12:01", second=30),   # waits 30s, rising -> win
+            signal(10, "EURUSD PUT 5m"),                    # no time, executes now -> loss
+            signal(20, "EURUSD CALL 1m 12:25"),             # 5 minutes away -> skipped
+            signal(30, "EURUSD CALL 1m 12:29"),             # minute passed -> skipped
+            signal(40, "hello there"),
+        ])
+        stats = results[-100].statuses
+        self.assertEqual(stats["WIN"], 1)
+        self.assertEqual(stats["LOSS"], 1)
+        self.assertEqual(stats["SKIPPED_TIMING"], 1)
+        self.assertEqual(stats["SKIPPED_EXPIRED"], 1)
+        self.assertEqual(stats["INVALID_FORMAT"], 1)
+        self.assertAlmostEqual(results[-100].pnl, -0.2)
+        self.assertEqual(results[-100].win_rate, 0.5)
+
+    def test_duplicate_cooldown_uses_simulated_clock(self):
+        backtester = Backtester(rising_book(), max_wait=120)
+        results = backtester.run([
+            signal(0, "EURUSD CALL 1m"),
+            signal(2, "EURUSD CALL 1m"),     # inside the 5 minute cooldown
+            signal(10, "EURUSD CALL 1m"),
+        ])
+        self.assertEqual(results[-100].statuses["WIN"], 2)
+        self.assertEqual(results[-100].statuses["VALIDATION_FAILED"], 1)
+
+    def test_waiting_signal_is_validated_at_its_minute(self):
+        # The same message forwarded by two sources while it waits for 12:02 is
+        # one signal: the first copy enters at its minute, the second is the
+        # duplicate. An unrelated PUT in the meantime is not held up.
+        backtester = Backtester(rising_book(), max_wait=120)
+        results = backtester.run([
+            signal(0, "EURUSD CALL 1m 12:02", second=10, source_id=-1),
+            signal(1, "EURUSD PUT 1m", second=0, source_id=-3),
+            signal(1, "EURUSD CALL 1m 12:02", second=5, source_id=-2),
+        ])
+        self.assertEqual(results[-1].statuses["WIN"], 1)
+        self.assertEqual(results[-2].statuses["VALIDATION_FAILED"], 1)
+        self.assertEqual(results[-3].statuses["LOSS"], 1)
+
+    def test_no_price(self):
+        results = Backtester(rising_book(), max_wait=120).run([signal(0, "GBPJPY CALL 1m")])
+        self.assertEqual(results[-100].statuses["NO_PRICE"], 1)
+
+    def test_provider_grammar(self):
+        backtester = Backtester(rising_book(), assignments={-7: "emoji_card"}, max_wait=120)
+        results = backtester.run([
+            signal(0, "📊 EURUSD ⏰ 12:00 ⌛️ 1 Minute 🔼 CALL", source_id=-7),
+            signal(1, "good morning", source_id=-7),
+        ])
+        self.assertEqual(results[-7].statuses["WIN"], 1)
+        self.assertEqual(results[-7].statuses["REJECTED"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
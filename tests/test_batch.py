@@ -0,0 +1,100 @@
+import csv
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+# Ensure the root path is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from auto_trader.batch import main, parse_batch, iter_csv_signals, iter_export_messages
+from auto_trader.parser import SignalParser
+
+MESSAGES = [
+    "📊 EURJPY-OTC ⏰ 08:16 ⌛️ 1 Minute 🔼 CALL BUY 🟢",
+    "Asset: GBPUSD\nDirection: DOWN\nExpiry: M5",
+    "Just some normal chat without signal details",
+    "EURUSD - 5m - CALL",
+] * 25
+
+
+class TestParseBatch(unittest.TestCase):
+    def test_in_process_matches_parser(self):
+        parser = SignalParser()
+        results = list(parse_batch(MESSAGES, workers=0, chunk_size=7))
+        self.assertEqual(results, [parser.parse(text) for text in MESSAGES])
+
+    def test_process_pool_keeps_order(self):
+        results = list(parse_batch(MESSAGES, workers=2, chunk_size=9, max_in_flight=2))
+        self.assertEqual([r["raw_text"] for r in results], MESSAGES)
+        self.assertEqual(sum(r["is_valid"] for r in results), 75)
+
+    def test_source_grammars(self):
+        items = [(-1, MESSAGES[0]), (-1, "good morning"), (-2, MESSAGES[3])]
+        results = list(parse_batch(items, workers=0, assignments={-1: "emoji_card"}))
+        self.assertEqual(results[0]["asset"], "EURJPY-OTC")
+        self.assertIsNone(results[1])  # rejected by the emoji_card prefilter
+        self.assertEqual(results[2]["asset"], "EURUSD")
+
+    def test_out_has_a_row_per_message(self):
+        texts = (MESSAGES[0], "good morning", MESSAGES[0])
+        export = {"id": 1, "messages": [{"text": text} for text in texts]}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "result.json")
+            out = os.path.join(tmp, "parsed.csv")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(export, f)
+            main([path, "--source=-1001:emoji_card", "--workers", "0", "--out", out])
+            with open(out, newline="", encoding="utf-8") as f:
+                rows = list(csv.DictReader(f))
+        # The second message is rejected by the prefilter but keeps its row
+        self.assertEqual([r["message"] for r in rows], ["1", "2", "3"])
+        self.assertEqual([r["is_valid"] for r in rows], ["True", "False", "True"])
+        self.assertEqual(rows[1]["asset"], "")
+
+    def test_is_lazy(self):
+        def messages():
+            for n, text in enumerate(MESSAGES):
+                consumed.append(n)
+                yield text
+
+        consumed = []
+        batch = parse_batch(messages(), workers=0, chunk_size=10)
+        next(batch)
+        self.assertEqual(len(consumed), 10)
+        batch.close()
+
+
+class TestSources(unittest.TestCase):
+    def test_iter_csv_signals(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "trades.csv")
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(["timestamp", "asset", "raw_signal"])
+                writer.writerow(["2026-04-09 12:16:07", "EURJPY-OTC", MESSAGES[0]])
+                writer.writerow(["2026-04-09 12:20:00", "", ""])
+            self.assertEqual(list(iter_csv_signals(path)), [MESSAGES[0]])
+
+    def test_iter_export_messages(self):
+        export = {
+            "id": 3771929527,
+            "messages": [
+                {"id": 1, "text": MESSAGES[3]},
+                {"id": 2, "text": ["📊 ", {"type": "bold", "text": "EURJPY"}, " CALL"]},
+                {"id": 3, "text": ""},
+            ],
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "result.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(export, f)
+            self.assertEqual(
+                list(iter_export_messages(path)),
+                [(-1003771929527, MESSAGES[3]), (-1003771929527, "📊 EURJPY CALL")],
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
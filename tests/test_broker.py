@@ -0,0 +1,88 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import unittest
+
+# Ensure the root path is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from auto_trader.broker import BrokerWorker
+
+
+class RecordingExecutor:
+    """Stands in for TradeExecutor; fails if two calls ever overlap."""
+
+    def __init__(self):
+        self.calls = []
+        self.threads = set()
+        self._active = False
+
+    def place(self, n, delay=0.0):
+        assert not self._active, "concurrent broker call"
+        self._active = True
+        self.threads.add(threading.current_thread().name)
+        time.sleep(delay)
+        self.calls.append(n)
+        self._active = False
+        return n * 10
+
+
+class TestBrokerWorker(unittest.TestCase):
+    def setUp(self):
+        self.executor = RecordingExecutor()
+        self.broker = BrokerWorker(self.executor)
+
+    def tearDown(self):
+        self.broker.shutdown(wait=True)
+
+    def test_serialised_in_submission_order(self):
+        futures = [self.broker.submit(self.executor.place, n, 0.002) for n in range(20)]
+        self.assertEqual([f.result(timeout=5) for f in futures], [n * 10 for n in range(20)])
+        self.assertEqual(self.executor.calls, list(range(20)))
+        self.assertEqual(self.executor.threads, {"broker"})
+        self.assertEqual(self.broker.stats()["processed"], 20)
+
+    def test_exception_is_delivered_to_future(self):
+        def boom():
+            raise ValueError("nope")
+
+        with self.assertRaises(ValueError):
+            self.broker.submit(boom).result(timeout=5)
+        # The worker keeps serving afterwards
+        self.assertEqual(self.broker.submit(self.executor.place, 1).result(timeout=5), 10)
+        self.assertEqual(self.broker.stats()["failed"], 1)
+
+    def test_cancelled_request_is_skipped(self):
+        gate = threading.Event()
+        blocker = self.broker.submit(gate.wait)
+        queued = self.broker.submit(self.executor.place, 7)
+        self.assertTrue(queued.cancel())
+        gate.set()
+        blocker.result(timeout=5)
+        self.broker.submit(self.executor.place, 8).result(timeout=5)
+        self.assertEqual(self.executor.calls, [8])
+
+    def test_concurrent_async_callers(self):
+        async def main():
+            return await asyncio.gather(*(self.broker.run(self.executor.place, n) for n in range(5)))
+
+        self.assertEqual(asyncio.run(main()), [0, 10, 20, 30, 40])
+
+    def test_works_with_run_in_executor(self):
+        async def main():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.broker, self.executor.place, 3)
+
+        self.assertEqual(asyncio.run(main()), 30)
+
+    def test_shutdown(self):
+        self.broker.submit(self.executor.place, 1).result(timeout=5)
+        self.broker.shutdown(wait=True)
+        with self.assertRaises(RuntimeError):
+            self.broker.submit(self.executor.place, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+import sys
+import unittest
+
+# Ensure the root path is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from auto_trader.dedupe import DedupeIndex, signal_key
+from auto_trader.parser import SignalParser
+
+
+class TestSignalKey(unittest.TestCase):
+    def test_key_fields(self):
+        parser = SignalParser()
+        a = parser.parse("EURUSD CALL 1m 10:30")
+        b = parser.parse("eurusd   call 1m\n10:30")
+        c = parser.parse("EURUSD PUT 1m 10:30")
+        d = parser.parse("EURUSD CALL 1m 10:31")
+        self.assertEqual(signal_key(a), signal_key(b))
+        self.assertNotEqual(signal_key(a), signal_key(c))
+        self.assertNotEqual(signal_key(a), signal_key(d))
+        self.assertEqual(signal_key(a)[:3], ("EURUSD", "CALL", "10:30"))
+
+
+class TestDedupeIndex(unittest.TestCase):
+    def test_window_and_expiry(self):
+        index = DedupeIndex(ttl=10)
+        index.add("k", now=100)
+        self.assertTrue(index.seen_within("k", 5, now=104))
+        self.assertFalse(index.seen_within("k", 5, now=106))
+        self.assertIn("k", index)
+        self.assertFalse(index.seen_within("k", 60, now=110))  # evicted at ttl
+        self.assertNotIn("k", index)
+
+    def test_readd_extends_life(self):
+        index = DedupeIndex(ttl=10)
+        index.add("k", now=100)
+        index.add("k", now=108)
+        index.evict(now=112)                     # first sighting expired, second not
+        self.assertIn("k", index)
+        index.evict(now=118)
+        self.assertEqual(len(index), 0)
+
+    def test_memory_is_bounded_by_ttl(self):
+        index = DedupeIndex(ttl=lambda: 60)
+        for second in range(10_000):
+            index.add(("EURUSD", "CALL", None, second), now=float(second))
+        self.assertEqual(len(index), 60)
+        self.assertLessEqual(len(index._order), 61)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+# Ensure the root path is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from auto_trader import engine as engine_module
+from auto_trader.engine import AutoTraderEngine
+from auto_trader.store import TradeStore
+
+
+class FakeExecutor:
+    def __init__(self):
+        self.calls = []
+
+    def prepare_trade(self, parsed):
+        self.calls.append(("prepare", time.monotonic(), threading.current_thread().name))
+        return {"success": True, "order": (1.0, parsed["asset"], parsed["direction"].lower(), 1)}
+
+    def place_trade(self, order):
+        self.calls.append(("place", time.monotonic(), threading.current_thread().name))
+        return {"success": True, "trade_id": 42}
+
+
+class FakeTracker:
+    def __init__(self):
+        self.rows = []
+
+    def log_trade(self, parsed, result, status):
+        self.rows.append((parsed.get("asset"), status, result))
+
+
+class TestPreArmedExecution(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        with mock.patch.object(engine_module, "ENABLE_AUTO_TRADING", False):
+            self.engine = AutoTraderEngine()
+        self.engine.executor = FakeExecutor()
+        self.engine.tracker = FakeTracker()
+
+    async def asyncTearDown(self):
+        await self.engine.scheduler.close()
+        self.engine.broker.shutdown(wait=True)
+
+    async def test_immediate_signal(self):
+        await self.engine.process_signal("EURUSD CALL 1m")
+        self.assertEqual([c[0] for c in self.engine.executor.calls], ["prepare", "place"])
+        asset, status, result = self.engine.tracker.rows[0]
+        self.assertEqual((asset, status), ("EURUSD", "EXECUTED"))
+        self.assertIn("ack_ms", result)
+        self.assertEqual(self.engine.latency_stats()["trades"], 1)
+
+    async def test_prearms_before_the_minute(self):
+        start = time.monotonic()
+        with mock.patch.object(engine_module, "seconds_until_signal_minute", return_value=0.3), \
+                mock.patch.object(engine_module, "PREARM_LEAD_SECONDS", 0.2):
+            await self.engine.process_signal("EURUSD PUT 1m 10:30")
+
+        (prepare, prepared_at, prepare_thread), (place, placed_at, place_thread) = \
+            self.engine.executor.calls
+        self.assertLess(prepared_at - start, 0.25)      # armed ~0.1s in, before the minute
+        self.assertGreaterEqual(placed_at - start, 0.3)  # bought at the minute
+        self.assertEqual(prepare_thread, place_thread)
+        self.assertTrue(place_thread.startswith("broker"))
+        self.assertLess(self.engine.tracker.rows[0][2]["dispatch_ms"], 50)
+
+    async def test_prepare_failure_skips_buy(self):
+        self.engine.executor.prepare_trade = lambda parsed: {"success": False, "error": "down"}
+        await self.engine.process_signal("EURUSD CALL 1m")
+        self.assertEqual(self.engine.executor.calls, [])
+        self.assertEqual(self.engine.tracker.rows[0][1], "EXECUTION_FAILED")
+
+    async def test_unlisted_asset_requests_refresh_without_blocking(self):
+        self.engine.executor.place_trade = lambda order: {
+            "success": False, "error": "Asset lookup error", "stale_asset": order[1]}
+        with mock.patch.object(self.engine.refresher, "request") as request:
+            await self.engine.process_signal("EURUSD CALL 1m")
+        request.assert_called_once()
+        self.assertEqual(self.engine.in_flight, 0)
+
+    async def test_waiting_signal_does_not_hold_background_work(self):
+        self.assertIs(self.engine.results.busy.__func__, AutoTraderEngine.buy_imminent)
+        self.assertIs(self.engine.refresher.busy.__func__, AutoTraderEngine.buy_imminent)
+        with mock.patch.object(engine_module, "seconds_until_signal_minute", return_value=60):
+            waiting = asyncio.create_task(self.engine.process_signal("EURUSD PUT 1m 10:30"))
+            await asyncio.sleep(0.01)
+        self.assertEqual(self.engine.in_flight, 1)
+        self.assertFalse(self.engine.buy_imminent())   # a minute away: lookups may run
+
+        # A second, overlapping signal whose minute is about to start
+        with mock.patch.object(engine_module, "seconds_until_signal_minute", return_value=0.3), \
+                mock.patch.object(engine_module, "PREARM_LEAD_SECONDS", 0.2):
+            imminent = asyncio.create_task(self.engine.process_signal("GBPUSD CALL 1m 10:31"))
+            await asyncio.sleep(0.01)
+            self.assertTrue(self.engine.buy_imminent())
+            await imminent
+        self.assertFalse(self.engine.buy_imminent())
+        self.assertEqual(self.engine.in_flight, 1)
+
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+        self.assertEqual(self.engine.in_flight, 0)
+
+
+class TestRestoreValidator(unittest.TestCase):
+    def test_recent_trades_survive_restart(self):
+        with mock.patch.object(engine_module, "ENABLE_AUTO_TRADING", False):
+            engine = AutoTraderEngine()
+        with tempfile.TemporaryDirectory() as tmp:
+            engine.store = TradeStore(os.path.join(tmp, "trades.db"))
+            engine.store.insert_many([{
+                "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"), "asset": "EURUSD",
+                "direction": "CALL", "expiry": 1, "status": "EXECUTED", "trade_id": "1",
+                "raw_signal": "EURUSD CALL 1m", "source_id": -5,
+            }])
+            engine.store.update_outcome("1", "LOSS", -1.0)
+            engine._restore_validator()
+            engine.store.close()
+
+        self.assertEqual(engine.validator.current_daily_loss, 1.0)
+        repeat = engine.grammars.parse("EURUSD CALL 1m", -6)
+        self.assertFalse(engine.validator.validate(repeat))
+        other = engine.grammars.parse("EURUSD PUT 1m", -6)
+        self.assertTrue(engine.validator.validate(other))
+        engine.broker.shutdown(wait=True)
+
+if __name__ == '__main__':
+    unittest.main()
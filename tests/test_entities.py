@@ -0,0 +1,58 @@
+import unittest
+import asyncio
+import sys
+import os
+
+# Ensure the root path is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from telethon.tl.types import InputPeerChannel
+from forwarding.entities import EntityCache
+
+class StubClient:
+    def __init__(self):
+        self.lookups = 0
+
+    async def get_entity(self, chat_id):
+        self.lookups += 1
+        return InputPeerChannel(channel_id=-chat_id - 1000000000000, access_hash=42)
+
+class TestEntityCache(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.client = StubClient()
+        self.cache = EntityCache(self.client, ttl=3600)
+
+    async def test_preloaded_peer_is_a_hit(self):
+        await self.cache.preload([-1001234, -1005678])
+        lookups = self.client.lookups
+
+        peer = self.cache.peer(-1001234)
+        self.assertIsInstance(peer, InputPeerChannel)
+        self.assertEqual(peer.access_hash, 42)
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.client.lookups, lookups)
+
+    async def test_miss_returns_raw_id_and_resolves_in_background(self):
+        self.assertEqual(self.cache.peer(-1009999), -1009999)
+        self.assertEqual(self.cache.misses, 1)
+        await asyncio.sleep(0)
+        self.assertIsInstance(self.cache.peer(-1009999), InputPeerChannel)
+        self.assertEqual(self.cache.hits, 1)
+
+    async def test_invalidate_drops_entry(self):
+        await self.cache.preload([-1001234])
+        self.cache.invalidate(-1001234)
+        self.assertEqual(self.cache.peer(-1001234), -1001234)
+        await asyncio.sleep(0)
+        self.assertIsInstance(self.cache.peer(-1001234), InputPeerChannel)
+
+    async def test_stale_entry_is_served_and_refreshed(self):
+        await self.cache.preload([-1001234])
+        self.cache.ttl = 0
+        lookups = self.client.lookups
+        self.assertIsInstance(self.cache.peer(-1001234), InputPeerChannel)
+        await asyncio.sleep(0)
+        self.assertEqual(self.client.lookups, lookups + 1)
+
+if __name__ == '__main__':
+    unittest.main()
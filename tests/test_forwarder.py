@@ -0,0 +1,169 @@
+import unittest
+import asyncio
+import time
+import sys
+import os
+from datetime import datetime
+from types import SimpleNamespace
+
+# Ensure the root path is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from telethon.errors import FileReferenceExpiredError, FloodWaitError
+from telethon.tl import types
+from bot import SignalForwarder
+from forwarding.entities import CachedEntity
+from forwarding.media_cache import media_key
+from forwarding.pipeline import ForwardJob
+from forwarding.router import Target
+from forwarding.routing_config import RoutingConfig
+
+CHAT_A = -1001
+CHAT_B = -1002
+
+
+def photo_media(photo_id, file_reference=b"ref"):
+    photo = types.Photo(id=photo_id, access_hash=99, file_reference=file_reference,
+                        date=datetime(2026, 1, 1), sizes=[], dc_id=4)
+    return types.MessageMediaPhoto(photo=photo)
+
+
+def flood_wait(seconds):
+    error = FloodWaitError(request=None, capture=0)
+    error.seconds = seconds
+    return error
+
+
+class StubClient:
+    """Records every send; `errors[chat]` are raised, in order, by that chat's next sends."""
+
+    def __init__(self):
+        self.sends = []
+        self.errors = {}
+        self.expired_references = False  # reject every cached (InputMedia*) file
+
+    def _next_error(self, entity):
+        pending = self.errors.get(entity)
+        return pending.pop(0) if pending else None
+
+    async def send_message(self, entity, message, file=None, formatting_entities=None,
+                           link_preview=False, reply_to=None):
+        self.sends.append((entity, time.monotonic(), file))
+        error = self._next_error(entity)
+        if error is not None:
+            raise error
+        if self.expired_references and isinstance(file, types.InputMediaPhoto):
+            raise FileReferenceExpiredError(request=None)
+        return SimpleNamespace(media=photo_media(9000 + len(self.sends), b"fresh"))
+
+    async def send_file(self, entity, files, caption=None, formatting_entities=None,
+                        reply_to=None):
+        self.sends.append((entity, time.monotonic(), list(files)))
+        if self.expired_references and any(isinstance(f, types.InputMediaPhoto) for f in files):
+            raise FileReferenceExpiredError(request=None)
+        return [
+            SimpleNamespace(media=photo_media(9000 + len(self.sends) * 10 + n, b"fresh"))
+            for n in range(len(files))
+        ]
+
+
+def make_forwarder(client):
+    forwarder = SignalForwarder(client, RoutingConfig([], [], frozenset()))
+    for chat_id in (CHAT_A, CHAT_B):
+        forwarder.entities._entries[chat_id] = CachedEntity(chat_id, str(chat_id), time.monotonic())
+    return forwarder
+
+
+def job(message, chat_id):
+    return ForwardJob(message, Target(chat_id), 1, 1, -100)
+
+
+def album_job(album, chat_id):
+    return ForwardJob(album[0], Target(chat_id), 1, 1, -100, album)
+
+
+class TestFloodWaitBackoff(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.client = StubClient()
+        self.forwarder = make_forwarder(self.client)
+        self.message = SimpleNamespace(id=1, text="EURUSD CALL", media=None, entities=None)
+
+    async def test_flood_wait_retries_after_pause(self):
+        self.client.errors[CHAT_A] = [flood_wait(0.2)]
+        started = time.monotonic()
+        self.assertTrue(await self.forwarder.send_job(job(self.message, CHAT_A)))
+
+        sends = [t for chat, t, _ in self.client.sends if chat == CHAT_A]
+        self.assertEqual(len(sends), 2)
+        self.assertGreaterEqual(sends[1] - started, 0.2)
+        self.assertEqual(self.forwarder.rate_limiter.flood_waits, 1)
+
+    async def test_flood_wait_pauses_only_that_chat(self):
+        self.client.errors[CHAT_A] = [flood_wait(0.3)]
+        a = asyncio.create_task(self.forwarder.send_job(job(self.message, CHAT_A)))
+        await asyncio.sleep(0.05)
+        self.assertTrue(self.forwarder.rate_limiter.is_paused(CHAT_A))
+        self.assertFalse(self.forwarder.rate_limiter.is_paused(CHAT_B))
+
+        # The other chat is sent right away, while CHAT_A is still paused
+        b_started = time.monotonic()
+        self.assertTrue(await self.forwarder.send_job(job(self.message, CHAT_B)))
+        self.assertLess(time.monotonic() - b_started, 0.1)
+        self.assertFalse(a.done())
+
+        self.assertTrue(await a)
+        self.assertEqual([chat for chat, _, _ in self.client.sends], [CHAT_A, CHAT_B, CHAT_A])
+
+    async def test_gives_up_after_retries(self):
+        self.client.errors[CHAT_A] = [flood_wait(0.01) for _ in range(5)]
+        self.assertFalse(await self.forwarder.send_job(job(self.message, CHAT_A)))
+        self.assertEqual(len(self.client.sends), 2)  # first try + FLOOD_WAIT_RETRIES (1)
+
+
+class TestMediaReuse(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.client = StubClient()
+        self.forwarder = make_forwarder(self.client)
+        self.message = SimpleNamespace(id=1, text="chart", media=photo_media(1), entities=None)
+
+    def sent_files(self):
+        return [file for _, _, file in self.client.sends]
+
+    async def test_second_target_reuses_the_reference(self):
+        self.assertTrue(await self.forwarder.send_job(job(self.message, CHAT_A)))
+        self.assertTrue(await self.forwarder.send_job(job(self.message, CHAT_B)))
+        first, second = self.sent_files()
+        self.assertIs(first, self.message.media)                 # uploaded once
+        self.assertIsInstance(second, types.InputMediaPhoto)     # then by reference
+        self.assertEqual(second.id.id, 9001)
+
+    async def test_expired_reference_falls_back_to_reupload(self):
+        await self.forwarder.send_job(job(self.message, CHAT_A))
+        self.client.expired_references = True
+
+        self.assertTrue(await self.forwarder.send_job(job(self.message, CHAT_B)))
+        _, rejected, reuploaded = self.sent_files()
+        self.assertIsInstance(rejected, types.InputMediaPhoto)
+        self.assertIs(reuploaded, self.message.media)
+        # The fresh reference from the re-upload replaces the expired one
+        cache = self.forwarder.media_cache
+        self.assertEqual(cache.refreshes, 1)
+        self.assertEqual(cache.get(media_key(self.message.media)).id.id, 9003)
+
+    async def test_expired_album_reference_falls_back_to_reupload(self):
+        album = tuple(
+            SimpleNamespace(id=n, text=f"item {n}", media=photo_media(n), entities=None)
+            for n in (1, 2)
+        )
+        self.assertTrue(await self.forwarder.send_job(album_job(album, CHAT_A)))
+        self.client.expired_references = True
+
+        self.assertTrue(await self.forwarder.send_job(album_job(album, CHAT_B)))
+        _, rejected, reuploaded = self.sent_files()
+        self.assertTrue(all(isinstance(f, types.InputMediaPhoto) for f in rejected))
+        self.assertEqual(reuploaded, [m.media for m in album])
+        self.assertEqual(self.forwarder.media_cache.refreshes, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
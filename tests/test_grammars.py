@@ -0,0 +1,92 @@
+import unittest
+import sys
+import os
+
+# Ensure the root path is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from auto_trader.grammars import GrammarRegistry, SignalGrammar, GRAMMARS
+
+CARD_SOURCE = -1003771929527
+LABELLED_SOURCE = -1001234567890
+
+
+class TestGrammarRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = GrammarRegistry({
+            CARD_SOURCE: "emoji_card",
+            LABELLED_SOURCE: "labelled",
+        })
+
+    def test_emoji_card(self):
+        text = "📊 USDMXN-OTC ⏰ 08:24 ⌛️ 1 Minute 🔽 PUT SELL 🔴"
+        res = self.registry.parse(text, CARD_SOURCE)
+        self.assertTrue(res["is_valid"])
+        self.assertEqual(res["asset"], "USDMXN-OTC")
+        self.assertEqual(res["direction"], "PUT")
+        self.assertEqual(res["expiry"], 1)
+        self.assertEqual(res["execute_time"], "08:24")
+        self.assertEqual(text[slice(*res["spans"]["asset"])], "USDMXN")
+
+    def test_card_picks_the_signalled_pair(self):
+        # The generic parser takes the first pair-shaped word in the message
+        text = "RESULT GBPJPY WIN ✅\n📊 EURJPY ⏰ 08:16 ⌛️ 5 Minutes 🔼 CALL BUY 🟢"
+        self.assertEqual(self.registry.parse(text)["asset"], "RESULT")
+        self.assertEqual(self.registry.parse(text, CARD_SOURCE)["asset"], "EURJPY")
+
+    def test_labelled(self):
+        text = "Asset: EUR/USD\nDirection: DOWN\nExpiry: M5"
+        res = self.registry.parse(text, LABELLED_SOURCE)
+        self.assertTrue(res["is_valid"])
+        self.assertEqual(res["asset"], "EURUSD")
+        self.assertEqual(res["direction"], "PUT")
+        self.assertEqual(res["expiry"], 5)
+        self.assertIsNone(res["execute_time"])
+
+    def test_prefilter_rejects_chatter(self):
+        grammar = GRAMMARS["emoji_card"]
+        calls = []
+        original = grammar.match
+        grammar.match = lambda text: calls.append(text) or original(text)
+        try:
+            self.assertIsNone(self.registry.parse("Good morning traders!", CARD_SOURCE))
+        finally:
+            grammar.match = original
+        self.assertEqual(calls, [])
+        self.assertEqual(self.registry.stats()["emoji_card"]["rejected"], 1)
+
+    def test_miss_returns_invalid_result(self):
+        res = self.registry.parse("📊 weekly stats ⏰ soon", CARD_SOURCE)
+        self.assertFalse(res["is_valid"])
+        self.assertIsNone(res["asset"])
+
+    def test_unassigned_source_uses_generic(self):
+        res = self.registry.parse("EURUSD - 5m - CALL", -100999)
+        self.assertTrue(res["is_valid"])
+        self.assertEqual(res["asset"], "EURUSD")
+
+    def test_stats(self):
+        self.registry.parse("📊 EURJPY ⏰ 08:16 ⌛️ 1 Minute 🔼 CALL", CARD_SOURCE)
+        self.registry.parse("📊 nothing here ⏰", CARD_SOURCE)
+        self.registry.parse("hello", CARD_SOURCE)
+        stats = self.registry.stats()["emoji_card"]
+        self.assertEqual((stats["hits"], stats["misses"], stats["rejected"]), (1, 1, 1))
+        self.assertGreater(stats["avg_latency_us"], 0)
+
+    def test_unknown_grammar(self):
+        with self.assertRaises(ValueError):
+            GrammarRegistry({CARD_SOURCE: "nope"})
+
+    def test_custom_grammar(self):
+        grammar = SignalGrammar(
+            "arrow",
+            r"(?P<base>[A-Z]{3})(?P<quote>[A-Z]{3})\s*(?P<direction>UP|DOWN)\s*(?P<expiry>\d+)M",
+            keywords=("⬆", ),
+        )
+        registry = GrammarRegistry({1: "arrow"}, grammars={"arrow": grammar, **GRAMMARS})
+        res = registry.parse("⬆ eurusd up 3m", 1)
+        self.assertEqual((res["asset"], res["direction"], res["expiry"]), ("EURUSD", "CALL", 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
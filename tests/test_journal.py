@@ -0,0 +1,116 @@
+import csv
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+# Ensure the root path is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from auto_trader.journal import HEADER, TradeJournal
+from auto_trader.tracker import ResultTracker
+
+
+def row(day="2026-04-09", status="INVALID_FORMAT", asset="EURUSD"):
+    return dict(zip(HEADER, [f"{day} 12:00:00", asset, "CALL", 1, status, "", "", "EURUSD CALL 1m"]))
+
+
+def read(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+class TestTradeJournal(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "trades.csv")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_batches_until_size_or_flush(self):
+        journal = TradeJournal(self.path, batch_size=3, flush_interval=60)
+        journal.append(row())
+        journal.append(row())
+        time.sleep(0.05)
+        self.assertFalse(os.path.exists(self.path))  # still buffered
+
+        journal.append(row())                        # batch is full
+        self.assertTrue(journal.flush(timeout=2))
+        rows = read(self.path)
+        self.assertEqual(rows[0], HEADER)
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(journal.stats()["batches"], 1)
+        journal.close()
+
+    def test_time_flush(self):
+        journal = TradeJournal(self.path, batch_size=100, flush_interval=0.05)
+        journal.append(row())
+        for _ in range(100):
+            if journal.written:
+                break
+            time.sleep(0.01)
+        self.assertEqual(len(read(self.path)), 2)
+        journal.close()
+
+    def test_orders_are_fsynced(self):
+        journal = TradeJournal(self.path, batch_size=1, flush_interval=60)
+        with mock.patch("auto_trader.journal.os.fsync") as fsync:
+            journal.append(row(), durable=False)
+            journal.append(row(status="EXECUTED"), durable=True)
+            for _ in range(100):
+                if journal.written == 2:
+                    break
+                time.sleep(0.01)
+            self.assertEqual(fsync.call_count, 1)
+        journal.close()
+
+    def test_close_drains_queue(self):
+        journal = TradeJournal(self.path, batch_size=1000, flush_interval=60)
+        for i in range(250):
+            journal.append(row(asset=f"A{i}"))
+        journal.close()
+        rows = read(self.path)
+        self.assertEqual(len(rows), 251)
+        self.assertEqual(rows[-1][1], "A249")
+        journal.append(row())                        # dropped, not raised
+        self.assertEqual(len(read(self.path)), 251)
+
+    def test_rotates_by_day(self):
+        journal = TradeJournal(self.path, batch_size=1, flush_interval=60)
+        journal.append(row(day="2026-04-09"))
+        journal.append(row(day="2026-04-10"))
+        journal.close()
+
+        dated = os.path.join(self.tmp.name, "trades.2026-04-09.csv")
+        self.assertEqual(len(read(dated)), 2)
+        current = read(self.path)
+        self.assertEqual(current[0], HEADER)
+        self.assertTrue(current[1][0].startswith("2026-04-10"))
+        self.assertEqual(journal.rotations, 1)
+
+    def test_existing_file_keeps_its_header(self):
+        legacy = HEADER[:-1]
+        with open(self.path, "w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerow(legacy)
+        journal = TradeJournal(self.path, batch_size=1, flush_interval=60, rotate=False)
+        journal.append(dict(row(), profit=0.85))
+        journal.close()
+        rows = read(self.path)
+        self.assertEqual(rows[0], legacy)
+        self.assertEqual(len(rows[1]), len(legacy))
+
+    def test_tracker_writes_through_journal(self):
+        tracker = ResultTracker(self.path)
+        tracker.log_trade({"asset": "EURUSD", "direction": "PUT", "expiry": 1, "raw_text": "x\ny"},
+                          {"trade_id": 7}, "EXECUTED")
+        tracker.close()
+        rows = read(self.path)
+        self.assertEqual(rows[1][1:7], ["EURUSD", "PUT", "1", "EXECUTED", "7", ""])
+        self.assertEqual(rows[1][7], "x y")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import sys
+import unittest
+from unittest import mock
+from datetime import date, timedelta
+
+# Ensure the root path is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from auto_trader import executor as executor_module
+from auto_trader.executor import TradeExecutor
+from auto_trader.ledger import PnLLedger
+from auto_trader.validator import SignalValidator
+from config import MAX_DAILY_LOSS
+
+
+class TestPnLLedger(unittest.TestCase):
+    def setUp(self):
+        self.day = date(2026, 4, 9)
+        self.ledger = PnLLedger(today=lambda: self.day)
+
+    def test_running_totals(self):
+        self.ledger.record(1, "WIN", 0.85)
+        self.ledger.record(2, "LOSS", -1.0)
+        self.ledger.record(3, "DRAW", 0.0)
+        self.assertFalse(self.ledger.record(2, "LOSS", -1.0))  # counted once
+        self.assertAlmostEqual(self.ledger.pnl, -0.15)
+        self.assertEqual(self.ledger.daily_loss, 1.0)
+        self.assertEqual(self.ledger.snapshot()["loss"], 1.0)
+        self.assertEqual(self.ledger.counts, {"WIN": 1, "LOSS": 1, "DRAW": 1})
+
+    def test_resets_at_day_boundary(self):
+        self.ledger.record(1, "LOSS", -5.0)
+        self.day += timedelta(days=1)
+        self.assertEqual(self.ledger.daily_loss, 0.0)
+        self.assertEqual(self.ledger.pnl, 0.0)
+        self.assertTrue(self.ledger.record(1, "LOSS", -1.0))
+
+    def test_feeds_validator_guard(self):
+        validator = SignalValidator(self.ledger)
+        signal = {"is_valid": True, "asset": "EURUSD"}
+        self.ledger.record(1, "LOSS", -(MAX_DAILY_LOSS + 1))
+        self.assertFalse(validator.validate(signal))
+        self.day += timedelta(days=1)
+        self.assertTrue(validator.validate(signal))
+
+
+class FakeWebsocketApi:
+    """The IQ_Option.api object: requests are sent, replies land on attributes."""
+
+    def __init__(self, closed, answers=True):
+        self.closed = closed
+        self.answers = answers
+        self.calls = 0
+        self.get_options_v2_data = None
+
+    def get_options_v2(self, limit, instrument_types):
+        self.calls += 1
+        if self.answers:
+            self.get_options_v2_data = {"msg": {"closed_options": self.closed[:limit]}}
+
+
+class FakeApi:
+    def __init__(self, closed, answers=True):
+        self.api = FakeWebsocketApi(closed, answers)
+
+    def check_connect(self):
+        return True
+
+
+class TestCheckResults(unittest.TestCase):
+    def test_one_request_for_many_trades(self):
+        executor = TradeExecutor()
+        executor.is_connected = True
+        executor.api = FakeApi([
+            {"id": [11], "amount": 1, "win": "win", "win_amount": 1.87},
+            {"id": [12], "amount": 1, "win": "loose", "win_amount": 0},
+            {"id": [13], "amount": 2, "win": "equal", "win_amount": 2},
+            {"id": [99], "amount": 1, "win": "win", "win_amount": 1.8},
+        ])
+        results = executor.check_results([11, 12, 13, 14])
+        self.assertEqual(executor.api.api.calls, 1)
+        self.assertEqual(set(results), {11, 12, 13})
+        self.assertEqual(results[11][0], "WIN")
+        self.assertAlmostEqual(results[11][1], 0.87)
+        self.assertEqual(results[12], ("LOSS", -1.0))
+        self.assertEqual(results[13], ("DRAW", 0.0))
+
+    def test_unanswered_lookup_times_out(self):
+        executor = TradeExecutor()
+        executor.is_connected = True
+        executor.api = FakeApi([], answers=False)
+        with mock.patch.object(executor_module, "RESULT_TIMEOUT", 0.1):
+            self.assertEqual(executor.check_results([11]), {})
+        self.assertEqual(executor.api.api.calls, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
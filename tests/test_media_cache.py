@@ -0,0 +1,59 @@
+import unittest
+import sys
+import os
+from datetime import datetime
+from types import SimpleNamespace
+
+# Ensure the root path is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from telethon.tl import types
+from forwarding.media_cache import MediaCache, media_key
+
+def photo_media(photo_id, file_reference=b"ref"):
+    photo = types.Photo(id=photo_id, access_hash=99, file_reference=file_reference,
+                        date=datetime(2026, 1, 1), sizes=[], dc_id=4)
+    return types.MessageMediaPhoto(photo=photo)
+
+class TestMediaCache(unittest.TestCase):
+    def test_media_key(self):
+        self.assertEqual(media_key(photo_media(5)), ("photo", 5))
+        self.assertIsNone(media_key(None))
+        self.assertIsNone(media_key(types.MessageMediaEmpty()))
+
+    def test_remember_and_reuse(self):
+        cache = MediaCache(max_entries=10)
+        key = media_key(photo_media(1))
+        self.assertIsNone(cache.get(key))
+
+        cache.remember(key, SimpleNamespace(media=photo_media(1001, b"fresh")))
+        ref = cache.get(key)
+        self.assertIsInstance(ref, types.InputMediaPhoto)
+        self.assertEqual(ref.id.id, 1001)
+        self.assertEqual(ref.id.file_reference, b"fresh")
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_lru_eviction(self):
+        cache = MediaCache(max_entries=2)
+        for n in (1, 2):
+            cache.remember(("photo", n), SimpleNamespace(media=photo_media(n)))
+        cache.get(("photo", 1))  # 2 is now least recently used
+        cache.remember(("photo", 3), SimpleNamespace(media=photo_media(3)))
+        self.assertIn(("photo", 1), cache)
+        self.assertNotIn(("photo", 2), cache)
+        self.assertIn(("photo", 3), cache)
+
+    def test_discard_counts_refresh(self):
+        cache = MediaCache(max_entries=2)
+        cache.remember(("photo", 1), SimpleNamespace(media=photo_media(1)))
+        cache.discard(("photo", 1))
+        self.assertNotIn(("photo", 1), cache)
+        self.assertEqual(cache.refreshes, 1)
+
+    def test_text_only_send_is_ignored(self):
+        cache = MediaCache(max_entries=2)
+        cache.remember(("photo", 1), SimpleNamespace(media=None))
+        self.assertNotIn(("photo", 1), cache)
+
+if __name__ == '__main__':
+    unittest.main()
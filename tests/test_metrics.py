@@ -0,0 +1,52 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+# Ensure the root path is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from auto_trader import engine as engine_module
+from auto_trader import metrics
+from auto_trader.engine import AutoTraderEngine
+
+
+class TestMetrics(unittest.TestCase):
+    def test_snapshot_reads_registered_sources(self):
+        calls = []
+        metrics.register("test_counter", lambda: calls.append(1) or {"calls": len(calls)})
+        self.assertEqual(metrics.snapshot()["test_counter"], {"calls": 1})
+        self.assertEqual(metrics.snapshot()["test_counter"], {"calls": 2})
+
+    def test_failing_source_does_not_hide_the_others(self):
+        def broken():
+            raise RuntimeError("boom")
+
+        metrics.register("test_broken", broken)
+        metrics.register("test_ok", lambda: {"ok": True})
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot["test_broken"], {"error": "boom"})
+        self.assertEqual(snapshot["test_ok"], {"ok": True})
+
+    def test_engine_publishes_its_components(self):
+        with mock.patch.object(engine_module, "ENABLE_AUTO_TRADING", False):
+            engine = AutoTraderEngine()
+        try:
+            snapshot = metrics.snapshot()
+            self.assertEqual(snapshot["broker"]["processed"], 0)
+            self.assertEqual(snapshot["broker_supervisor"]["heartbeats"], 0)
+            self.assertEqual(snapshot["scheduler"], {"pending": 0, "fired": 0})
+            self.assertIn("generic", snapshot["grammars"])
+            self.assertEqual(snapshot["asset_refresher"]["refreshes"], 0)
+            self.assertEqual(snapshot["trade_latency"], {"trades": 0})
+
+            engine.ack_latency_ms.extend([30.0, 10.0, 20.0])
+            latency = metrics.snapshot()["trade_latency"]
+            self.assertEqual(latency["trades"], 3)
+            self.assertEqual((latency["ack_p50_ms"], latency["ack_max_ms"]), (20.0, 30.0))
+        finally:
+            engine.broker.shutdown(wait=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import unittest
+from datetime import datetime
+
+# Ensure the root path is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from auto_trader.broker import BrokerWorker
+from auto_trader.ledger import PnLLedger
+from auto_trader.outcomes import BUSY_RETRY_SECONDS, GIVE_UP_SECONDS, OpenPosition, ResultCollector
+from auto_trader.store import TradeStore
+from auto_trader.timing import option_expiration
+from auto_trader.tracker import ResultTracker
+
+MINUTE = datetime(2026, 4, 9, 10, 30).timestamp()
+
+
+class TestOptionExpiration(unittest.TestCase):
+    def test_next_boundary_at_least_30s_away(self):
+        self.assertEqual(option_expiration(MINUTE + 0.3, 1), MINUTE + 60)
+        self.assertEqual(option_expiration(MINUTE + 29, 1), MINUTE + 60)
+        self.assertEqual(option_expiration(MINUTE + 45, 1), MINUTE + 120)
+        self.assertEqual(option_expiration(MINUTE + 5, 5), MINUTE + 300)
+
+
+class ResultsExecutor:
+    def __init__(self):
+        self.results = {}
+        self.batches = []
+
+    def check_results(self, trade_ids):
+        self.batches.append(sorted(trade_ids))
+        return {t: self.results[t] for t in trade_ids if t in self.results}
+
+
+class RecordingTracker:
+    def __init__(self):
+        self.outcomes = []
+
+    def log_outcome(self, signal, trade_id, outcome, profit):
+        self.outcomes.append((trade_id, signal["asset"], outcome, profit))
+
+
+def signal(asset="EURUSD-OTC", expiry=1):
+    return {"asset": asset, "direction": "CALL", "expiry": expiry, "source_id": -100}
+
+
+class TestResultCollector(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.executor = ResultsExecutor()
+        self.broker = BrokerWorker(self.executor)
+        self.ledger = PnLLedger()
+        self.tracker = RecordingTracker()
+        self.collector = ResultCollector(
+            self.executor, self.broker, self.ledger, self.tracker, retry=0.05
+        )
+
+    async def asyncTearDown(self):
+        self.broker.shutdown(wait=True)
+
+    async def test_one_lookup_per_expiry_boundary(self):
+        # A burst of 300 trades in the same minute plus one that expires later
+        for trade_id in range(300):
+            self.collector.track(trade_id, signal(), placed_at=MINUTE + trade_id / 100)
+        self.collector.track(1000, signal(expiry=5), placed_at=MINUTE)
+        self.executor.results = {t: ("LOSS", -1.0) for t in range(300)}
+
+        self.assertEqual(await self.collector.collect_due(now=MINUTE + 59), 0)
+        self.assertEqual(await self.collector.collect_due(now=MINUTE + 65), 300)
+        self.assertEqual(self.executor.batches, [list(range(300))])
+        self.assertEqual(self.ledger.daily_loss, 300.0)
+        self.assertEqual(len(self.tracker.outcomes), 300)
+        self.assertEqual(self.collector.open_positions, 1)
+        self.assertEqual(self.collector.stats()["max_batch"], 300)
+
+    async def test_lookup_waits_for_pending_trade(self):
+        busy = [True]
+        self.collector.busy = lambda: busy[0]
+        self.collector.track(1, signal(), placed_at=MINUTE)
+        self.executor.results = {1: ("WIN", 0.85)}
+
+        self.assertEqual(await self.collector.collect_due(now=MINUTE + 65), 0)
+        self.assertEqual(self.executor.batches, [])     # nothing queued ahead of the buy
+        self.assertEqual(self.collector._heap[0][0], MINUTE + 65 + BUSY_RETRY_SECONDS)
+        self.assertEqual(self.collector.stats()["deferred"], 1)
+
+        busy[0] = False
+        self.assertEqual(await self.collector.collect_due(now=MINUTE + 66), 1)
+        self.assertEqual(self.executor.batches, [[1]])
+
+    async def test_give_up_applies_while_deferring(self):
+        self.collector.busy = lambda: True
+        self.collector.track(9, signal(), placed_at=MINUTE)
+        await self.collector.collect_due(now=MINUTE + 65)
+        self.assertEqual(self.collector.open_positions, 1)
+        await self.collector.collect_due(now=MINUTE + 61 + GIVE_UP_SECONDS)
+        self.assertEqual((self.collector.open_positions, self.collector.abandoned), (0, 1))
+        self.assertEqual(self.executor.batches, [])
+
+    async def test_missing_result_is_retried_then_abandoned(self):
+        self.collector.track(7, signal(), placed_at=MINUTE)
+        self.assertEqual(await self.collector.collect_due(now=MINUTE + 65), 0)
+        self.assertEqual(self.collector.open_positions, 1)   # pushed back by `retry`
+
+        self.executor.results[7] = ("WIN", 0.87)
+        self.assertEqual(await self.collector.collect_due(now=MINUTE + 66), 1)
+        self.assertEqual(self.tracker.outcomes, [(7, "EURUSD-OTC", "WIN", 0.87)])
+
+        self.collector.track(8, signal(), placed_at=MINUTE)
+        await self.collector.collect_due(now=MINUTE + 61 + GIVE_UP_SECONDS)
+        self.assertEqual((self.collector.open_positions, self.collector.abandoned), (0, 1))
+
+    async def test_run_wakes_at_the_due_time(self):
+        task = asyncio.create_task(self.collector.run())
+        await asyncio.sleep(0)
+        due = time.time() + 0.1
+        for trade_id in (1, 2):
+            self.collector._push(due, OpenPosition(trade_id, signal(), due))
+        self.executor.results = {1: ("WIN", 0.8), 2: ("DRAW", 0.0)}
+        for _ in range(100):
+            if self.collector.settled == 2:
+                break
+            await asyncio.sleep(0.01)
+        task.cancel()
+        self.assertEqual(self.collector.settled, 2)
+        self.assertEqual(self.executor.batches, [[1, 2]])
+
+
+class TestOutcomeJournal(unittest.TestCase):
+    def test_outcome_row_updates_stored_trade(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = TradeStore(os.path.join(tmp, "trades.db"))
+            tracker = ResultTracker(os.path.join(tmp, "trades.csv"), store=store)
+            parsed = dict(signal(), raw_text="EURUSD OTC CALL 1m")
+            tracker.log_trade(parsed, {"trade_id": 42}, "EXECUTED")
+            tracker.log_outcome(parsed, 42, "LOSS", -1.0)
+            tracker.close()
+
+            (group,) = store.summary()
+            self.assertEqual((group["trades"], group["losses"], group["profit"]), (1, 1, -1.0))
+            self.assertEqual(store.daily_loss(), 1.0)
+            with open(os.path.join(tmp, "trades.csv"), encoding="utf-8") as f:
+                last = f.read().splitlines()[-1]
+            self.assertTrue(last.endswith(",LOSS,42,,,-1.0"))
+            store.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
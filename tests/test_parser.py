@@ -48,5 +48,38 @@ class TestSignalParser(unittest.TestCase):
         res = self.parser.parse(text)
         self.assertFalse(res["is_valid"])
 
+    def test_spans_point_into_original_text(self):
+        text = "📊 EURJPY-OTC ⏰ 08:16 ⌛️ 1 Minute 🔼 CALL BUY 🟢"
+        res = self.parser.parse(text)
+        self.assertEqual(res["asset"], "EURJPY-OTC")
+        self.assertEqual(res["execute_time"], "08:16")
+        spans = res["spans"]
+        self.assertEqual(text[slice(*spans["asset"])], "EURJPY")
+        self.assertEqual(text[slice(*spans["direction"])], "CALL")
+        self.assertEqual(text[slice(*spans["expiry"])], "1 Minute")
+        self.assertEqual(text[slice(*spans["execute_time"])], "08:16")
+
+    def test_spans_lowercase_slash_format(self):
+        text = "eur/usd put m5"
+        res = self.parser.parse(text)
+        self.assertEqual(res["asset"], "EURUSD")
+        self.assertEqual(text[slice(*res["spans"]["asset"])], "eur/usd")
+        self.assertEqual(text[slice(*res["spans"]["expiry"])], "m5")
+
+    def test_confidence(self):
+        full = self.parser.parse("EURUSD CALL 5m 10:30")
+        self.assertEqual(full["confidence"], 1.0)
+
+        no_time = self.parser.parse("EURUSD CALL 5m")
+        self.assertLess(no_time["confidence"], full["confidence"])
+
+        conflicting = self.parser.parse("EURUSD CALL or PUT 5m 10:30")
+        self.assertEqual(conflicting["direction"], "CALL")
+        self.assertLess(conflicting["confidence"], no_time["confidence"])
+
+        empty = self.parser.parse("")
+        self.assertEqual(empty["confidence"], 0.0)
+        self.assertEqual(empty["spans"], {})
+
 if __name__ == '__main__':
     unittest.main()
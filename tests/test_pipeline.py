@@ -0,0 +1,122 @@
+import unittest
+import asyncio
+import sys
+import os
+
+# Ensure the root path is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from forwarding.pipeline import ForwardJob, ForwardPipeline
+from forwarding.router import Target
+
+def make_job(n, target_id, topic=None):
+    target = Target(target_id, topic)
+    return ForwardJob(message=n, target=target, idx=1, total=1, source_id=-100)
+
+class TestForwardPipeline(unittest.IsolatedAsyncioTestCase):
+    async def test_order_is_preserved_per_destination(self):
+        sent = []
+
+        async def send(job):
+            # Later jobs finish faster; order must still hold per destination
+            await asyncio.sleep(0.01 / (job.message + 1))
+            sent.append((job.destination, job.message))
+
+        pipeline = ForwardPipeline(send, workers=3, maxsize=10)
+        pipeline.start()
+        for n in range(5):
+            await pipeline.submit(make_job(n, -1001))
+            await pipeline.submit(make_job(n, -1002, topic=7))
+        await pipeline.drain(timeout=5)
+
+        for destination in ((-1001, None), (-1002, 7)):
+            order = [n for dest, n in sent if dest == destination]
+            self.assertEqual(order, list(range(5)))
+        self.assertEqual(pipeline.completed, 10)
+
+    async def test_stalled_destination_does_not_block_others(self):
+        stalled = asyncio.Event()
+        sent = []
+
+        async def send(job):
+            if job.destination == (-1001, None):
+                await stalled.wait()  # e.g. paused by a FloodWait
+            sent.append((job.destination, job.message))
+
+        pipeline = ForwardPipeline(send, workers=2, maxsize=10)
+        pipeline.start()
+        for n in range(3):
+            await pipeline.submit(make_job(n, -1001))
+        for target_id in (-1002, -1003, -1004):
+            for n in range(3):
+                await pipeline.submit(make_job(n, target_id))
+        await asyncio.sleep(0.05)
+        self.assertEqual(len(sent), 9)  # every other destination went through
+        self.assertNotIn((-1001, None), [dest for dest, _ in sent])
+
+        stalled.set()
+        await pipeline.drain(timeout=5)
+        self.assertEqual([n for dest, n in sent if dest == (-1001, None)], [0, 1, 2])
+
+    async def test_backpressure_is_recorded(self):
+        release = asyncio.Event()
+
+        async def send(job):
+            await release.wait()
+
+        pipeline = ForwardPipeline(send, workers=1, maxsize=1)
+        pipeline.start()
+        await pipeline.submit(make_job(0, -1001))
+        await asyncio.sleep(0)  # worker takes job 0 and blocks
+        await pipeline.submit(make_job(1, -1001))  # fills the queue
+
+        blocked = asyncio.create_task(pipeline.submit(make_job(2, -1001)))
+        await asyncio.sleep(0.01)
+        self.assertFalse(blocked.done())
+        release.set()
+        await blocked
+        await pipeline.drain(timeout=5)
+
+        stats = pipeline.stats()
+        self.assertEqual(stats["blocked_submits"], 1)
+        self.assertEqual(stats["completed"], 3)
+
+    async def test_failures_do_not_stop_the_worker(self):
+        async def send(job):
+            if job.message == 0:
+                raise RuntimeError("boom")
+
+        pipeline = ForwardPipeline(send, workers=1, maxsize=5)
+        pipeline.start()
+        await pipeline.submit(make_job(0, -1001))
+        await pipeline.submit(make_job(1, -1001))
+        await pipeline.drain(timeout=5)
+        self.assertEqual((pipeline.failed, pipeline.completed), (1, 1))
+
+    async def test_jobs_submitted_before_start_are_sent(self):
+        sent = []
+
+        async def send(job):
+            sent.append(job.message)
+
+        pipeline = ForwardPipeline(send, workers=2, maxsize=5)
+        await pipeline.submit(make_job(0, -1001))
+        await pipeline.submit(make_job(1, -1002))
+        self.assertEqual(sent, [])
+        pipeline.start()
+        await pipeline.drain(timeout=5)
+        self.assertEqual(sorted(sent), [0, 1])
+        self.assertEqual(pipeline.submitted, 2)
+
+    async def test_submit_after_drain_is_dropped(self):
+        async def send(job):
+            pass
+
+        pipeline = ForwardPipeline(send, workers=1, maxsize=5)
+        pipeline.start()
+        await pipeline.drain(timeout=5)
+        await pipeline.submit(make_job(0, -1001))
+        self.assertEqual(pipeline.submitted, 0)
+
+if __name__ == '__main__':
+    unittest.main()
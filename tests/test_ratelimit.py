@@ -0,0 +1,51 @@
+import unittest
+import asyncio
+import time
+import sys
+import os
+
+# Ensure the root path is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from forwarding.ratelimit import TokenBucket, RateLimiter
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_then_wait(self):
+        bucket = TokenBucket(rate=10, capacity=2)
+        now = bucket.updated
+        self.assertEqual(bucket.reserve(now), 0.0)
+        self.assertEqual(bucket.reserve(now), 0.0)
+        # Third token has to be refilled at 10/s
+        self.assertAlmostEqual(bucket.reserve(now), 0.1, places=3)
+
+    def test_refill_is_capped(self):
+        bucket = TokenBucket(rate=10, capacity=2)
+        now = bucket.updated + 60
+        bucket.reserve(now)
+        self.assertAlmostEqual(bucket.tokens, 1.0)
+
+class TestRateLimiter(unittest.IsolatedAsyncioTestCase):
+    async def test_pause_only_affects_one_chat(self):
+        limiter = RateLimiter(per_chat_rate=100, per_chat_burst=5, global_rate=100, global_burst=5)
+        limiter.pause(-1001, 0.2)
+        self.assertTrue(limiter.is_paused(-1001))
+        self.assertFalse(limiter.is_paused(-1002))
+        self.assertEqual(limiter.stats(), {"flood_waits": 1, "paused_chats": 1})
+
+        start = time.monotonic()
+        await limiter.acquire(-1002)
+        self.assertLess(time.monotonic() - start, 0.1)
+
+        await limiter.acquire(-1001)
+        self.assertGreaterEqual(time.monotonic() - start, 0.19)
+        self.assertEqual(limiter.flood_waits, 1)
+
+    async def test_global_bucket_limits_all_chats(self):
+        limiter = RateLimiter(per_chat_rate=100, per_chat_burst=5, global_rate=20, global_burst=1)
+        start = time.monotonic()
+        await asyncio.gather(*(limiter.acquire(chat) for chat in (-1, -2, -3)))
+        # One free token, then two more at 20/s
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import asyncio
+import os
+import sys
+import threading
+import unittest
+from unittest import mock
+
+# Ensure the root path is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from auto_trader import refresher as refresher_module
+from auto_trader.assets import AssetCatalog
+from auto_trader.broker import BrokerWorker
+from auto_trader.refresher import AssetRefresher
+
+
+class FakeExecutor:
+    def __init__(self, actives=None):
+        self.is_connected = True
+        self.catalog = AssetCatalog.empty()
+        self.actives = actives if actives is not None else {"EURUSD-OTC": 76}
+        self.threads = []
+
+    def fetch_asset_catalog(self):
+        self.threads.append(threading.current_thread().name)
+        if self.actives is None:
+            return None
+        return AssetCatalog(self.actives)
+
+
+class TestAssetRefresher(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.executor = FakeExecutor()
+        self.broker = BrokerWorker(self.executor)
+        self.refresher = AssetRefresher(self.executor, self.broker, interval=60)
+
+    async def asyncTearDown(self):
+        self.broker.shutdown(wait=True)
+
+    async def test_refresh_swaps_catalog_on_broker_thread(self):
+        old = self.executor.catalog
+        self.assertTrue(await self.refresher.refresh())
+        self.assertIsNot(self.executor.catalog, old)
+        self.assertIsNotNone(self.executor.catalog.resolve("EUR/USD OTC"))
+        self.assertEqual(self.executor.threads, ["broker"])
+        stats = self.refresher.stats()
+        self.assertEqual((stats["refreshes"], stats["assets"]), (1, 1))
+        self.assertIn("last_ms", stats)
+
+    async def test_failed_fetch_keeps_old_catalog(self):
+        self.executor.actives = None
+        old = self.executor.catalog
+        self.assertFalse(await self.refresher.refresh())
+        self.assertIs(self.executor.catalog, old)
+        self.assertEqual(self.refresher.failures, 1)
+
+    async def test_skipped_while_disconnected(self):
+        self.executor.is_connected = False
+        self.assertFalse(await self.refresher.refresh())
+        self.assertEqual(self.executor.threads, [])
+
+    async def test_empty_catalog_is_retried_sooner(self):
+        self.executor.is_connected = False
+        with mock.patch.object(refresher_module, "EMPTY_RETRY_SECONDS", 0.01):
+            task = asyncio.create_task(self.refresher.run())
+            await asyncio.sleep(0.05)
+            self.assertEqual(self.refresher.refreshes, 0)
+
+            # A reconnect (by the supervisor or a trade) is picked up without a request
+            self.executor.is_connected = True
+            for _ in range(100):
+                if self.refresher.refreshes:
+                    break
+                await asyncio.sleep(0.01)
+            task.cancel()
+        self.assertEqual(self.refresher.refreshes, 1)
+
+    async def test_requests_are_rate_limited(self):
+        self.assertTrue(self.refresher.request("EURUSD-OTC not listed"))
+        self.assertFalse(self.refresher.request("EURUSD-OTC not listed"))
+
+    async def test_request_wakes_loop_and_waits_for_idle_trade_path(self):
+        busy = [True]
+        self.refresher.busy = lambda: busy[0]
+        with mock.patch.object(refresher_module, "BUSY_RETRY_SECONDS", 0.01):
+            task = asyncio.create_task(self.refresher.run())
+            self.refresher.request()
+            await asyncio.sleep(0.05)
+            self.assertEqual(self.refresher.refreshes, 0)
+            self.assertGreater(self.refresher.deferred, 0)
+
+            busy[0] = False
+            for _ in range(100):
+                if self.refresher.refreshes:
+                    break
+                await asyncio.sleep(0.01)
+            task.cancel()
+        self.assertEqual(self.refresher.refreshes, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
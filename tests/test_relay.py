@@ -0,0 +1,84 @@
+import unittest
+import asyncio
+import sys
+import os
+from types import SimpleNamespace
+
+# Ensure the root path is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from telethon.tl import types
+from forwarding.relay import MediaRelay
+
+PAYLOAD = bytes(range(256)) * 1000  # 256 KB
+
+class StubClient:
+    def __init__(self):
+        self.downloads = 0
+        self.uploads = []
+
+    async def iter_download(self, document):
+        self.downloads += 1
+        for start in range(0, len(PAYLOAD), 64 * 1024):
+            await asyncio.sleep(0)
+            yield PAYLOAD[start:start + 64 * 1024]
+
+    async def download_media(self, message, file):
+        self.downloads += 1
+        file.write(PAYLOAD)
+        return file
+
+    async def upload_file(self, file, file_size=None, file_name=None):
+        data = b""
+        while True:
+            part = await _maybe_await(file.read(100 * 1024))
+            if not part:
+                break
+            data += part
+        self.uploads.append((file_name, data))
+        return types.InputFile(id=1, parts=1, name=file_name, md5_checksum="")
+
+async def _maybe_await(value):
+    return await value if asyncio.iscoroutine(value) else value
+
+def make_message(photo=False):
+    file = SimpleNamespace(name=None if photo else "chart.pdf", ext=".jpg" if photo else ".pdf",
+                           size=len(PAYLOAD), mime_type="application/pdf")
+    document = None if photo else SimpleNamespace(mime_type="application/pdf", attributes=[])
+    return SimpleNamespace(chat_id=-1001, id=7, file=file, document=document,
+                           photo=object() if photo else None)
+
+class TestMediaRelay(unittest.IsolatedAsyncioTestCase):
+    async def test_document_is_streamed_once_for_all_targets(self):
+        client = StubClient()
+        relay = MediaRelay(client, memory_limit=1024, ttl=600)
+        message = make_message()
+
+        results = await asyncio.gather(*(relay.get(message) for _ in range(4)))
+
+        self.assertEqual(client.downloads, 1)
+        self.assertEqual(len(client.uploads), 1)
+        self.assertEqual(client.uploads[0], ("chart.pdf", PAYLOAD))
+        self.assertTrue(all(r is results[0] for r in results))
+        self.assertIsInstance(results[0], types.InputMediaUploadedDocument)
+        self.assertEqual(relay.reuses, 3)
+
+    async def test_photo_uses_spooled_buffer(self):
+        client = StubClient()
+        relay = MediaRelay(client, memory_limit=1024, ttl=600)
+        media = await relay.get(make_message(photo=True))
+        self.assertIsInstance(media, types.InputMediaUploadedPhoto)
+        self.assertEqual(client.uploads[0], ("media.jpg", PAYLOAD))
+
+    async def test_failure_returns_none(self):
+        client = StubClient()
+
+        async def broken_upload(*args, **kwargs):
+            raise RuntimeError("upload failed")
+
+        client.upload_file = broken_upload
+        relay = MediaRelay(client, memory_limit=1024, ttl=600)
+        self.assertIsNone(await relay.get(make_message()))
+
+if __name__ == '__main__':
+    unittest.main()
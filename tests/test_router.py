@@ -0,0 +1,60 @@
+import unittest
+import sys
+import os
+from types import SimpleNamespace
+
+# Ensure the root path is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from forwarding.router import Router, Target, marked_source_id
+
+MAPPINGS = [
+    {"source_id": -1003354980634, "source_topic_id": 394, "target_id": -1003657608293, "target_topic_id": 258},
+    {"source_id": -1003354980634, "source_topic_id": 4, "target_id": -1003657608293, "target_topic_id": 255},
+    {"source_id": -1003771929527, "target_id": -1003850746623},
+    {"source_id": -1003771929527, "target_id": -1002885383779},
+]
+
+def message(chat_id, msg_id=100, reply_to=None):
+    return SimpleNamespace(
+        id=msg_id,
+        peer_id=SimpleNamespace(channel_id=-chat_id - 1000000000000),
+        reply_to=reply_to,
+    )
+
+class TestRouter(unittest.TestCase):
+    def setUp(self):
+        self.router = Router(MAPPINGS)
+
+    def test_marked_source_id(self):
+        self.assertEqual(marked_source_id(message(-1003354980634)), -1003354980634)
+        self.assertIsNone(marked_source_id(SimpleNamespace(peer_id=SimpleNamespace(user_id=5))))
+
+    def test_group_mapping(self):
+        targets = self.router.targets_for_message(message(-1003771929527))
+        self.assertEqual(targets, (Target(-1003850746623), Target(-1002885383779)))
+
+    def test_topic_root_message(self):
+        targets = self.router.targets_for_message(message(-1003354980634, msg_id=394))
+        self.assertEqual(targets, (Target(-1003657608293, 258),))
+
+    def test_direct_reply_to_topic(self):
+        reply = SimpleNamespace(reply_to_msg_id=4, reply_to_top_id=None)
+        targets = self.router.targets_for_message(message(-1003354980634, reply_to=reply))
+        self.assertEqual(targets, (Target(-1003657608293, 255),))
+
+    def test_nested_reply_in_topic(self):
+        reply = SimpleNamespace(reply_to_msg_id=999, reply_to_top_id=394)
+        targets = self.router.targets_for_message(message(-1003354980634, reply_to=reply))
+        self.assertEqual(targets, (Target(-1003657608293, 258),))
+
+    def test_unmapped_topic_and_source(self):
+        reply = SimpleNamespace(reply_to_msg_id=77, reply_to_top_id=None)
+        self.assertEqual(self.router.targets_for_message(message(-1003354980634, reply_to=reply)), ())
+        self.assertEqual(self.router.targets_for_message(message(-1009999999999)), ())
+
+    def test_source_ids(self):
+        self.assertEqual(self.router.source_ids, {-1003354980634, -1003771929527})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+
+# Ensure the root path is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from forwarding.routing_config import ConfigWatcher, RoutingConfig, load_routing_config
+
+DEFAULTS = RoutingConfig(
+    mappings=[{"source_id": -1001, "target_id": -1002}],
+    schedules=[],
+    contact_filter_sources=frozenset({-1001}),
+)
+
+class TestLoadRoutingConfig(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "forwarding.json")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def write(self, data):
+        with open(self.path, "w") as f:
+            json.dump(data, f)
+
+    def test_missing_file_uses_defaults(self):
+        self.assertIs(load_routing_config(self.path, DEFAULTS), DEFAULTS)
+
+    def test_file_overrides_given_keys_only(self):
+        self.write({"forward_mappings": [{"source_id": -1005, "target_id": -1006}]})
+        cfg = load_routing_config(self.path, DEFAULTS)
+        self.assertEqual(cfg.mappings, [{"source_id": -1005, "target_id": -1006}])
+        self.assertEqual(cfg.contact_filter_sources, DEFAULTS.contact_filter_sources)
+
+    def test_invalid_mapping_is_rejected(self):
+        self.write({"forward_mappings": [{"source_id": "-1005"}]})
+        with self.assertRaises(ValueError):
+            load_routing_config(self.path, DEFAULTS)
+
+    def test_example_file_is_valid(self):
+        example = os.path.join(os.path.dirname(__file__), "..", "forwarding.example.json")
+        cfg = load_routing_config(example, DEFAULTS)
+        self.assertTrue(cfg.mappings)
+
+class TestConfigWatcher(unittest.IsolatedAsyncioTestCase):
+    async def test_reloads_on_change_and_ignores_bad_files(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "forwarding.json")
+            applied = []
+
+            async def on_change(cfg):
+                applied.append(cfg)
+
+            watcher = ConfigWatcher(path, 1, DEFAULTS, on_change)
+            self.assertFalse(await watcher.check())
+
+            with open(path, "w") as f:
+                json.dump({"contact_filter_sources": [-1009]}, f)
+            self.assertTrue(await watcher.check())
+            self.assertEqual(applied[-1].contact_filter_sources, frozenset({-1009}))
+            self.assertFalse(await watcher.check())
+
+            with open(path, "w") as f:
+                f.write("{not json")
+            self.assertFalse(await watcher.check())
+            self.assertEqual(len(applied), 1)
+
+if __name__ == '__main__':
+    unittest.main()
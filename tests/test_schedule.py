@@ -0,0 +1,75 @@
+import unittest
+import sys
+import os
+from datetime import datetime, timezone, timedelta
+
+# Ensure the root path is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from forwarding.schedule import ScheduleClock, ScheduleGate
+
+SRC, TGT = -1003771929527, -1002885383779
+UTC = timezone.utc
+
+def at(day, hour, minute, tz=UTC):
+    # 2026-01-05 is a Monday
+    return ScheduleClock(datetime(2026, 1, 5 + day, hour, minute, tzinfo=tz))
+
+def rule(**fields):
+    return dict({"source_id": SRC, "target_id": TGT, "timezone": "UTC"}, **fields)
+
+class TestScheduleGate(unittest.TestCase):
+    def test_unscheduled_pair_is_allowed(self):
+        gate = ScheduleGate([rule(days=[0], all_day=True)])
+        self.assertTrue(gate.allowed(SRC, -1000000000001, at(3, 12, 0)))
+
+    def test_all_day(self):
+        gate = ScheduleGate([rule(days=[5], all_day=True)])
+        self.assertTrue(gate.allowed(SRC, TGT, at(5, 0, 0)))
+        self.assertTrue(gate.allowed(SRC, TGT, at(5, 23, 59)))
+        self.assertFalse(gate.allowed(SRC, TGT, at(4, 23, 59)))
+
+    def test_window_is_half_open(self):
+        gate = ScheduleGate([rule(days=[0, 2, 4], start_time="17:00", end_time="20:00")])
+        self.assertFalse(gate.allowed(SRC, TGT, at(0, 16, 59)))
+        self.assertTrue(gate.allowed(SRC, TGT, at(0, 17, 0)))
+        self.assertTrue(gate.allowed(SRC, TGT, at(2, 19, 59)))
+        self.assertFalse(gate.allowed(SRC, TGT, at(4, 20, 0)))
+        self.assertFalse(gate.allowed(SRC, TGT, at(1, 18, 0)))
+
+    def test_overnight_window_wraps_into_next_day(self):
+        gate = ScheduleGate([rule(days=[6], start_time="22:00", end_time="02:00")])
+        self.assertTrue(gate.allowed(SRC, TGT, at(6, 23, 30)))
+        # Sunday night wraps into Monday morning
+        self.assertTrue(gate.allowed(SRC, TGT, at(0, 1, 59)))
+        self.assertFalse(gate.allowed(SRC, TGT, at(0, 2, 0)))
+        self.assertFalse(gate.allowed(SRC, TGT, at(6, 1, 0)))
+
+    def test_multiple_windows_and_rules(self):
+        gate = ScheduleGate([
+            rule(days=[1], windows=[{"start": "08:00", "end": "09:00"},
+                                    {"start": "17:00", "end": "18:00"}]),
+            rule(days=[3], all_day=True),
+        ])
+        self.assertTrue(gate.allowed(SRC, TGT, at(1, 8, 30)))
+        self.assertTrue(gate.allowed(SRC, TGT, at(1, 17, 30)))
+        self.assertFalse(gate.allowed(SRC, TGT, at(1, 12, 0)))
+        self.assertTrue(gate.allowed(SRC, TGT, at(3, 12, 0)))
+
+    def test_timezone_aware_rule(self):
+        gate = ScheduleGate([rule(days=[0], start_time="17:00", end_time="20:00",
+                                  timezone="Africa/Lagos")])  # UTC+1
+        self.assertTrue(gate.allowed(SRC, TGT, at(0, 16, 30)))
+        self.assertFalse(gate.allowed(SRC, TGT, at(0, 19, 30)))
+        # Same instant expressed in another offset gives the same answer
+        plus5 = timezone(timedelta(hours=5))
+        self.assertTrue(gate.allowed(SRC, TGT, at(0, 21, 30, tz=plus5)))
+
+    def test_invalid_rules(self):
+        with self.assertRaises(ValueError):
+            ScheduleGate([rule(days=[0], start_time="25:00", end_time="26:00")])
+        with self.assertRaises(ValueError):
+            ScheduleGate([rule(days=[7], all_day=True)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import asyncio
+import os
+import sys
+import time
+import unittest
+from datetime import datetime
+
+# Ensure the root path is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from auto_trader.scheduler import TradeScheduler
+from auto_trader.timing import seconds_until_signal_minute
+
+
+class TestSignalMinuteTiming(unittest.TestCase):
+    def test_sub_second_precision(self):
+        now = datetime(2026, 4, 9, 12, 15, 20, 250000)
+        self.assertAlmostEqual(seconds_until_signal_minute(16, now), 39.75)
+
+    def test_next_hour_is_ahead(self):
+        now = datetime(2026, 4, 9, 12, 59, 30)
+        self.assertAlmostEqual(seconds_until_signal_minute(0, now), 30.0)
+
+    def test_previous_hour_has_passed(self):
+        # An 11:59 signal received at 12:00:59 used to be read as 59 minutes ahead
+        now = datetime(2026, 4, 9, 12, 0, 59)
+        self.assertLess(seconds_until_signal_minute(59, now), 0)
+
+    def test_inside_minute(self):
+        now = datetime(2026, 4, 9, 12, 16, 59, 900000)
+        self.assertEqual(seconds_until_signal_minute(16, now), 0.0)
+
+
+class TestTradeScheduler(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.scheduler = TradeScheduler()
+
+    async def asyncTearDown(self):
+        await self.scheduler.close()
+
+    async def test_fires_in_deadline_order(self):
+        fired = []
+
+        async def wait(name, delay):
+            await self.scheduler.sleep(delay)
+            fired.append(name)
+
+        await asyncio.gather(wait("c", 0.06), wait("a", 0.02), wait("b", 0.04))
+        self.assertEqual(fired, ["a", "b", "c"])
+        self.assertEqual(self.scheduler.fired, 3)
+
+    async def test_earlier_deadline_wakes_timer(self):
+        slow = asyncio.ensure_future(self.scheduler.sleep(5))
+        await asyncio.sleep(0.01)
+        start = time.monotonic()
+        await self.scheduler.sleep(0.02)
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertFalse(slow.done())
+        slow.cancel()
+
+    async def test_fires_close_to_deadline(self):
+        start = time.monotonic()
+        lateness = await self.scheduler.sleep(0.05)
+        elapsed = time.monotonic() - start
+        self.assertGreaterEqual(elapsed, 0.05)
+        self.assertGreaterEqual(lateness, 0)
+        self.assertLess(lateness, 0.02)
+        stats = self.scheduler.stats()
+        self.assertEqual(stats["fired"], 1)
+        self.assertIn("jitter_p99_ms", stats)
+
+    async def test_cancelled_waiter_is_skipped(self):
+        waiter = asyncio.ensure_future(self.scheduler.sleep(0.02))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await self.scheduler.sleep(0.04)
+        self.assertEqual(self.scheduler.fired, 1)
+        self.assertEqual(self.scheduler.stats()["pending"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
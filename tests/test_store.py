@@ -0,0 +1,131 @@
+import csv
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from datetime import date, datetime
+
+# Ensure the root path is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from auto_trader.journal import HEADER, TradeJournal
+from auto_trader.store import TradeStore
+
+TODAY = date.today().isoformat()
+
+
+def row(asset="EURUSD-OTC", status="EXECUTED", trade_id="", source_id=-100, day=TODAY,
+        clock="12:00:00"):
+    return {
+        "timestamp": f"{day} {clock}", "asset": asset, "direction": "CALL", "expiry": 1,
+        "status": status, "trade_id": trade_id, "error_message": "", "raw_signal": "x",
+        "source_id": source_id,
+    }
+
+
+class TestTradeStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = TradeStore(os.path.join(self.tmp.name, "trades.db"))
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_wal_and_indexes(self):
+        conn = self.store._conn()
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        plan = " ".join(r[-1] for r in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM trades WHERE asset = 'X' AND timestamp >= '2026'"))
+        self.assertIn("trades_asset", plan)
+
+    def test_summary_per_asset_per_provider(self):
+        self.store.insert_many([
+            row(trade_id="1"), row(trade_id="2"), row(trade_id="3", source_id=-200),
+            row(asset="GBPUSD", trade_id="4"), row(status="INVALID_FORMAT", asset=""),
+            row(trade_id="5", day="2020-01-01"),
+        ])
+        self.assertTrue(self.store.update_outcome("1", "WIN", 0.85))
+        self.assertTrue(self.store.update_outcome(2, "LOSS", -1.0))
+        self.assertFalse(self.store.update_outcome("999", "WIN", 1.0))
+
+        groups = {(g["asset"], g["source_id"]): g for g in self.store.summary()}
+        eur = groups[("EURUSD-OTC", -100)]
+        self.assertEqual((eur["trades"], eur["wins"], eur["losses"], eur["open"]), (2, 1, 1, 0))
+        self.assertAlmostEqual(eur["profit"], -0.15)
+        self.assertEqual(groups[("EURUSD-OTC", -200)]["open"], 1)
+        self.assertEqual(len(groups), 3)
+
+        self.assertEqual(self.store.status_counts(), {"EXECUTED": 4, "INVALID_FORMAT": 1})
+        self.assertEqual(self.store.daily_loss(), 1.0)
+        self.assertEqual(self.store.summary("2020-01-01", group_by=())[0]["trades"], 1)
+        with self.assertRaises(ValueError):
+            self.store.summary(group_by=("raw_signal; DROP TABLE trades",))
+
+    def test_recent_executed(self):
+        now = datetime.now().replace(microsecond=0)
+        self.store.insert_many([
+            row(clock=now.strftime("%H:%M:%S")),
+            row(status="INVALID_FORMAT", clock=now.strftime("%H:%M:%S")),
+        ])
+        (recent,) = self.store.recent_executed(time.time() - 60)
+        self.assertEqual(recent, {"received_at": now.timestamp(), "raw_signal": "x",
+                                  "source_id": -100})
+
+    def test_import_csv_once(self):
+        path = os.path.join(self.tmp.name, "trades.csv")
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=HEADER, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows([row(trade_id="7"), row(status="EXECUTION_FAILED")])
+        self.assertEqual(self.store.import_csv(path), 2)
+        self.assertEqual(self.store.import_csv(path), 0)
+        self.assertEqual(self.store.status_counts(), {"EXECUTED": 1, "EXECUTION_FAILED": 1})
+        self.assertIsNone(self.store.summary()[0]["source_id"])
+
+    def test_reimport_after_append_adds_only_new_rows(self):
+        path = os.path.join(self.tmp.name, "trades.csv")
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=HEADER, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows([row(trade_id=str(i), clock=f"12:00:{i:02d}") for i in range(33)])
+        self.assertEqual(self.store.import_csv(path), 33)
+
+        with open(path, "a", newline="", encoding="utf-8") as f:
+            csv.DictWriter(f, fieldnames=HEADER, extrasaction="ignore").writerow(
+                row(trade_id="33", clock="12:01:00")
+            )
+        self.assertEqual(self.store.import_csv(path), 1)
+        self.assertEqual(self.store.status_counts(), {"EXECUTED": 34})
+        # Starting over finds every row already stored
+        self.assertEqual(self.store.import_csv(path, force=True), 0)
+        self.assertEqual(self.store.status_counts(), {"EXECUTED": 34})
+
+    def test_import_skips_rows_the_journal_stored(self):
+        path = os.path.join(self.tmp.name, "trades.csv")
+        journal = TradeJournal(path, store=self.store)
+        journal.append(row(trade_id="7"))
+        journal.append(row(status="INVALID_FORMAT", asset=""))
+        journal.close()
+        self.assertEqual(self.store.import_csv(path), 0)
+        self.assertEqual(self.store.status_counts(), {"EXECUTED": 1, "INVALID_FORMAT": 1})
+
+    def test_journal_batches_into_store_from_its_thread(self):
+        journal = TradeJournal(os.path.join(self.tmp.name, "trades.csv"), store=self.store)
+        for i in range(5):
+            journal.append(row(trade_id=str(i)))
+        journal.close()
+        self.assertEqual(self.store.summary()[0]["trades"], 5)
+
+        # Readers on other threads see the rows through their own connection
+        seen = []
+        reader = threading.Thread(target=lambda: seen.append(self.store.status_counts()))
+        reader.start()
+        reader.join()
+        self.assertEqual(seen, [{"EXECUTED": 5}])
+
+
+if __name__ == '__main__':
+    unittest.main()
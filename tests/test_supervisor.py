@@ -0,0 +1,127 @@
+import os
+import sys
+import time
+import unittest
+from unittest import mock
+
+# Ensure the root path is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from auto_trader import executor as executor_module
+from auto_trader.executor import TradeExecutor
+from auto_trader.supervisor import MAX_BACKOFF_SECONDS, ConnectionSupervisor
+
+
+class FakeSession:
+    def __init__(self, n):
+        self.n = n
+        self.alive = True
+
+    def check_connect(self):
+        return self.alive
+
+
+class SessionExecutor(TradeExecutor):
+    """TradeExecutor whose logins hand out FakeSessions."""
+
+    def __init__(self):
+        super().__init__()
+        self.logins = 0
+        self.attempts = 0
+        self.login_fails = False
+
+    def _open_session(self):
+        self.attempts += 1
+        if self.login_fails:
+            return None
+        self.logins += 1
+        return FakeSession(self.logins)
+
+    def fetch_asset_catalog(self):
+        raise AssertionError("connect() must not fetch the asset list")
+
+
+class TestConnectionSupervisor(unittest.TestCase):
+    def setUp(self):
+        self.executor = SessionExecutor()
+        self.executor.connect()
+
+    def supervisor(self, **kwargs):
+        return ConnectionSupervisor(self.executor, broker=None, interval=10, **kwargs)
+
+    def test_healthy_heartbeat_does_nothing(self):
+        supervisor = self.supervisor()
+        self.assertTrue(supervisor.check())
+        self.assertEqual(self.executor.logins, 1)
+        self.assertEqual(supervisor.stats()["drops"], 0)
+
+    def test_drop_reconnects_in_background(self):
+        supervisor = self.supervisor()
+        self.executor.api.alive = False
+        self.assertTrue(supervisor.check())
+        self.assertEqual(self.executor.api.n, 2)
+        stats = supervisor.stats()
+        self.assertEqual((stats["drops"], stats["reconnects"]), (1, 1))
+        self.assertIn("reconnect_avg_ms", stats)
+
+    def test_failed_reconnect_is_counted(self):
+        supervisor = self.supervisor()
+        self.executor.api.alive = False
+        self.executor.login_fails = True
+        self.assertFalse(supervisor.check())
+        self.assertFalse(self.executor.is_connected)
+        self.assertEqual(supervisor.reconnect_failures, 1)
+
+    def test_failed_reconnects_back_off(self):
+        supervisor = self.supervisor()
+        self.executor.api.alive = False
+        self.executor.login_fails = True
+        supervisor.check()
+        supervisor.check()                          # still backing off
+        self.assertEqual(self.executor.attempts, 2)  # initial connect + one retry
+
+        delays = []
+        for _ in range(8):
+            supervisor._retry_at = 0.0              # let the backoff elapse
+            supervisor.check()
+            delays.append(supervisor._retry_at - time.monotonic())
+        self.assertAlmostEqual(delays[0], 40, delta=1)
+        self.assertAlmostEqual(delays[1], 80, delta=1)
+        self.assertAlmostEqual(delays[-1], MAX_BACKOFF_SECONDS, delta=1)
+        self.assertEqual(supervisor.stats()["drops"], 1)
+
+        self.executor.login_fails = False
+        supervisor._retry_at = 0.0
+        self.assertTrue(supervisor.check())
+        self.assertEqual(supervisor.consecutive_failures, 0)
+
+    def test_rejected_login_is_not_retried(self):
+        class RejectingIQOption:
+            logins = 0
+
+            def __init__(self, email, password):
+                pass
+
+            def connect(self):
+                RejectingIQOption.logins += 1
+                return False, '{"code":"invalid_credentials","message":"Wrong login"}'
+
+        executor = TradeExecutor()
+        executor.email, executor.password = "me@example.com", "wrong"
+        supervisor = ConnectionSupervisor(executor, broker=None, interval=10)
+        with mock.patch.object(executor_module, "IQ_Option", RejectingIQOption):
+            self.assertFalse(supervisor.check())
+            supervisor._retry_at = 0.0
+            self.assertFalse(supervisor.check())
+            self.assertFalse(executor._ensure_connected())
+        self.assertEqual(RejectingIQOption.logins, 1)
+        self.assertTrue(supervisor.stats()["gave_up"])
+
+    def test_trade_path_reconnects(self):
+        self.executor.api.alive = False
+        self.assertTrue(self.executor._ensure_connected())
+        self.assertEqual(self.executor.api.n, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -35,6 +35,32 @@ class TestSignalValidator(unittest.TestCase):
         # Second time fails
         self.assertFalse(self.validator.validate(signal))
         
+    def test_opposite_direction_is_not_a_duplicate(self):
+        call = {"asset": "EURUSD", "direction": "CALL", "expiry": 1, "is_valid": True,
+                "raw_text": "EURUSD CALL 1m", "source_id": -1}
+        put = dict(call, direction="PUT", raw_text="EURUSD PUT 1m", source_id=-2)
+        self.assertTrue(self.validator.validate(call))
+        self.assertTrue(self.validator.validate(put))
+
+    def test_forwarded_copy_is_a_duplicate(self):
+        signal = {"asset": "EURUSD", "direction": "CALL", "expiry": 1, "is_valid": True,
+                  "execute_time": "10:30", "raw_text": "EURUSD  CALL 1m\n10:30", "source_id": -1}
+        copy = dict(signal, raw_text="eurusd call 1m 10:30", source_id=-2)
+        self.assertTrue(self.validator.validate(signal))
+        self.assertFalse(self.validator.validate(copy))
+
+    def test_per_source_cooldown_and_eviction(self):
+        self.validator.source_cooldowns = {-1: 2, -2: 60}
+        signal = {"asset": "EURUSD", "direction": "CALL", "expiry": 1, "is_valid": True}
+        now = 1_000_000.0
+        self.assertTrue(self.validator.validate(dict(signal, source_id=-1), now=now))
+        self.assertTrue(self.validator.validate(dict(signal, source_id=-1), now=now + 3))
+        self.assertFalse(self.validator.validate(dict(signal, source_id=-2), now=now + 30))
+        self.assertEqual(len(self.validator.recent_trades), 1)
+        self.validator.validate({"asset": "GBPUSD", "direction": "PUT", "is_valid": True},
+                                now=now + 100)
+        self.assertEqual(len(self.validator.recent_trades), 1)  # EURUSD entry expired
+
     def test_daily_loss_limit(self):
         signal = {
             "asset": "GBPUSD",